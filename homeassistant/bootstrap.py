@@ -23,10 +23,11 @@ from .const import (
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
 from .exceptions import HomeAssistantError
-from .helpers import area_registry, device_registry, entity_registry
+from .helpers import area_registry, device_registry, entity_registry, template
 from .helpers.dispatcher import async_dispatcher_send
 from .helpers.typing import ConfigType
 from .setup import (
+    BASE_PLATFORMS,
     DATA_SETUP,
     DATA_SETUP_STARTED,
     DATA_SETUP_TIME,
@@ -110,6 +111,9 @@ async def async_setup_hass(
 
     _LOGGER.info("Config directory: %s", runtime_config.config_dir)
 
+    # Load the manifests and modules of the integrations used by the last run
+    await loader.async_load_integration_index(hass)
+
     config_dict = None
     basic_setup_success = False
 
@@ -497,6 +501,12 @@ async def _async_set_up_integrations(
 
     _LOGGER.info("Domains to be set up: %s", domains_to_setup)
 
+    # Import the integrations and their platforms in the executor ahead of
+    # their setup
+    loader.async_preimport_integrations(
+        hass, integration_cache.values(), domains_to_setup & BASE_PLATFORMS
+    )
+
     # Load logging as soon as possible
     if logging_domains := domains_to_setup & LOGGING_INTEGRATIONS:
         _LOGGER.info("Setting up logging: %s", logging_domains)
@@ -530,11 +540,12 @@ async def _async_set_up_integrations(
 
     stage_2_domains = domains_to_setup - logging_domains - debuggers - stage_1_domains
 
-    # Load the registries
+    # Load the registries and the code of the templates compiled by the last run
     await asyncio.gather(
         device_registry.async_load(hass),
         entity_registry.async_load(hass),
         area_registry.async_load(hass),
+        template.async_load_bytecode_cache(hass),
     )
 
     # Start setup
@@ -581,3 +592,29 @@ async def _async_set_up_integrations(
             )
         },
     )
+    _LOGGER.debug(
+        "Integration import times: %s",
+        dict(
+            sorted(
+                (
+                    (module, import_time)
+                    for import_times in loader.async_get_import_times(hass).values()
+                    for module, import_time in import_times.items()
+                ),
+                key=lambda item: item[1],
+            )
+        ),
+    )
+    if compile_stats := template.async_get_template_compile_stats(hass):
+        _LOGGER.debug(
+            "Template compile time: %.3fs (%d compiled, %d loaded from cache)",
+            compile_stats["compile_time"],
+            compile_stats["compiled"],
+            compile_stats["loaded"],
+        )
+    if index_stats := loader.async_get_integration_index_stats(hass):
+        _LOGGER.debug(
+            "Integrations loaded from the index: %d (%d read)",
+            index_stats["loaded"],
+            index_stats["read"],
+        )
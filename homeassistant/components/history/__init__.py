@@ -1,6 +1,7 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Iterable
 from datetime import datetime as dt, timedelta
 from http import HTTPStatus
@@ -9,6 +10,7 @@ import time
 from typing import cast
 
 from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 from sqlalchemy import not_, or_
 import voluptuous as vol
 
@@ -20,7 +22,13 @@ from homeassistant.components.recorder.statistics import (
     statistics_during_period,
 )
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE
+from homeassistant.const import (
+    CONF_DOMAINS,
+    CONF_ENTITIES,
+    CONF_EXCLUDE,
+    CONF_INCLUDE,
+    CONTENT_TYPE_JSON,
+)
 from homeassistant.core import HomeAssistant
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.deprecation import deprecated_class, deprecated_function
@@ -28,6 +36,7 @@ from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
 )
+from homeassistant.helpers.json import json_bytes
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
@@ -38,6 +47,9 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = "history"
 CONF_ORDER = "use_include_order"
 
+# Minimum number of bytes written at a time when streaming history
+STREAM_CHUNK_SIZE = 64 * 1024
+
 GLOB_TO_SQL_CHARS = {
     42: "%",  # *
     46: "_",  # .
@@ -101,6 +113,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     frontend.async_register_built_in_panel(hass, "history", "history", "hass:chart-box")
     websocket_api.async_register_command(hass, ws_get_statistics_during_period)
     websocket_api.async_register_command(hass, ws_get_list_statistic_ids)
+    websocket_api.async_register_command(hass, ws_get_history_during_period)
 
     return True
 
@@ -172,6 +185,87 @@ async def ws_get_list_statistic_ids(
     connection.send_result(msg["id"], statistic_ids)
 
 
+def _compressed_significant_states(
+    hass,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    include_start_time_state,
+    significant_changes_only,
+):
+    """Fetch significant states from the database in the compressed format."""
+    timer_start = time.perf_counter()
+
+    with session_scope(hass=hass) as session:
+        result = history.get_significant_states_compressed_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            significant_changes_only,
+        )
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug(
+            "Extracted %d compressed states in %fs",
+            sum(len(entity["s"]) for entity in result["entities"].values()),
+            elapsed,
+        )
+
+    return result
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "history/history_during_period",
+        vol.Required("start_time"): str,
+        vol.Optional("end_time"): str,
+        vol.Required("entity_ids"): [str],
+        vol.Optional("include_start_time_state", default=True): bool,
+        vol.Optional("significant_changes_only", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def ws_get_history_during_period(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Handle history during period websocket command."""
+    start_time_str = msg["start_time"]
+    end_time_str = msg.get("end_time")
+
+    if start_time := dt_util.parse_datetime(start_time_str):
+        start_time = dt_util.as_utc(start_time)
+    else:
+        connection.send_error(msg["id"], "invalid_start_time", "Invalid start_time")
+        return
+
+    if end_time_str:
+        if end_time := dt_util.parse_datetime(end_time_str):
+            end_time = dt_util.as_utc(end_time)
+        else:
+            connection.send_error(msg["id"], "invalid_end_time", "Invalid end_time")
+            return
+    else:
+        end_time = None
+
+    result = await hass.async_add_executor_job(
+        _compressed_significant_states,
+        hass,
+        start_time,
+        end_time,
+        [entity_id.lower() for entity_id in msg["entity_ids"]],
+        None,
+        msg["include_start_time_state"],
+        msg["significant_changes_only"],
+    )
+    connection.send_result(msg["id"], result)
+
+
 class HistoryPeriodView(HomeAssistantView):
     """Handle history period requests."""
 
@@ -193,6 +287,8 @@ class HistoryPeriodView(HomeAssistantView):
             return self.json_message("Invalid datetime", HTTPStatus.BAD_REQUEST)
 
         now = dt_util.utcnow()
+        compressed = "compressed" in request.query
+        no_history = {"states": [], "entities": {}} if compressed else []
 
         one_day = timedelta(days=1)
         if datetime_:
@@ -201,7 +297,7 @@ class HistoryPeriodView(HomeAssistantView):
             start_time = now - one_day
 
         if start_time > now:
-            return self.json([])
+            return self.json(no_history)
 
         if end_time_str := request.query.get("end_time"):
             if end_time := dt_util.parse_datetime(end_time_str):
@@ -228,21 +324,57 @@ class HistoryPeriodView(HomeAssistantView):
             and entity_ids
             and not _entities_may_have_state_changes_after(hass, entity_ids, start_time)
         ):
-            return self.json([])
+            return self.json(no_history)
+
+        if compressed:
+            # The compressed format is always a minimal response
+            return self.json(
+                await hass.async_add_executor_job(
+                    _compressed_significant_states,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    self.filters,
+                    include_start_time_state,
+                    significant_changes_only,
+                )
+            )
 
-        return cast(
-            web.Response,
-            await hass.async_add_executor_job(
-                self._sorted_significant_states_json,
-                hass,
-                start_time,
-                end_time,
-                entity_ids,
-                include_start_time_state,
-                significant_changes_only,
-                minimal_response,
-            ),
+        if self.filters and self.use_include_order:
+            # The order of the included entities is only known once
+            # all states are fetched, don't stream the response
+            return cast(
+                web.Response,
+                await hass.async_add_executor_job(
+                    self._sorted_significant_states_json,
+                    hass,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    include_start_time_state,
+                    significant_changes_only,
+                    minimal_response,
+                ),
+            )
+
+        response = web.StreamResponse(headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_chunked_encoding()
+        response.enable_compression()
+        await hass.async_add_executor_job(
+            self._stream_significant_states_json,
+            hass,
+            request,
+            response,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
         )
+        await response.write_eof()
+        return response
 
     def _sorted_significant_states_json(
         self,
@@ -290,6 +422,70 @@ class HistoryPeriodView(HomeAssistantView):
 
         return self.json(result)
 
+    def _stream_significant_states_json(
+        self,
+        hass,
+        request,
+        response,
+        start_time,
+        end_time,
+        entity_ids,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+    ):
+        """Stream significant states from the database as a json list.
+
+        The states of each entity are serialized as soon as they are fetched
+        and written out in chunks of at least STREAM_CHUNK_SIZE bytes, waiting
+        for each chunk to be written before fetching more rows. The response
+        is only prepared once the first chunk is ready.
+        """
+        timer_start = time.perf_counter()
+        state_count = 0
+        chunk = [b"["]
+        chunk_size = 0
+
+        async def async_write(data):
+            if not response.prepared:
+                await response.prepare(request)
+            await response.write(data)
+
+        def write_chunk():
+            asyncio.run_coroutine_threadsafe(
+                async_write(b"".join(chunk)), hass.loop
+            ).result()
+
+        with session_scope(hass=hass) as session:
+            for _, states in history.stream_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                self.filters,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+            ):
+                if state_count:
+                    chunk.append(b",")
+                data = json_bytes(states)
+                chunk.append(data)
+                chunk_size += len(data)
+                state_count += len(states)
+                if chunk_size >= STREAM_CHUNK_SIZE:
+                    write_chunk()
+                    chunk = []
+                    chunk_size = 0
+
+        chunk.append(b"]")
+        write_chunk()
+
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - timer_start
+            _LOGGER.debug("Streamed %d states in %fs", state_count, elapsed)
+
 
 def sqlalchemy_filter_from_include_exclude_conf(conf: ConfigType) -> Filters | None:
     """Build a sql filter from config."""
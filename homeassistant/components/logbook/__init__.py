@@ -1,4 +1,5 @@
 """Event parser and human readable log generator."""
+from collections import OrderedDict
 from contextlib import suppress
 from datetime import timedelta
 from http import HTTPStatus
@@ -17,6 +18,7 @@ from homeassistant.components.history import sqlalchemy_filter_from_include_excl
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.recorder.models import (
     Events,
+    StateAttributes,
     States,
     process_timestamp_to_utc_isoformat,
 )
@@ -68,6 +70,11 @@ DOMAIN = "logbook"
 
 GROUP_BY_MINUTES = 15
 
+# The origins of this many contexts are looked up at once, stay below
+# the maximum number of sqlite variables of 999
+CONTEXT_LOOKUP_BATCH_SIZE = 500
+CONTEXT_LOOKUP_CACHE_SIZE = 2048
+
 EMPTY_JSON_OBJECT = "{}"
 UNIT_OF_MEASUREMENT_JSON = '"unit_of_measurement":'
 
@@ -94,6 +101,7 @@ ALL_EVENT_TYPES = [
 ]
 
 EVENT_COLUMNS = [
+    Events.event_id,
     Events.event_type,
     Events.event_data,
     Events.time_fired,
@@ -239,20 +247,38 @@ class LogbookView(HomeAssistantView):
                 "Can't combine entity with context_id", HTTPStatus.BAD_REQUEST
             )
 
+        if (limit := request.query.get("limit")) is not None:
+            try:
+                limit = vol.All(vol.Coerce(int), vol.Range(min=1))(limit)
+            except vol.Invalid:
+                return self.json_message("Invalid limit", HTTPStatus.BAD_REQUEST)
+
+        if (cursor := request.query.get("cursor")) is not None:
+            if limit is None:
+                return self.json_message(
+                    "Can't use cursor without limit", HTTPStatus.BAD_REQUEST
+                )
+            if (cursor := dt_util.parse_datetime(cursor)) is None:
+                return self.json_message("Invalid cursor", HTTPStatus.BAD_REQUEST)
+
         def json_events():
             """Fetch events and generate JSON."""
-            return self.json(
-                _get_events(
-                    hass,
-                    start_day,
-                    end_day,
-                    entity_ids,
-                    self.filters,
-                    self.entities_filter,
-                    entity_matches_only,
-                    context_id,
-                )
+            events = _get_events(
+                hass,
+                start_day,
+                end_day,
+                entity_ids,
+                self.filters,
+                self.entities_filter,
+                entity_matches_only,
+                context_id,
+                limit,
+                cursor,
             )
+            if limit is None:
+                return self.json(events)
+            entries, next_cursor = events
+            return self.json({"entries": entries, "cursor": next_cursor})
 
         return await hass.async_add_executor_job(json_events)
 
@@ -419,71 +445,149 @@ def _get_events(
     entities_filter=None,
     entity_matches_only=False,
     context_id=None,
+    limit=None,
+    cursor=None,
 ):
-    """Get events for a period of time."""
+    """Get events for a period of time.
+
+    When limit is set, a page of at least limit entries is returned
+    together with the cursor to get the next page from, the cursor is
+    None on the last page. Pages start and end with whole groups of events.
+    """
     assert not (
         entity_ids and context_id
     ), "can't pass in both entity_ids and context_id"
 
     entity_attr_cache = EntityAttributeCache(hass)
-    context_lookup = {None: None}
-
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(1000):
-            event = LazyEventPartialState(row)
-            context_lookup.setdefault(event.context_id, event)
-            if event.event_type == EVENT_CALL_SERVICE:
-                continue
-            if event.event_type == EVENT_STATE_CHANGED or _keep_event(
-                hass, event, entities_filter
-            ):
-                yield event
+    external_event_types = list(hass.data.get(DOMAIN, {}))
 
     if entity_ids is not None:
         entities_filter = generate_filter([], entity_ids, [], [])
+        # Only logbook entries and described events can be about the entities
+        event_types = [EVENT_LOGBOOK_ENTRY, *external_event_types]
+        context_event_types = [
+            *ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED,
+            *external_event_types,
+        ]
+    else:
+        # Service calls are never shown, only looked up as context
+        event_types = [
+            EVENT_STATE_CHANGED,
+            EVENT_LOGBOOK_ENTRY,
+            *HOMEASSISTANT_EVENTS,
+            *external_event_types,
+        ]
+        context_event_types = [*ALL_EVENT_TYPES, *external_event_types]
 
     with session_scope(hass=hass) as session:
-        old_state = aliased(States, name="old_state")
 
-        if entity_ids is not None:
-            query = _generate_events_query_without_states(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_event_types_filter(
-                hass, query, ALL_EVENT_TYPES_EXCEPT_STATE_CHANGED
+        def logbook_query(event_types, match_entity_ids, cursor=None, context_ids=None):
+            """Return the query for the events shown in the logbook."""
+            return _generate_logbook_query(
+                session,
+                start_day,
+                end_day,
+                entity_ids,
+                filters,
+                event_types,
+                match_entity_ids,
+                context_id,
+                cursor,
+                context_ids,
             )
-            if entity_matches_only:
-                # When entity_matches_only is provided, contexts and events that do not
-                # contain the entity_ids are not included in the logbook response.
-                query = _apply_event_entity_id_matchers(query, entity_ids)
-
-            query = query.union_all(
-                _generate_states_query(
-                    session, start_day, end_day, old_state, entity_ids
-                )
-            )
-        else:
-            query = _generate_events_query(session)
-            query = _apply_event_time_filter(query, start_day, end_day)
-            query = _apply_events_types_and_states_filter(
-                hass, query, old_state
-            ).filter(
-                (States.last_updated == States.last_changed)
-                | (Events.event_type != EVENT_STATE_CHANGED)
+
+        def query_context_origins(context_ids):
+            """Return the events with the context ids ordered by time fired."""
+            return logbook_query(
+                context_event_types, entity_matches_only, context_ids=context_ids
+            ).order_by(Events.time_fired, Events.event_id)
+
+        context_lookup = ContextLookup(query_context_origins)
+
+        def yield_events(query):
+            """Yield Events that are not filtered away."""
+            for row in query.yield_per(1000):
+                event = LazyEventPartialState(row)
+                if event.event_type == EVENT_STATE_CHANGED or _keep_event(
+                    hass, event, entities_filter
+                ):
+                    yield event
+
+        query = logbook_query(event_types, True, cursor).order_by(Events.time_fired)
+
+        entries = []
+        for _, g_events in groupby(yield_events(query), _event_group_key):
+            if limit is not None and len(entries) >= limit:
+                return entries, next(g_events).time_fired_isoformat
+            # humanify holds on to a whole group of events, look up the
+            # origins of their contexts before it starts on the group
+            events_batch = list(g_events)
+            context_lookup.prefetch(events_batch)
+            entries.extend(
+                humanify(hass, events_batch, entity_attr_cache, context_lookup)
             )
-            if filters:
-                query = query.filter(
-                    filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
-                )
+        if limit is None:
+            return entries
+        return entries, None
 
-            if context_id is not None:
-                query = query.filter(Events.context_id == context_id)
 
-        query = query.order_by(Events.time_fired)
+def _event_group_key(event):
+    """Return the key of the batch of events humanify groups an event in."""
+    return event.time_fired_minute // GROUP_BY_MINUTES
 
-        return list(
-            humanify(hass, yield_events(query), entity_attr_cache, context_lookup)
+
+def _generate_logbook_query(
+    session,
+    start_day,
+    end_day,
+    entity_ids,
+    filters,
+    event_types,
+    match_entity_ids,
+    context_id,
+    cursor=None,
+    context_ids=None,
+):
+    """Generate the query for the logbook events in a period.
+
+    With entity_ids, the events are limited to the event_types, containing
+    the entity_ids when match_entity_ids is set, and the state changes of
+    the entity_ids. The period starts at the cursor, including it, if set.
+    """
+    old_state = aliased(States, name="old_state")
+
+    if entity_ids is not None:
+        query = _generate_events_query_without_states(session)
+        query = _apply_event_time_filter(query, start_day, end_day, cursor)
+        query = query.filter(Events.event_type.in_(event_types))
+        if match_entity_ids:
+            query = _apply_event_entity_id_matchers(query, entity_ids)
+        states_query = _generate_states_query(
+            session, start_day, end_day, old_state, entity_ids, cursor
         )
+        if context_ids is not None:
+            query = query.filter(Events.context_id.in_(context_ids))
+            states_query = states_query.filter(Events.context_id.in_(context_ids))
+        return query.union_all(states_query)
+
+    query = _generate_events_query(session)
+    query = _apply_event_time_filter(query, start_day, end_day, cursor)
+    query = _apply_events_types_and_states_filter(query, old_state, event_types).filter(
+        (States.last_updated == States.last_changed)
+        | (Events.event_type != EVENT_STATE_CHANGED)
+    )
+    if filters:
+        query = query.filter(
+            filters.entity_filter() | (Events.event_type != EVENT_STATE_CHANGED)
+        )
+
+    if context_id is not None:
+        query = query.filter(Events.context_id == context_id)
+
+    if context_ids is not None:
+        query = query.filter(Events.context_id.in_(context_ids))
+
+    return query
 
 
 def _generate_events_query(session):
@@ -493,6 +597,7 @@ def _generate_events_query(session):
         States.entity_id,
         States.domain,
         States.attributes,
+        StateAttributes.shared_attrs,
     )
 
 
@@ -503,17 +608,27 @@ def _generate_events_query_without_states(session):
         literal(value=None, type_=sqlalchemy.String).label("entity_id"),
         literal(value=None, type_=sqlalchemy.String).label("domain"),
         literal(value=None, type_=sqlalchemy.Text).label("attributes"),
+        literal(value=None, type_=sqlalchemy.Text).label("shared_attrs"),
     )
 
 
-def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
+def _generate_states_query(
+    session, start_day, end_day, old_state, entity_ids, cursor=None
+):
+    if cursor is None:
+        start_filter = States.last_updated > start_day
+    else:
+        start_filter = States.last_updated >= cursor
     return (
         _generate_events_query(session)
         .outerjoin(Events, (States.event_id == Events.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(_missing_state_matcher(old_state))
         .filter(_continuous_entity_matcher())
-        .filter((States.last_updated > start_day) & (States.last_updated < end_day))
+        .filter(start_filter & (States.last_updated < end_day))
         .filter(
             (States.last_updated == States.last_changed)
             & States.entity_id.in_(entity_ids)
@@ -521,10 +636,13 @@ def _generate_states_query(session, start_day, end_day, old_state, entity_ids):
     )
 
 
-def _apply_events_types_and_states_filter(hass, query, old_state):
+def _apply_events_types_and_states_filter(query, old_state, event_types):
     events_query = (
         query.outerjoin(States, (Events.event_id == States.event_id))
         .outerjoin(old_state, (States.old_state_id == old_state.state_id))
+        .outerjoin(
+            StateAttributes, (States.attributes_id == StateAttributes.attributes_id)
+        )
         .filter(
             (Events.event_type != EVENT_STATE_CHANGED)
             | _missing_state_matcher(old_state)
@@ -533,7 +651,7 @@ def _apply_events_types_and_states_filter(hass, query, old_state):
             (Events.event_type != EVENT_STATE_CHANGED) | _continuous_entity_matcher()
         )
     )
-    return _apply_event_types_filter(hass, events_query, ALL_EVENT_TYPES)
+    return events_query.filter(Events.event_type.in_(event_types))
 
 
 def _missing_state_matcher(old_state):
@@ -554,20 +672,27 @@ def _continuous_entity_matcher():
     #
     return sqlalchemy.or_(
         sqlalchemy.not_(States.domain.in_(CONTINUOUS_DOMAINS)),
-        sqlalchemy.not_(States.attributes.contains(UNIT_OF_MEASUREMENT_JSON)),
-    )
-
-
-def _apply_event_time_filter(events_query, start_day, end_day):
-    return events_query.filter(
-        (Events.time_fired > start_day) & (Events.time_fired < end_day)
+        sqlalchemy.and_(
+            sqlalchemy.not_(
+                sqlalchemy.func.coalesce(States.attributes, "").contains(
+                    UNIT_OF_MEASUREMENT_JSON
+                )
+            ),
+            sqlalchemy.not_(
+                sqlalchemy.func.coalesce(StateAttributes.shared_attrs, "").contains(
+                    UNIT_OF_MEASUREMENT_JSON
+                )
+            ),
+        ),
     )
 
 
-def _apply_event_types_filter(hass, query, event_types):
-    return query.filter(
-        Events.event_type.in_(event_types + list(hass.data.get(DOMAIN, {})))
-    )
+def _apply_event_time_filter(events_query, start_day, end_day, cursor=None):
+    if cursor is None:
+        start_filter = Events.time_fired > start_day
+    else:
+        start_filter = Events.time_fired >= cursor
+    return events_query.filter(start_filter & (Events.time_fired < end_day))
 
 
 def _apply_event_entity_id_matchers(events_query, entity_ids):
@@ -670,6 +795,70 @@ def _entity_name_from_event(entity_id, event, entity_attr_cache):
     ) or split_entity_id(entity_id)[1].replace("_", " ")
 
 
+class ContextLookup:
+    """Find the events which started the contexts of logbook events.
+
+    The first event with a context id in the logbook period started the
+    context. Instead of keeping every row, the origins of the contexts of
+    a group of events, and their parent contexts, are fetched in batches
+    using the index on the context id. The origins needed by the group
+    are kept until the next group is prefetched, of the earlier groups
+    only the most recently used origins are kept.
+    """
+
+    def __init__(self, query_origins):
+        """Init the lookup."""
+        self._query_origins = query_origins
+        self._origins = OrderedDict()
+
+    def get(self, context_id, default=None):
+        """Return the event which started a context."""
+        return self._origins.get(context_id, default)
+
+    def prefetch(self, events):
+        """Look up the origins of the contexts of a group of events."""
+        if not events:
+            return
+        events_by_id = {event.event_id: event for event in events}
+        context_ids = self._fetch({event.context_id for event in events}, events_by_id)
+        parent_context_ids = self._fetch(
+            {
+                origin.context_parent_id
+                for context_id in context_ids
+                if (origin := self._origins[context_id]) is not None
+            },
+            events_by_id,
+        )
+        # The origins of this group were moved to the end, evict the others
+        keep = max(CONTEXT_LOOKUP_CACHE_SIZE, len(context_ids | parent_context_ids))
+        while len(self._origins) > keep:
+            self._origins.popitem(last=False)
+
+    def _fetch(self, context_ids, events_by_id):
+        """Fetch the origins of contexts, reusing the events being processed.
+
+        Returns the context ids, their origins are the most recently used.
+        """
+        context_ids.discard(None)
+        missing_context_ids = []
+        for context_id in context_ids:
+            if context_id in self._origins:
+                self._origins.move_to_end(context_id)
+            else:
+                self._origins[context_id] = None
+                missing_context_ids.append(context_id)
+        # Stay below the maximum number of sqlite variables
+        for idx in range(0, len(missing_context_ids), CONTEXT_LOOKUP_BATCH_SIZE):
+            for row in self._query_origins(
+                missing_context_ids[idx : idx + CONTEXT_LOOKUP_BATCH_SIZE]
+            ):
+                if self._origins[row.context_id] is None:
+                    self._origins[row.context_id] = events_by_id.get(
+                        row.event_id
+                    ) or LazyEventPartialState(row)
+        return context_ids
+
+
 class LazyEventPartialState:
     """A lazy version of core Event with limited State joined in."""
 
@@ -703,13 +892,20 @@ class LazyEventPartialState:
         self.context_parent_id = self._row.context_parent_id
         self.time_fired_minute = self._row.time_fired.minute
 
+    @property
+    def event_id(self):
+        """Id of the event row."""
+        return self._row.event_id
+
     @property
     def attributes_icon(self):
         """Extract the icon from the decoded attributes or json."""
         if self._attributes:
             return self._attributes.get(ATTR_ICON)
 
-        result = ICON_JSON_EXTRACT.search(self._row.attributes)
+        result = ICON_JSON_EXTRACT.search(
+            self._row.shared_attrs or self._row.attributes or ""
+        )
         return result and result.group(1)
 
     @property
@@ -734,13 +930,11 @@ class LazyEventPartialState:
     def attributes(self):
         """State attributes."""
         if not self._attributes:
-            if (
-                self._row.attributes is None
-                or self._row.attributes == EMPTY_JSON_OBJECT
-            ):
+            source = self._row.shared_attrs or self._row.attributes
+            if source is None or source == EMPTY_JSON_OBJECT:
                 self._attributes = {}
             else:
-                self._attributes = json.loads(self._row.attributes)
+                self._attributes = json.loads(source)
         return self._attributes
 
     @property
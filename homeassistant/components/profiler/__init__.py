@@ -8,21 +8,23 @@ import sys
 import threading
 import time
 import traceback
+from typing import Any
 
 from guppy import hpy
 import objgraph
 from pyprof2calltree import convert
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
-from .const import DOMAIN
+from .const import DOMAIN, JOB_PROFILER
+from .job_profiler import JobProfiler
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -31,6 +33,8 @@ SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_START_JOB_PROFILER = "start_job_profiler"
+SERVICE_STOP_JOB_PROFILER = "stop_job_profiler"
 
 
 SERVICES = (
@@ -41,6 +45,8 @@ SERVICES = (
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_START_JOB_PROFILER,
+    SERVICE_STOP_JOB_PROFILER,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
@@ -55,7 +61,7 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Profiler from a config entry."""
     lock = asyncio.Lock()
-    domain_data = hass.data[DOMAIN] = {}
+    domain_data = hass.data[DOMAIN] = {JOB_PROFILER: JobProfiler(hass)}
 
     async def _async_run_profile(call: ServiceCall) -> None:
         async with lock:
@@ -131,6 +137,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             arepr.max_string = original_maxstring
             arepr.max_other = original_maxother
 
+    async def _async_start_job_profiler(call: ServiceCall) -> None:
+        domain_data[JOB_PROFILER].async_start()
+
+    async def _async_stop_job_profiler(call: ServiceCall) -> None:
+        domain_data[JOB_PROFILER].async_stop()
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -194,6 +206,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_JOB_PROFILER,
+        _async_start_job_profiler,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_JOB_PROFILER,
+        _async_stop_job_profiler,
+    )
+
+    websocket_api.async_register_command(hass, websocket_job_stats)
+
     return True
 
 
@@ -203,10 +231,29 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    hass.data[DOMAIN][JOB_PROFILER].async_stop()
     hass.data.pop(DOMAIN)
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/job_stats"})
+@callback
+def websocket_job_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the time taken by the jobs run in the event loop."""
+    if DOMAIN not in hass.data:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Profiler is not loaded"
+        )
+        return
+
+    connection.send_result(msg["id"], hass.data[DOMAIN][JOB_PROFILER].async_stats())
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     start_time = int(time.time() * 1000000)
     persistent_notification.async_create(
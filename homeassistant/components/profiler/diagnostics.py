@@ -0,0 +1,32 @@
+"""Diagnostics support for Profiler."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import async_get_suppressed_state_writes
+from homeassistant.helpers.event import (
+    async_get_template_render_stats,
+    async_get_timer_wheel_stats,
+)
+from homeassistant.helpers.service import async_get_service_target_cache_stats
+from homeassistant.helpers.template import async_get_template_compile_stats
+from homeassistant.loader import async_get_integration_index_stats
+
+from .const import DOMAIN, JOB_PROFILER
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "job_stats": hass.data[DOMAIN][JOB_PROFILER].async_stats(),
+        "integration_index": async_get_integration_index_stats(hass),
+        "service_target_cache": async_get_service_target_cache_stats(hass),
+        "suppressed_state_writes": async_get_suppressed_state_writes(hass),
+        "template_renders_avoided": async_get_template_render_stats(hass),
+        "template_compile": async_get_template_compile_stats(hass),
+        "timer_wheel": async_get_timer_wheel_stats(hass),
+    }
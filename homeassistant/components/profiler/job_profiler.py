@@ -0,0 +1,188 @@
+"""Profile the time the jobs run in the event loop take."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Coroutine, Generator
+import functools
+from time import monotonic
+import types
+from typing import Any
+
+from homeassistant.core import Event, HassJob, HassJobType, HomeAssistant, callback
+
+# Upper bounds in seconds of the buckets of the histograms
+HISTOGRAM_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+
+class JobHistogram:
+    """Histogram of the time the runs of jobs took."""
+
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def add(self, elapsed: float) -> None:
+        """Add the time a run took."""
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.buckets[bisect_left(HISTOGRAM_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the histogram."""
+        buckets = {
+            str(upper_bound): count
+            for upper_bound, count in zip(HISTOGRAM_BUCKETS, self.buckets)
+        }
+        buckets["+Inf"] = self.buckets[-1]
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
+class JobProfiler:
+    """Time the jobs run in the event loop.
+
+    Each callback and each step of a coroutine is a run, timed without the
+    jobs it runs itself. The runs are aggregated by the integration owning
+    the module of the job target, and by event type for event listeners.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler."""
+        self.hass = hass
+        self.started: float | None = None
+        self.integrations: dict[str, JobHistogram] = {}
+        self.event_types: dict[str, JobHistogram] = {}
+        self._owners: dict[str, str] = {}
+        self._nested_time = 0.0
+
+    @callback
+    def async_start(self) -> None:
+        """Start timing the jobs."""
+        self.started = monotonic()
+        self.integrations.clear()
+        self.event_types.clear()
+        self.hass.async_set_job_wrapper(self._wrap_job)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop timing the jobs."""
+        self.started = None
+        self.hass.async_set_job_wrapper(None)
+
+    @callback
+    def async_stats(self) -> dict[str, Any]:
+        """Return the histograms of the jobs run since the profiler started."""
+        return {
+            "running": self.started is not None,
+            "duration": None if self.started is None else monotonic() - self.started,
+            "integrations": {
+                owner: histogram.as_dict()
+                for owner, histogram in self.integrations.items()
+            },
+            "event_types": {
+                event_type: histogram.as_dict()
+                for event_type, histogram in self.event_types.items()
+            },
+        }
+
+    def _wrap_job(self, hassjob: HassJob[Any]) -> Callable[..., Any]:
+        """Wrap the target of a job to time it."""
+        target = hassjob.target
+        owner = self._job_owner(target)
+        if hassjob.job_type == HassJobType.Coroutinefunction:
+
+            async def _timed_coroutine_function(*args: Any) -> Any:
+                return await self._timed_coroutine(
+                    owner, _event_type(args), target(*args)
+                )
+
+            return _timed_coroutine_function
+
+        def _timed_callback(*args: Any) -> Any:
+            return self._run(owner, _event_type(args), target, *args)
+
+        return _timed_callback
+
+    def _job_owner(self, target: Callable[..., Any]) -> str:
+        """Return the integration owning the module of a job target."""
+        while isinstance(target, functools.partial):
+            target = target.func
+        module = getattr(target, "__module__", None) or type(target).__module__
+        if (owner := self._owners.get(module)) is None:
+            parts = module.split(".")
+            if parts[:2] == ["homeassistant", "components"] and len(parts) > 2:
+                owner = parts[2]
+            elif parts[0] == "custom_components" and len(parts) > 1:
+                owner = parts[1]
+            else:
+                owner = module
+            self._owners[module] = owner
+        return owner
+
+    def _run(
+        self,
+        owner: str,
+        event_type: str | None,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """Run a function, timing it without the runs nested in it."""
+        outer_nested_time = self._nested_time
+        self._nested_time = 0.0
+        start = monotonic()
+        try:
+            return func(*args)
+        finally:
+            elapsed = monotonic() - start
+            own_time = elapsed - self._nested_time
+            self._nested_time = outer_nested_time + elapsed
+            if (histogram := self.integrations.get(owner)) is None:
+                histogram = self.integrations[owner] = JobHistogram()
+            histogram.add(own_time)
+            if event_type is not None:
+                if (histogram := self.event_types.get(event_type)) is None:
+                    histogram = self.event_types[event_type] = JobHistogram()
+                histogram.add(own_time)
+
+    @types.coroutine
+    def _timed_coroutine(
+        self, owner: str, event_type: str | None, coro: Coroutine[Any, Any, Any]
+    ) -> Generator[Any, Any, Any]:
+        """Await a coroutine, timing each of its steps."""
+        value: Any = None
+        error: BaseException | None = None
+        while True:
+            try:
+                if error is None:
+                    future = self._run(owner, event_type, coro.send, value)
+                else:
+                    future = self._run(owner, event_type, coro.throw, error)
+            except StopIteration as err:
+                return err.value
+            try:
+                value = yield future
+                error = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as err:  # pylint: disable=broad-except
+                value = None
+                error = err
+
+
+def _event_type(args: tuple[Any, ...]) -> str | None:
+    """Return the event type if the job is an event listener."""
+    if args and isinstance(args[0], Event):
+        return args[0].event_type
+    return None
@@ -14,6 +14,7 @@ import threading
 import time
 from typing import Any
 
+from lru import LRU  # pylint: disable=no-name-in-module
 from sqlalchemy import create_engine, event as sqlalchemy_event, exc, func, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -53,18 +54,26 @@ from homeassistant.helpers.typing import ConfigType
 from homeassistant.loader import bind_hass
 import homeassistant.util.dt as dt_util
 
-from . import history, migration, purge, statistics, websocket_api
+from . import history, migration, purge, snapshot, statistics, websocket_api
+from .bulk_insert import BULK_INSERT_DIALECTS, BulkInsertWriter, OldStateRef
+from .coalesce import PendingStateChange, StateChangeCoalescer
 from .const import (
+    COALESCE_QUEUE_BACKLOG,
     CONF_DB_INTEGRITY_CHECK,
     DATA_INSTANCE,
     DOMAIN,
+    HISTORY_CACHE_MAX_MEMORY,
+    LOW_PRIORITY_DOMAINS,
     MAX_QUEUE_BACKLOG,
+    SHED_QUEUE_BACKLOG,
     SQLITE_URL_PREFIX,
 )
+from .history_cache import HistoryCache
 from .models import (
     Base,
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     process_timestamp,
@@ -126,15 +135,25 @@ KEEPALIVE_TIME = 30
 # States and Events objects
 EXPIRE_AFTER_COMMITS = 120
 
+# The number of attribute ids to cache in memory
+#
+# Based on:
+# - The number of overlapping attributes
+# - How frequently states with overlapping attributes will change
+# - How much memory our low end hardware has
+STATE_ATTRIBUTES_ID_CACHE_SIZE = 2048
+
 DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 1
 
 CONF_AUTO_PURGE = "auto_purge"
+CONF_BULK_INSERT = "bulk_insert"
 CONF_DB_URL = "db_url"
 CONF_DB_MAX_RETRIES = "db_max_retries"
 CONF_DB_RETRY_WAIT = "db_retry_wait"
 CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
+CONF_PURGE_CHUNK_SIZE = "purge_chunk_size"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
 
@@ -174,6 +193,8 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(
                         CONF_DB_INTEGRITY_CHECK, default=DEFAULT_DB_INTEGRITY_CHECK
                     ): cv.boolean,
+                    vol.Optional(CONF_BULK_INSERT, default=False): cv.boolean,
+                    vol.Optional(CONF_PURGE_CHUNK_SIZE): cv.positive_int,
                 }
             ),
         )
@@ -263,6 +284,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_t=exclude_t,
+        bulk_insert=conf[CONF_BULK_INSERT],
+        purge_chunk_size=conf.get(CONF_PURGE_CHUNK_SIZE),
     )
     instance.async_initialize()
     instance.start()
@@ -371,6 +394,9 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        # Pending states may reference attributes that are about to be purged
+        instance._commit_event_session_or_retry()  # pylint: disable=protected-access
+        instance.history_cache.purge_before(self.purge_before)
         if purge.purge_old_data(
             instance, self.purge_before, self.repack, self.apply_filter
         ):
@@ -391,6 +417,9 @@ class PurgeEntitiesTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge entities from the database."""
+        # Pending states may reference attributes that are about to be purged
+        instance._commit_event_session_or_retry()  # pylint: disable=protected-access
+        instance.history_cache.purge_entities(self.entity_filter)
         if purge.purge_entity_data(instance, self.entity_filter):
             return
         # Schedule a new purge task if this one didn't finish
@@ -420,6 +449,22 @@ class StatisticsTask(RecorderTask):
         instance.queue.put(StatisticsTask(self.start))
 
 
+@dataclass
+class StateSnapshotTask(RecorderTask):
+    """An object to insert into the recorder queue to save a state snapshot."""
+
+    start: datetime
+
+    def run(self, instance: Recorder) -> None:
+        """Run state snapshot task."""
+        # The snapshot must include the states still waiting to be committed
+        instance._commit_event_session_or_retry()  # pylint: disable=protected-access
+        if snapshot.save_state_snapshot(instance, self.start):
+            return
+        # Schedule a new state snapshot task if this one didn't finish
+        instance.queue.put(StateSnapshotTask(self.start))
+
+
 @dataclass
 class ExternalStatisticsTask(RecorderTask):
     """An object to insert into the recorder queue to run an external statistics task."""
@@ -478,6 +523,20 @@ class EventTask(RecorderTask):
         instance._process_one_event(self.event)
 
 
+@dataclass
+class StateChangeTask(RecorderTask):
+    """An object to insert into the recorder queue to record a state change."""
+
+    state_change: PendingStateChange
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        # The queued state change may have been replaced by a newer one
+        event = instance.coalescer.take(self.state_change)
+        # pylint: disable-next=[protected-access]
+        instance._process_one_event(event)
+
+
 class Recorder(threading.Thread):
     """A threaded recorder class."""
 
@@ -494,6 +553,8 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool],
         exclude_t: list[str],
+        bulk_insert: bool,
+        purge_chunk_size: int | None,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -507,6 +568,9 @@ class Recorder(threading.Thread):
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
+        self.bulk_insert = bulk_insert
+        self.purge_chunk_size = purge_chunk_size
+        self.purge_metrics = purge.PurgeMetrics()
         self.async_db_ready: asyncio.Future = asyncio.Future()
         self.async_recorder_ready = asyncio.Event()
         self._queue_watch = threading.Event()
@@ -519,8 +583,17 @@ class Recorder(threading.Thread):
         self._timechanges_seen = 0
         self._commits_without_expire = 0
         self._keepalive_count = 0
-        self._old_states: dict[str, States] = {}
+        self._old_states: dict[str, States | OldStateRef] = {}
+        self._state_attributes_ids: LRU = LRU(STATE_ATTRIBUTES_ID_CACHE_SIZE)
+        self._pending_state_attributes: dict[str, StateAttributes] = {}
         self._pending_expunge: list[States] = []
+        self._bulk_writer: BulkInsertWriter | None = None
+        self.history_cache = HistoryCache(HISTORY_CACHE_MAX_MEMORY)
+        self.coalescer = StateChangeCoalescer(
+            COALESCE_QUEUE_BACKLOG, SHED_QUEUE_BACKLOG, LOW_PRIORITY_DOMAINS
+        )
+        self.commit_latency: float | None = None
+        self._uncommitted_since: datetime | None = None
         self.event_session = None
         self.get_session = None
         self._completed_first_database_setup = None
@@ -633,6 +706,7 @@ class Recorder(threading.Thread):
                     self.queue.get_nowait()
                 except queue.Empty:
                     break
+            self.coalescer.clear()
             self.queue.put(StopTask())
 
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _empty_queue)
@@ -698,6 +772,12 @@ class Recorder(threading.Thread):
         start = statistics.get_start_time()
         self.queue.put(StatisticsTask(start))
 
+    @callback
+    def async_periodic_state_snapshot(self, now):
+        """Trigger the hourly state snapshot."""
+        start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        self.queue.put(StateSnapshotTask(start))
+
     @callback
     def async_clear_statistics(self, statistic_ids):
         """Clear statistics for a list of statistic_ids."""
@@ -730,6 +810,11 @@ class Recorder(threading.Thread):
             self.hass, self.async_periodic_statistics, minute=range(0, 60, 5), second=10
         )
 
+        # Save a snapshot of the latest states every hour
+        async_track_utc_time_change(
+            self.hass, self.async_periodic_state_snapshot, minute=0, second=30
+        )
+
     def run(self):
         """Start processing events to save."""
         shutdown_task = object()
@@ -904,6 +989,21 @@ class Recorder(threading.Thread):
         if not self.enabled:
             return
 
+        if self._uncommitted_since is None:
+            self._uncommitted_since = event.time_fired
+
+        if self._bulk_writer:
+            self._process_one_event_bulk(event)
+        else:
+            self._process_one_event_orm(event)
+
+        # If they do not have a commit interval
+        # than we commit right away
+        if not self.commit_interval:
+            self._commit_event_session_or_retry()
+
+    def _process_one_event_orm(self, event):
+        """Add an event and its state to the session as ORM objects."""
         try:
             if event.event_type == EVENT_STATE_CHANGED:
                 dbevent = Events.from_event(event, event_data="{}")
@@ -918,6 +1018,14 @@ class Recorder(threading.Thread):
         if event.event_type == EVENT_STATE_CHANGED:
             try:
                 dbstate = States.from_event(event)
+                shared_attrs = StateAttributes.shared_attrs_from_event(event)
+            except (TypeError, ValueError):
+                _LOGGER.warning(
+                    "State is not JSON serializable: %s",
+                    event.data.get("new_state"),
+                )
+            else:
+                self._link_state_attributes(dbstate, shared_attrs)
                 has_new_state = event.data.get("new_state")
                 if dbstate.entity_id in self._old_states:
                     old_state = self._old_states.pop(dbstate.entity_id)
@@ -933,16 +1041,85 @@ class Recorder(threading.Thread):
                 if has_new_state:
                     self._old_states[dbstate.entity_id] = dbstate
                     self._pending_expunge.append(dbstate)
-            except (TypeError, ValueError):
-                _LOGGER.warning(
-                    "State is not JSON serializable: %s",
-                    event.data.get("new_state"),
-                )
+                self.history_cache.add_state(event, shared_attrs)
 
-        # If they do not have a commit interval
-        # than we commit right away
-        if not self.commit_interval:
-            self._commit_event_session_or_retry()
+    def _process_one_event_bulk(self, event):
+        """Add an event and its state to the pending bulk insert rows."""
+        writer = self._bulk_writer
+        try:
+            if event.event_type == EVENT_STATE_CHANGED:
+                event_id = writer.add_event(self.event_session, event, "{}")
+            else:
+                event_id = writer.add_event(self.event_session, event)
+        except (TypeError, ValueError):
+            _LOGGER.warning("Event is not JSON serializable: %s", event)
+            return
+
+        if event.event_type != EVENT_STATE_CHANGED:
+            return
+
+        try:
+            shared_attrs = StateAttributes.shared_attrs_from_event(event)
+        except (TypeError, ValueError):
+            _LOGGER.warning(
+                "State is not JSON serializable: %s",
+                event.data.get("new_state"),
+            )
+            return
+
+        if not (
+            attributes_id := writer.pending_attributes_ids.get(shared_attrs)
+            or self._state_attributes_ids.get(shared_attrs)
+        ):
+            attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+            if not (
+                attributes_id := self._find_state_attributes_id(shared_attrs, attr_hash)
+            ):
+                attributes_id = writer.add_state_attributes(shared_attrs, attr_hash)
+
+        entity_id = event.data["entity_id"]
+        old_state = self._old_states.pop(entity_id, None)
+        state_id = writer.add_state(
+            event, event_id, attributes_id, old_state and old_state.state_id
+        )
+        if event.data.get("new_state"):
+            self._old_states[entity_id] = OldStateRef(state_id)
+        self.history_cache.add_state(event, shared_attrs)
+
+    def _find_state_attributes_id(
+        self, shared_attrs: str, attr_hash: int
+    ) -> int | None:
+        """Find matching attributes in the database and cache the id."""
+        if attributes := (
+            self.event_session.query(StateAttributes.attributes_id)
+            .filter(StateAttributes.hash == attr_hash)
+            .filter(StateAttributes.shared_attrs == shared_attrs)
+            .first()
+        ):
+            self._state_attributes_ids[shared_attrs] = attributes[0]
+            return attributes[0]
+        return None
+
+    def _link_state_attributes(self, dbstate: States, shared_attrs: str) -> None:
+        """Point dbstate at a deduplicated StateAttributes row."""
+        # Matching attributes found in the pending commit
+        if pending_attributes := self._pending_state_attributes.get(shared_attrs):
+            dbstate.state_attributes = pending_attributes
+            return
+        # Matching attributes id found in the cache
+        if attributes_id := self._state_attributes_ids.get(shared_attrs):
+            dbstate.attributes_id = attributes_id
+            return
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        # Matching attributes found in the database
+        if attributes_id := self._find_state_attributes_id(shared_attrs, attr_hash):
+            dbstate.attributes_id = attributes_id
+            return
+        # No matching attributes found, save them in the DB
+        dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=attr_hash)
+        dbstate.state_attributes = dbstate_attributes
+        self._pending_state_attributes[shared_attrs] = dbstate_attributes
+        self.event_session.add(dbstate_attributes)
 
     def _handle_database_error(self, err):
         """Handle a database error that may result in moving away the corrupt db."""
@@ -956,7 +1133,11 @@ class Recorder(threading.Thread):
 
     def _commit_event_session_or_retry(self):
         """Commit the event session if there is work to do."""
-        if not self.event_session.new and not self.event_session.dirty:
+        if (
+            not self.event_session.new
+            and not self.event_session.dirty
+            and not (self._bulk_writer and self._bulk_writer.pending)
+        ):
             return
         tries = 1
         while tries <= self.db_max_retries:
@@ -973,12 +1154,18 @@ class Recorder(threading.Thread):
                 if tries == self.db_max_retries:
                     raise
 
+                if self._bulk_writer:
+                    # The whole batch is written again on the next try
+                    self.event_session.rollback()
                 tries += 1
                 time.sleep(self.db_retry_wait)
 
     def _commit_event_session(self):
         self._commits_without_expire += 1
 
+        if self._bulk_writer:
+            self._bulk_writer.write(self.event_session)
+
         if self._pending_expunge:
             self.event_session.flush()
             for dbstate in self._pending_expunge:
@@ -989,6 +1176,24 @@ class Recorder(threading.Thread):
             self._pending_expunge = []
         self.event_session.commit()
 
+        if self._uncommitted_since is not None:
+            self.commit_latency = (
+                dt_util.utcnow() - self._uncommitted_since
+            ).total_seconds()
+            self._uncommitted_since = None
+
+        # Once the attributes have been committed they have an id
+        # and can be referenced by later states without a lookup
+        for dbstate_attributes in self._pending_state_attributes.values():
+            self._state_attributes_ids[
+                dbstate_attributes.shared_attrs
+            ] = dbstate_attributes.attributes_id
+        self._pending_state_attributes = {}
+
+        if self._bulk_writer:
+            self._state_attributes_ids.update(self._bulk_writer.pending_attributes_ids)
+            self._bulk_writer.clear()
+
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
         # do it after EXPIRE_AFTER_COMMITS commits
@@ -1003,10 +1208,16 @@ class Recorder(threading.Thread):
         move_away_broken_database(dburl_to_path(self.db_url))
         self._setup_recorder()
         self._setup_run()
+        # The states recorded so far were lost with the broken database
+        self.history_cache.reset(dt_util.utcnow())
 
     def _close_event_session(self):
         """Close the event session."""
         self._old_states = {}
+        self._state_attributes_ids.clear()
+        self._pending_state_attributes = {}
+        if self._bulk_writer:
+            self._bulk_writer.clear()
 
         if not self.event_session:
             return
@@ -1028,6 +1239,16 @@ class Recorder(threading.Thread):
         """Open the event session."""
         self.event_session = self.get_session()
         self.event_session.expire_on_commit = False
+        self._bulk_writer = None
+        if not self.bulk_insert:
+            return
+        if self.engine.dialect.name in BULK_INSERT_DIALECTS:
+            self._bulk_writer = BulkInsertWriter()
+        else:
+            _LOGGER.warning(
+                "Bulk insert is not supported for %s databases, using the default write path",
+                self.engine.dialect.name,
+            )
 
     def _send_keep_alive(self):
         """Send a keep alive to keep the db connection open."""
@@ -1037,6 +1258,10 @@ class Recorder(threading.Thread):
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
+        if event.event_type == EVENT_STATE_CHANGED:
+            if state_change := self.coalescer.add(event, self.queue.qsize()):
+                self.queue.put(StateChangeTask(state_change))
+            return
         self.queue.put(EventTask(event))
 
     def block_till_done(self):
@@ -1157,6 +1382,7 @@ class Recorder(threading.Thread):
             start = self.recording_start
             end_incomplete_runs(session, start)
             self.run_info = RecorderRuns(start=start, created=dt_util.utcnow())
+            self.history_cache.reset(start)
             session.add(self.run_info)
             session.flush()
             session.expunge(self.run_info)
@@ -0,0 +1,167 @@
+"""Batched write path for the recorder event session."""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.orm.session import Session
+
+from homeassistant.core import Event, split_entity_id
+from homeassistant.helpers.json import JSONEncoder
+
+from .models import Events, StateAttributes, States
+
+# Dialects where explicitly inserted primary keys advance the id generator
+# so rows written outside of the bulk path never collide with reserved ids.
+BULK_INSERT_DIALECTS = {"sqlite", "mysql"}
+
+
+class OldStateRef:
+    """Reference to the last recorded state of an entity.
+
+    Takes the place of the States object kept in Recorder._old_states
+    when rows are written in bulk, only the state_id is needed to link
+    the next state of the entity.
+    """
+
+    __slots__ = ("state_id",)
+
+    def __init__(self, state_id: int) -> None:
+        """Init the reference."""
+        self.state_id = state_id
+
+
+class BulkInsertWriter:
+    """Accumulate rows between commits and write them with executemany.
+
+    Primary keys are handed out from an in-memory counter seeded from the
+    database once per batch, which allows old_state_id, event_id and
+    attributes_id to be resolved before anything is written. This relies
+    on the recorder thread being the only writer of these tables.
+    """
+
+    def __init__(self) -> None:
+        """Init the writer."""
+        self.pending_attributes_ids: dict[str, int] = {}
+        self._events: list[dict[str, Any]] = []
+        self._states: list[dict[str, Any]] = []
+        self._state_attributes: list[dict[str, Any]] = []
+        self._next_event_id: int | None = None
+        self._next_state_id = 0
+        self._next_attributes_id = 0
+
+    @property
+    def pending(self) -> bool:
+        """Return if there are rows waiting to be written."""
+        return bool(self._events)
+
+    def _reserve_ids(self, session: Session) -> None:
+        """Seed the id counters from the highest ids in the database."""
+        self._next_event_id = (
+            session.query(func.max(Events.event_id)).scalar() or 0
+        ) + 1
+        self._next_state_id = (
+            session.query(func.max(States.state_id)).scalar() or 0
+        ) + 1
+        self._next_attributes_id = (
+            session.query(func.max(StateAttributes.attributes_id)).scalar() or 0
+        ) + 1
+
+    def add_event(
+        self, session: Session, event: Event, event_data: str | None = None
+    ) -> int:
+        """Add an events row and return its event_id."""
+        row = {
+            "event_type": event.event_type,
+            "event_data": event_data
+            or json.dumps(event.data, cls=JSONEncoder, separators=(",", ":")),
+            "origin": str(event.origin.value),
+            "time_fired": event.time_fired,
+            "created": event.time_fired,
+            "context_id": event.context.id,
+            "context_user_id": event.context.user_id,
+            "context_parent_id": event.context.parent_id,
+        }
+        if self._next_event_id is None:
+            self._reserve_ids(session)
+        row["event_id"] = event_id = self._next_event_id
+        self._next_event_id += 1
+        self._events.append(row)
+        return event_id
+
+    def add_state(
+        self,
+        event: Event,
+        event_id: int,
+        attributes_id: int,
+        old_state_id: int | None,
+    ) -> int:
+        """Add a states row for a state_changed event and return its state_id.
+
+        Must be called after add_event for the same event.
+        """
+        entity_id = event.data["entity_id"]
+        if (state := event.data.get("new_state")) is None:
+            domain = split_entity_id(entity_id)[0]
+            last_changed = last_updated = event.time_fired
+        else:
+            domain = state.domain
+            last_changed = state.last_changed
+            last_updated = state.last_updated
+        state_id = self._next_state_id
+        self._next_state_id += 1
+        self._states.append(
+            {
+                "state_id": state_id,
+                "domain": domain,
+                "entity_id": entity_id,
+                "state": state.state if state else "",
+                "attributes": None,
+                "event_id": event_id,
+                "last_changed": last_changed,
+                "last_updated": last_updated,
+                "created": event.time_fired,
+                "old_state_id": old_state_id,
+                "attributes_id": attributes_id,
+            }
+        )
+        return state_id
+
+    def add_state_attributes(self, shared_attrs: str, attr_hash: int) -> int:
+        """Add a state_attributes row and return its attributes_id.
+
+        Must be called after add_event so the id counters are seeded.
+        """
+        attributes_id = self._next_attributes_id
+        self._next_attributes_id += 1
+        self._state_attributes.append(
+            {
+                "attributes_id": attributes_id,
+                "hash": attr_hash,
+                "shared_attrs": shared_attrs,
+            }
+        )
+        self.pending_attributes_ids[shared_attrs] = attributes_id
+        return attributes_id
+
+    def write(self, session: Session) -> None:
+        """Write the pending rows in the current transaction.
+
+        The rows are kept until clear is called so the batch
+        can be written again if the transaction is rolled back.
+        """
+        if self._state_attributes:
+            session.execute(StateAttributes.__table__.insert(), self._state_attributes)
+        if self._events:
+            session.execute(Events.__table__.insert(), self._events)
+        if self._states:
+            session.execute(States.__table__.insert(), self._states)
+
+    def clear(self) -> None:
+        """Forget the written rows and start a new batch."""
+        self.pending_attributes_ids = {}
+        self._events = []
+        self._states = []
+        self._state_attributes = []
+        self._next_event_id = None
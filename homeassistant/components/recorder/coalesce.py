@@ -0,0 +1,96 @@
+"""Coalesce the state changes waiting in the recorder queue."""
+from __future__ import annotations
+
+from collections.abc import Container
+from contextlib import suppress
+import threading
+
+from homeassistant.core import Event, split_entity_id
+
+
+class PendingStateChange:
+    """A state change of an entity waiting in the recorder queue."""
+
+    __slots__ = ("entity_id", "event")
+
+    def __init__(self, entity_id: str, event: Event) -> None:
+        """Init the pending state change."""
+        self.entity_id = entity_id
+        self.event = event
+
+
+class StateChangeCoalescer:
+    """Merge state changes into the ones of the same entity still queued.
+
+    All queued state changes are tracked. Once the backlog reaches
+    coalesce_backlog, a new state change of an entity with two or more
+    queued ones replaces the last queued one, keeping the first and the
+    latest. Once it reaches shed_backlog, only the latest state change of
+    the low priority domains is kept.
+
+    State changes are added from the event loop and taken by the recorder
+    thread, a lock ensures a state change is never replaced after it was
+    taken.
+    """
+
+    def __init__(
+        self,
+        coalesce_backlog: int,
+        shed_backlog: int,
+        low_priority_domains: Container[str],
+    ) -> None:
+        """Init the coalescer."""
+        self.coalesce_backlog = coalesce_backlog
+        self.shed_backlog = shed_backlog
+        self.low_priority_domains = low_priority_domains
+        self.coalesced = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[PendingStateChange]] = {}
+
+    def add(self, event: Event, backlog: int) -> PendingStateChange | None:
+        """Add a state change with backlog tasks queued.
+
+        Returns the pending state change to queue, or None if the state
+        change replaced one which is already queued.
+        """
+        entity_id = event.data["entity_id"]
+        with self._lock:
+            pending = self._pending.get(entity_id)
+            if pending and backlog >= self.coalesce_backlog:
+                if (
+                    backlog >= self.shed_backlog
+                    and split_entity_id(entity_id)[0] in self.low_priority_domains
+                ):
+                    if len(pending) == 1:
+                        self.shed += 1
+                    else:
+                        self.coalesced += 1
+                    pending[-1].event = event
+                    return None
+                if len(pending) >= 2:
+                    self.coalesced += 1
+                    pending[-1].event = event
+                    return None
+            state_change = PendingStateChange(entity_id, event)
+            self._pending.setdefault(entity_id, []).append(state_change)
+            return state_change
+
+    def take(self, state_change: PendingStateChange) -> Event:
+        """Take a state change out of the queue to record it.
+
+        The state change is no longer tracked if the queue was cleared after
+        it was taken from the queue, its event is still returned.
+        """
+        with self._lock:
+            if (pending := self._pending.get(state_change.entity_id)) is not None:
+                with suppress(ValueError):
+                    pending.remove(state_change)
+                if not pending:
+                    del self._pending[state_change.entity_id]
+            return state_change.event
+
+    def clear(self) -> None:
+        """Forget the queued state changes when the queue is emptied."""
+        with self._lock:
+            self._pending.clear()
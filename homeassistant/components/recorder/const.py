@@ -8,6 +8,25 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
 MAX_QUEUE_BACKLOG = 30000
 
+# Queued state changes of an entity are coalesced above this backlog
+COALESCE_QUEUE_BACKLOG = 3000
+# Only the latest queued state change of low priority domains is kept
+# above this backlog
+SHED_QUEUE_BACKLOG = 15000
+LOW_PRIORITY_DOMAINS = {
+    "camera",
+    "geo_location",
+    "image_processing",
+    "media_player",
+    "proximity",
+    "sensor",
+    "sun",
+    "weather",
+}
+
+# The maximum memory used by the history cache, in bytes
+HISTORY_CACHE_MAX_MEMORY = 32 * 1024 * 1024
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -1,19 +1,27 @@
 """Provide pre-made queries on top of the recorder component."""
 from __future__ import annotations
 
-from collections import defaultdict
 from itertools import groupby
+import json
 import logging
 import time
 
-from sqlalchemy import and_, bindparam, func
+from sqlalchemy import and_, bindparam, case, func
 from sqlalchemy.ext import baked
 
 from homeassistant.components import recorder
 from homeassistant.core import split_entity_id
 import homeassistant.util.dt as dt_util
 
-from .models import LazyState, States, process_timestamp_to_utc_isoformat
+from .const import DATA_INSTANCE
+from .models import (
+    LazyState,
+    StateAttributes,
+    States,
+    process_timestamp,
+    process_timestamp_to_utc_isoformat,
+)
+from .snapshot import get_snapshot_start, state_ids_at_point_in_time_subquery
 from .util import execute, session_scope
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -46,10 +54,14 @@ QUERY_STATES = [
     States.attributes,
     States.last_changed,
     States.last_updated,
+    StateAttributes.shared_attrs,
 ]
 
 HISTORY_BAKERY = "recorder_history_bakery"
 
+# Number of rows fetched at a time when streaming states
+STREAM_BATCH_SIZE = 1000
+
 
 def async_setup(hass):
     """Set up the history hooks."""
@@ -85,11 +97,369 @@ def get_significant_states_with_session(
     as well as all states from certain domains (for instance
     thermostat so that we get current temperature in our graphs).
     """
+    states = _get_significant_states_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+
+    return _sorted_states_to_dict(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+    )
+
+
+def get_significant_states_compressed_with_session(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    need_attributes=False,
+):
+    """
+    Return states changes during UTC period start_time - end_time in columns.
+
+    Takes the same arguments as get_significant_states_with_session and
+    returns the same points as a minimal response, but as parallel lists
+    per entity built directly from the rows:
+
+    {
+        "states": [state strings, each listed once],
+        "entities": {
+            entity_id: {
+                "s": [index of the state of each point in "states"],
+                "t": [time of each point as seconds since the epoch],
+                "a": attributes of the last point,
+            }
+        }
+    }
+
+    The time of a point is last_changed, except for NEED_ATTRIBUTE_DOMAINS
+    where every attribute change is a point, its time is last_updated and
+    the entity has an extra "pa" list with the attributes of each point.
+    If need_attributes is set, all entities are handled like that.
+
+    Points with the same attributes share the same attributes dict.
+    """
+    states = _get_significant_states_rows(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        filters,
+        significant_changes_only,
+    )
+
+    start_states = {}
+    if include_start_time_state:
+        start_states = {
+            state.entity_id: state
+            for state in _get_start_time_states(
+                hass, session, start_time, entity_ids, filters
+            )
+        }
+
+    state_table = {}
+    entities = {}
+    # Set all entity IDs in the result to maintain the order
+    if entity_ids is not None:
+        for ent_id in entity_ids:
+            entities[ent_id] = None
+
+    # Called in a tight loop so cache the functions here
+    _process_timestamp = process_timestamp
+    _intern_state = state_table.setdefault
+    # Decoded attributes by their JSON, most points share them
+    attributes_cache = {}
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        entity_need_attributes = (
+            need_attributes or split_entity_id(ent_id)[0] in NEED_ATTRIBUTE_DOMAINS
+        )
+        state_indexes = []
+        times = []
+        point_attributes = []
+        prev_state = None
+        last_row = None
+
+        if (start_state := start_states.pop(ent_id, None)) is not None:
+            prev_state = start_state.state
+            state_indexes.append(_intern_state(prev_state, len(state_table)))
+            times.append(start_time.timestamp())
+            if entity_need_attributes:
+                point_attributes.append(start_state.attributes)
+            last_row = start_state
+
+        for row in group:
+            state = row.state or ""
+            if entity_need_attributes:
+                shared_attrs = row.shared_attrs or row.attributes
+                if (attributes := attributes_cache.get(shared_attrs)) is None:
+                    attributes = attributes_cache[shared_attrs] = _row_attributes(row)
+                point_attributes.append(attributes)
+                timestamp = row.last_updated
+            elif state == prev_state:
+                # Only state changes are points without attributes
+                continue
+            else:
+                timestamp = row.last_changed
+            state_indexes.append(_intern_state(state, len(state_table)))
+            times.append(_process_timestamp(timestamp).timestamp())
+            prev_state = state
+            last_row = row
+
+        entities[ent_id] = _compressed_entity(
+            state_indexes, times, last_row, point_attributes, entity_need_attributes
+        )
+
+    for ent_id, start_state in start_states.items():
+        entity_need_attributes = (
+            need_attributes or split_entity_id(ent_id)[0] in NEED_ATTRIBUTE_DOMAINS
+        )
+        entities[ent_id] = _compressed_entity(
+            [_intern_state(start_state.state, len(state_table))],
+            [start_time.timestamp()],
+            start_state,
+            [start_state.attributes],
+            entity_need_attributes,
+        )
+
+    return {
+        "states": list(state_table),
+        # Filter out the entities without states
+        "entities": {key: val for key, val in entities.items() if val},
+    }
+
+
+def _row_attributes(row):
+    """Return the attributes of a row."""
+    if (source := row.shared_attrs or row.attributes) is None:
+        # The attributes were purged
+        return {}
+    try:
+        return json.loads(source)
+    except ValueError:
+        # When json.loads fails
+        _LOGGER.exception("Error converting row to state: %s", row)
+        return {}
+
+
+def _compressed_entity(
+    state_indexes, times, last_row, point_attributes, need_attributes
+):
+    """Return the compressed history of an entity."""
+    if need_attributes:
+        attributes = point_attributes[-1]
+    elif isinstance(last_row, LazyState):
+        attributes = last_row.attributes
+    else:
+        attributes = _row_attributes(last_row)
+    entity = {"s": state_indexes, "t": times, "a": attributes}
+    if need_attributes:
+        entity["pa"] = point_attributes
+    return entity
+
+
+def _get_significant_states_rows(
+    hass,
+    session,
+    start_time,
+    end_time,
+    entity_ids,
+    filters,
+    significant_changes_only,
+):
+    """Return the significant state rows sorted by entity_id and last_updated."""
     timer_start = time.perf_counter()
 
+    query_end_time, cached_states = _significant_states_from_cache(
+        hass, start_time, end_time, entity_ids, significant_changes_only
+    )
+
+    states = []
+    if query_end_time is None or query_end_time > start_time:
+        baked_query = _significant_states_baked_query(
+            hass, entity_ids, filters, query_end_time, significant_changes_only
+        )
+        states = execute(
+            baked_query(session).params(
+                start_time=start_time, end_time=query_end_time, entity_ids=entity_ids
+            )
+        )
+
+    if cached_states:
+        states = _merge_cached_states(states, cached_states)
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        elapsed = time.perf_counter() - timer_start
+        _LOGGER.debug("get_significant_states took %fs", elapsed)
+
+    return states
+
+
+def stream_significant_states_with_session(
+    hass,
+    session,
+    start_time,
+    end_time=None,
+    entity_ids=None,
+    filters=None,
+    include_start_time_state=True,
+    significant_changes_only=True,
+    minimal_response=False,
+):
+    """
+    Yield the states changes during UTC period start_time - end_time per entity.
+
+    Takes the same arguments as get_significant_states_with_session and yields
+    (entity_id, states) tuples in the same order, but the rows are fetched
+    from a server-side cursor in batches of STREAM_BATCH_SIZE so only the
+    states of the entity being yielded are held in memory.
+
+    The session must be kept open until the generator is exhausted.
+    """
+    query_end_time, cached_states = _significant_states_from_cache(
+        hass, start_time, end_time, entity_ids, significant_changes_only
+    )
+
+    entity_order = None
+    if entity_ids is not None:
+        entity_order = {}
+        for idx, entity_id in enumerate(entity_ids):
+            entity_order.setdefault(entity_id, idx)
+
+    states = iter(())
+    if query_end_time is None or query_end_time > start_time:
+        baked_query = _significant_states_baked_query(
+            hass, entity_ids, filters, query_end_time, significant_changes_only
+        )
+        if entity_order is not None:
+            # Return the entities in the order they were requested, the
+            # ordering depends on entity_ids so it can't be cached
+            entity_order_clause = case(entity_order, value=States.entity_id)
+            baked_query.spoil()
+            baked_query += lambda q: q.order_by(None).order_by(
+                entity_order_clause, States.last_updated
+            )
+
+        states = baked_query(session).params(
+            start_time=start_time, end_time=query_end_time, entity_ids=entity_ids
+        )
+        if not _is_shared_connection(session):
+            states = states.with_post_criteria(lambda q: q.yield_per(STREAM_BATCH_SIZE))
+
+    if cached_states:
+        states = _merge_cached_states(states, cached_states, entity_order)
+
+    yield from _sorted_states_to_entity_lists(
+        hass,
+        session,
+        states,
+        start_time,
+        entity_ids,
+        filters,
+        include_start_time_state,
+        minimal_response,
+        entity_order,
+    )
+
+
+def _history_cache(hass):
+    """Return the history cache of the recorder, if any."""
+    if (instance := hass.data.get(DATA_INSTANCE)) is None:
+        return None
+    return instance.history_cache
+
+
+def _significant_states_from_cache(
+    hass, start_time, end_time, entity_ids, significant_changes_only
+):
+    """Return the significant states during a period which are cached.
+
+    Returns the end time of the part of the period which must be queried
+    from the database and the cached states of each entity after that.
+    Only explicitly included entities are looked up in the cache.
+    """
+    if (
+        entity_ids is None
+        or (cache := _history_cache(hass)) is None
+        or (split_time := cache.split_time(entity_ids, start_time)) is None
+        or (end_time is not None and split_time >= end_time)
+    ):
+        return end_time, None
+
+    def row_filter(row):
+        return row.last_updated > start_time and (
+            not significant_changes_only
+            or row.domain in SIGNIFICANT_DOMAINS
+            or row.last_changed == row.last_updated
+        )
+
+    return split_time, cache.states_during_period(
+        entity_ids, split_time, end_time, row_filter
+    )
+
+
+def _merge_cached_states(states, cached_states, entity_order=None):
+    """Merge the cached states after the queried states of each entity.
+
+    states must be grouped by entity_id, or sorted by the position of the
+    entity_id in entity_order if given. Entities which only have cached
+    states are merged at their position in entity_order if given, and
+    after the queried states otherwise.
+    """
+    # Entities with cached states at their position in entity_order,
+    # popped from the end
+    sort_key = _entity_sort_key(entity_order)
+    pending = []
+    if entity_order is not None:
+        pending = sorted(cached_states, key=sort_key, reverse=True)
+
+    for ent_id, group in groupby(states, lambda state: state.entity_id):
+        while pending and sort_key(pending[-1]) < sort_key(ent_id):
+            yield from cached_states.pop(pending.pop(), ())
+        yield from group
+        yield from cached_states.pop(ent_id, ())
+
+    for ent_id in sorted(cached_states, key=sort_key):
+        yield from cached_states[ent_id]
+
+
+def _is_shared_connection(session):
+    """Return if the session uses a connection shared with the recorder thread.
+
+    An in-memory SQLite database has a single connection for all threads, an
+    open cursor on it must not be left behind while the recorder writes.
+    """
+    url = session.bind.url
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _significant_states_baked_query(
+    hass, entity_ids, filters, end_time, significant_changes_only
+):
+    """Return the baked query for the significant states during a period."""
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
     if significant_changes_only:
         baked_query += lambda q: q.filter(
@@ -116,26 +486,7 @@ def get_significant_states_with_session(
 
     baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
 
-    states = execute(
-        baked_query(session).params(
-            start_time=start_time, end_time=end_time, entity_ids=entity_ids
-        )
-    )
-
-    if _LOGGER.isEnabledFor(logging.DEBUG):
-        elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("get_significant_states took %fs", elapsed)
-
-    return _sorted_states_to_dict(
-        hass,
-        session,
-        states,
-        start_time,
-        entity_ids,
-        filters,
-        include_start_time_state,
-        minimal_response,
-    )
+    return baked_query
 
 
 def state_changes_during_period(hass, start_time, end_time=None, entity_id=None):
@@ -144,6 +495,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
 
         baked_query += lambda q: q.filter(
             (States.last_changed == States.last_updated)
@@ -156,7 +510,9 @@ def state_changes_during_period(hass, start_time, end_time=None, entity_id=None)
             )
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(States.entity_id, States.last_updated)
@@ -180,10 +536,15 @@ def get_last_state_changes(hass, number_of_states, entity_id):
         baked_query = hass.data[HISTORY_BAKERY](
             lambda session: session.query(*QUERY_STATES)
         )
+        baked_query += lambda q: q.outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        )
         baked_query += lambda q: q.filter(States.last_changed == States.last_updated)
 
         if entity_id is not None:
-            baked_query += lambda q: q.filter_by(entity_id=bindparam("entity_id"))
+            baked_query += lambda q: q.filter(
+                States.entity_id == bindparam("entity_id")
+            )
             entity_id = entity_id.lower()
 
         baked_query += lambda q: q.order_by(
@@ -243,9 +604,21 @@ def _get_states_with_session(
 
     # We have more than one entity to look at so we need to do a query on states
     # since the last recorder run started.
-    query = session.query(*QUERY_STATES)
+    query = session.query(*QUERY_STATES).outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
 
-    if entity_ids:
+    if snapshot_start := get_snapshot_start(session, run.start, utc_point_in_time):
+        # Start from the newest state snapshot so only the states recorded
+        # since the snapshot was taken need to be scanned.
+        most_recent_state_ids = state_ids_at_point_in_time_subquery(
+            session, snapshot_start, utc_point_in_time, entity_ids
+        )
+        query = query.join(
+            most_recent_state_ids,
+            States.state_id == most_recent_state_ids.c.state_id,
+        )
+    elif entity_ids:
         # We got an include-list of entities, accelerate the query by filtering already
         # in the inner query.
         most_recent_state_ids = (
@@ -298,6 +671,9 @@ def _get_states_with_session(
             most_recent_state_ids,
             States.state_id == most_recent_state_ids.c.max_state_id,
         )
+
+    if not entity_ids:
+        # Filter out unwanted domains as well as applying the custom filter.
         query = query.filter(~States.domain.in_(IGNORE_DOMAINS))
         if filters:
             query = filters.apply(query)
@@ -311,6 +687,9 @@ def _get_single_entity_states_with_session(hass, session, utc_point_in_time, ent
     baked_query = hass.data[HISTORY_BAKERY](
         lambda session: session.query(*QUERY_STATES)
     )
+    baked_query += lambda q: q.outerjoin(
+        StateAttributes, States.attributes_id == StateAttributes.attributes_id
+    )
     baked_query += lambda q: q.filter(
         States.last_updated < bindparam("utc_point_in_time"),
         States.entity_id == bindparam("entity_id"),
@@ -341,31 +720,116 @@ def _sorted_states_to_dict(
     structure {'entity_id': [list of states], 'entity_id2': [list of states]}
 
     States must be sorted by entity_id and last_updated
-
-    We also need to go back and create a synthetic zero data point for
-    each list of states, otherwise our graphs won't start on the Y
-    axis correctly.
     """
-    result = defaultdict(list)
+    result = {}
     # Set all entity IDs to empty lists in result set to maintain the order
     if entity_ids is not None:
         for ent_id in entity_ids:
             result[ent_id] = []
 
+    result.update(
+        _sorted_states_to_entity_lists(
+            hass,
+            session,
+            states,
+            start_time,
+            entity_ids,
+            filters,
+            include_start_time_state,
+            minimal_response,
+        )
+    )
+
+    # Filter out the empty lists if some states had 0 results.
+    return {key: val for key, val in result.items() if val}
+
+
+def _entity_sort_key(entity_order):
+    """Return the sort key of entity_ids.
+
+    By position in entity_order if given and by entity_id otherwise.
+    """
+    if entity_order is not None:
+
+        def sort_key(ent_id):
+            return entity_order.get(ent_id, len(entity_order))
+
+    else:
+
+        def sort_key(ent_id):
+            return ent_id
+
+    return sort_key
+
+
+def _get_start_time_states(hass, session, start_time, entity_ids, filters):
+    """Return the states at the start time, from the history cache if possible."""
+    states = []
+    if entity_ids is not None and (cache := _history_cache(hass)) is not None:
+        cached_states = cache.states_before(entity_ids, start_time)
+        states = [LazyState(row) for row in cached_states.values()]
+        entity_ids = [
+            entity_id for entity_id in entity_ids if entity_id not in cached_states
+        ]
+        if not entity_ids:
+            return states
+
+    run = recorder.run_information_from_instance(hass, start_time)
+    states.extend(
+        _get_states_with_session(
+            hass, session, start_time, entity_ids, run=run, filters=filters
+        )
+    )
+    return states
+
+
+def _sorted_states_to_entity_lists(
+    hass,
+    session,
+    states,
+    start_time,
+    entity_ids,
+    filters=None,
+    include_start_time_state=True,
+    minimal_response=False,
+    entity_order=None,
+):
+    """Yield (entity_id, list of states) for each entity with states.
+
+    States must be sorted by entity_id, or by the position of the entity_id
+    in entity_order if given, and by last_updated. Entities are yielded as
+    their rows come in. Entities which only have a state at the start time
+    are yielded at their position in entity_order if given, and after the
+    entities with states otherwise since the order the database sorts the
+    entity_ids in may differ from the order Python sorts them in.
+
+    We also need to go back and create a synthetic zero data point for
+    each list of states, otherwise our graphs won't start on the Y
+    axis correctly.
+    """
     # Get the states at the start time
     timer_start = time.perf_counter()
+    start_states = {}
     if include_start_time_state:
-        run = recorder.run_information_from_instance(hass, start_time)
-        for state in _get_states_with_session(
-            hass, session, start_time, entity_ids, run=run, filters=filters
+        for state in _get_start_time_states(
+            hass, session, start_time, entity_ids, filters
         ):
             state.last_changed = start_time
             state.last_updated = start_time
-            result[state.entity_id].append(state)
+            start_states[state.entity_id] = state
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         elapsed = time.perf_counter() - timer_start
-        _LOGGER.debug("getting %d first datapoints took %fs", len(result), elapsed)
+        _LOGGER.debug(
+            "getting %d first datapoints took %fs", len(start_states), elapsed
+        )
+
+    # Entities with a state at the start time at their position in entity_order,
+    # popped from the end
+    sort_key = _entity_sort_key(entity_order)
+    pending_start_states = []
+    if entity_order is not None:
+        pending_start_states = sorted(start_states, key=sort_key, reverse=True)
 
     # Called in a tight loop so cache the function
     # here
@@ -373,8 +837,17 @@ def _sorted_states_to_dict(
 
     # Append all changes to it
     for ent_id, group in groupby(states, lambda state: state.entity_id):
+        while pending_start_states and sort_key(pending_start_states[-1]) < sort_key(
+            ent_id
+        ):
+            pending_ent_id = pending_start_states.pop()
+            if pending_ent_id in start_states:
+                yield pending_ent_id, [start_states.pop(pending_ent_id)]
+
         domain = split_entity_id(ent_id)[0]
-        ent_results = result[ent_id]
+        ent_results = []
+        if (start_state := start_states.pop(ent_id, None)) is not None:
+            ent_results.append(start_state)
         if not minimal_response or domain in NEED_ATTRIBUTE_DOMAINS:
             ent_results.extend(LazyState(db_state) for db_state in group)
 
@@ -388,21 +861,24 @@ def _sorted_states_to_dict(
         prev_state = ent_results[-1]
         initial_state_count = len(ent_results)
 
+        prev_state_state = prev_state.state or ""
         for db_state in group:
             # With minimal response we do not care about attribute
-            # changes so we can filter out duplicate states
-            if db_state.state == prev_state.state:
+            # changes so we can filter out duplicate states, removed
+            # states are recorded without a state
+            if (state := db_state.state or "") == prev_state_state:
                 continue
 
             ent_results.append(
                 {
-                    STATE_KEY: db_state.state,
+                    STATE_KEY: state,
                     LAST_CHANGED_KEY: _process_timestamp_to_utc_isoformat(
                         db_state.last_changed
                     ),
                 }
             )
             prev_state = db_state
+            prev_state_state = state
 
         if prev_state and len(ent_results) != initial_state_count:
             # There was at least one state change
@@ -410,8 +886,14 @@ def _sorted_states_to_dict(
             # a full state
             ent_results[-1] = LazyState(prev_state)
 
-    # Filter out the empty lists if some states had 0 results.
-    return {key: val for key, val in result.items() if val}
+        yield ent_id, ent_results
+
+    for pending_ent_id in reversed(pending_start_states):
+        if pending_ent_id in start_states:
+            yield pending_ent_id, [start_states.pop(pending_ent_id)]
+
+    for ent_id in sorted(start_states):
+        yield ent_id, [start_states[ent_id]]
 
 
 def get_state(hass, utc_point_in_time, entity_id, run=None):
@@ -0,0 +1,320 @@
+"""In-memory cache of the recently recorded states used by history queries."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+import sys
+import threading
+from typing import Any
+
+from homeassistant.core import Event, split_entity_id
+import homeassistant.util.dt as dt_util
+
+# States are cached per entity in buckets of BUCKET_SIZE, the unit of eviction
+BUCKET_SIZE = timedelta(hours=1)
+
+
+class CachedStateRow:
+    """A recorded state with the same columns as a history query row."""
+
+    __slots__ = (
+        "domain",
+        "entity_id",
+        "state",
+        "attributes",
+        "shared_attrs",
+        "last_changed",
+        "last_updated",
+    )
+
+    def __init__(
+        self,
+        domain: str,
+        entity_id: str,
+        state: str,
+        shared_attrs: str,
+        last_changed: datetime,
+        last_updated: datetime,
+    ) -> None:
+        """Init the row."""
+        self.domain = domain
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = None
+        self.shared_attrs = shared_attrs
+        self.last_changed = last_changed
+        self.last_updated = last_updated
+
+    @staticmethod
+    def from_event(event: Event, shared_attrs: str) -> CachedStateRow:
+        """Create a row from a state_changed event."""
+        entity_id = event.data["entity_id"]
+        # State got deleted, recorded with an empty state like States.from_event
+        if (state := event.data.get("new_state")) is None:
+            return CachedStateRow(
+                split_entity_id(entity_id)[0],
+                entity_id,
+                "",
+                shared_attrs,
+                event.time_fired,
+                event.time_fired,
+            )
+        return CachedStateRow(
+            state.domain,
+            entity_id,
+            state.state,
+            shared_attrs,
+            state.last_changed,
+            state.last_updated,
+        )
+
+
+# Approximate memory used by a cached row, excluding its strings
+ROW_SIZE = (
+    sys.getsizeof(CachedStateRow("", "", "", "", dt_util.utcnow(), dt_util.utcnow()))
+    + 2 * sys.getsizeof(dt_util.utcnow())
+    + 8
+)
+
+
+def _bucket_start(point_in_time: datetime) -> datetime:
+    """Return the start of the bucket point_in_time falls in."""
+    return point_in_time.replace(minute=0, second=0, microsecond=0)
+
+
+class _Bucket:
+    """The cached states of an entity during one bucket."""
+
+    __slots__ = ("rows", "size")
+
+    def __init__(self) -> None:
+        """Init the bucket."""
+        self.rows: list[CachedStateRow] = []
+        self.size = 0
+
+
+class HistoryCache:
+    """Cache the states recorded during the current run.
+
+    The recorder adds every state it records. From the time the cache is
+    reset, the cache holds all states of an entity, so a history window
+    after that time can be served without querying the database. When
+    the memory limit is hit, the least recently used buckets are evicted
+    and the entity is only complete from the end of the evicted bucket.
+
+    The cache is filled by the recorder thread and read by the executor,
+    all access is serialized with a lock.
+    """
+
+    def __init__(self, max_memory: int) -> None:
+        """Init the cache."""
+        self.max_memory = max_memory
+        self.memory_usage = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._complete_since: datetime | None = None
+        self._entity_complete_since: dict[str, datetime] = {}
+        self._entity_buckets: dict[str, dict[datetime, _Bucket]] = {}
+        self._lru: OrderedDict[tuple[str, datetime], _Bucket] = OrderedDict()
+
+    def reset(self, complete_since: datetime) -> None:
+        """Drop all states, new states recorded from complete_since are cached."""
+        with self._lock:
+            self._complete_since = complete_since
+            self._entity_complete_since.clear()
+            self._entity_buckets.clear()
+            self._lru.clear()
+            self.memory_usage = 0
+
+    def add_state(self, event: Event, shared_attrs: str) -> None:
+        """Add the state of a recorded state_changed event."""
+        row = CachedStateRow.from_event(event, shared_attrs)
+        entity_id = row.entity_id
+        key = (entity_id, _bucket_start(row.last_updated))
+        size = ROW_SIZE + sys.getsizeof(shared_attrs) + sys.getsizeof(row.state)
+        with self._lock:
+            if self._complete_since is None:
+                return
+            if (bucket := self._lru.get(key)) is None:
+                bucket = _Bucket()
+                self._lru[key] = bucket
+                self._entity_buckets.setdefault(entity_id, {})[key[1]] = bucket
+            else:
+                self._lru.move_to_end(key)
+            rows = bucket.rows
+            rows.append(row)
+            if len(rows) > 1 and rows[-2].last_updated > row.last_updated:
+                # States are normally recorded in order
+                rows.sort(key=lambda row: row.last_updated)
+            bucket.size += size
+            self.memory_usage += size
+            while self.memory_usage > self.max_memory and self._lru:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        """Evict the least recently used bucket."""
+        (entity_id, start), bucket = self._lru.popitem(last=False)
+        self.memory_usage -= bucket.size
+        complete_since = start + BUCKET_SIZE
+        self._entity_complete_since[entity_id] = max(
+            complete_since,
+            self._entity_complete_since.get(entity_id, complete_since),
+        )
+        # Earlier buckets of the entity can no longer be used
+        buckets = self._entity_buckets[entity_id]
+        del buckets[start]
+        for bucket_start in [
+            bucket_start for bucket_start in buckets if bucket_start < start
+        ]:
+            self.memory_usage -= self._lru.pop((entity_id, bucket_start)).size
+            del buckets[bucket_start]
+        if not buckets:
+            del self._entity_buckets[entity_id]
+
+    def _cached_since(self, entity_id: str) -> datetime:
+        """Return the time since when all states of an entity are cached."""
+        assert self._complete_since is not None
+        if (complete_since := self._entity_complete_since.get(entity_id)) is None:
+            return self._complete_since
+        return max(complete_since, self._complete_since)
+
+    def split_time(
+        self, entity_ids: Iterable[str], start_time: datetime
+    ) -> datetime | None:
+        """Return the time the history of the entities after start_time is cached.
+
+        The states before the returned time must be queried from the database,
+        None is returned if the cache is not filled yet. An entity which is
+        cached since start_time counts as a hit, others as a miss.
+        """
+        split_time = start_time
+        with self._lock:
+            if self._complete_since is None:
+                return None
+            for entity_id in entity_ids:
+                if (cached_since := self._cached_since(entity_id)) <= start_time:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+                    split_time = max(split_time, cached_since)
+        return split_time
+
+    def states_during_period(
+        self,
+        entity_ids: Iterable[str],
+        start_time: datetime,
+        end_time: datetime | None,
+        row_filter: Callable[[CachedStateRow], bool] | None = None,
+    ) -> dict[str, list[CachedStateRow]]:
+        """Return the cached states updated from start_time until end_time.
+
+        start_time must not be before the split_time of the entities. Only
+        the rows passing row_filter are returned.
+        """
+        result: dict[str, list[CachedStateRow]] = {}
+        with self._lock:
+            for entity_id in entity_ids:
+                if not (buckets := self._entity_buckets.get(entity_id)):
+                    continue
+                first_bucket = _bucket_start(start_time)
+                rows = []
+                for bucket_start in sorted(buckets):
+                    if bucket_start < first_bucket:
+                        continue
+                    if end_time is not None and bucket_start >= end_time:
+                        break
+                    self._lru.move_to_end((entity_id, bucket_start))
+                    rows.extend(
+                        row
+                        for row in buckets[bucket_start].rows
+                        if row.last_updated >= start_time
+                        and (end_time is None or row.last_updated < end_time)
+                        and (row_filter is None or row_filter(row))
+                    )
+                if rows:
+                    result[entity_id] = rows
+        return result
+
+    def states_before(
+        self, entity_ids: Iterable[str], point_in_time: datetime
+    ) -> dict[str, CachedStateRow]:
+        """Return the latest cached state of each entity before point_in_time.
+
+        Entities which didn't change between the time since when their
+        states are cached and point_in_time are left out.
+        """
+        result: dict[str, CachedStateRow] = {}
+        with self._lock:
+            if self._complete_since is None:
+                return result
+            for entity_id in entity_ids:
+                if not (buckets := self._entity_buckets.get(entity_id)):
+                    continue
+                cached_since = self._cached_since(entity_id)
+                last_bucket = _bucket_start(point_in_time)
+                for bucket_start in sorted(buckets, reverse=True):
+                    if bucket_start > last_bucket:
+                        continue
+                    row = next(
+                        (
+                            row
+                            for row in reversed(buckets[bucket_start].rows)
+                            if row.last_updated < point_in_time
+                        ),
+                        None,
+                    )
+                    if row is not None:
+                        if row.last_updated >= cached_since:
+                            self._lru.move_to_end((entity_id, bucket_start))
+                            result[entity_id] = row
+                        break
+        return result
+
+    def purge_before(self, purge_before: datetime) -> None:
+        """Forget the states which were purged from the database."""
+        with self._lock:
+            if self._complete_since is None or purge_before <= self._complete_since:
+                return
+            self._complete_since = purge_before
+            for (entity_id, bucket_start), bucket in list(self._lru.items()):
+                if bucket_start + BUCKET_SIZE <= purge_before:
+                    self._drop_bucket(entity_id, bucket_start, bucket)
+
+    def purge_entities(self, entity_filter: Callable[[str], bool]) -> None:
+        """Forget the states of entities which were purged from the database."""
+        now = dt_util.utcnow()
+        with self._lock:
+            for entity_id in [
+                entity_id
+                for entity_id in self._entity_buckets
+                if entity_filter(entity_id)
+            ]:
+                for bucket_start, bucket in list(
+                    self._entity_buckets[entity_id].items()
+                ):
+                    self._drop_bucket(entity_id, bucket_start, bucket)
+                self._entity_complete_since[entity_id] = now
+
+    def _drop_bucket(
+        self, entity_id: str, bucket_start: datetime, bucket: _Bucket
+    ) -> None:
+        """Remove a bucket from the cache."""
+        del self._lru[(entity_id, bucket_start)]
+        buckets = self._entity_buckets[entity_id]
+        del buckets[bucket_start]
+        if not buckets:
+            del self._entity_buckets[entity_id]
+        self.memory_usage -= bucket.size
+
+    def stats(self) -> dict[str, Any]:
+        """Return the cache statistics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "buckets": len(self._lru),
+                "memory_usage": self.memory_usage,
+                "max_memory": self.max_memory,
+            }
@@ -603,6 +603,14 @@ def _apply_update(instance, session, new_version, old_version):  # noqa: C901
             "statistics_short_term",
             "ix_statistics_short_term_statistic_id_start",
         )
+    elif new_version == 25:
+        # The state_attributes table is created by create_all since it is new,
+        # only the link from the states table needs to be added.
+        _add_columns(connection, "states", ["attributes_id INTEGER"])
+        _create_index(connection, "states", "ix_states_attributes_id")
+    elif new_version == 26:
+        # The state_snapshots table is created by create_all since it is new
+        pass
 
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
@@ -4,14 +4,25 @@ from __future__ import annotations
 from collections.abc import Callable
 from datetime import datetime
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import func
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import aliased
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.expression import distinct
 
 from .const import MAX_ROWS_TO_PURGE
-from .models import Events, RecorderRuns, States, StatisticsRuns, StatisticsShortTerm
+from .models import (
+    Events,
+    RecorderRuns,
+    StateAttributes,
+    States,
+    StateSnapshots,
+    StatisticsRuns,
+    StatisticsShortTerm,
+    process_timestamp,
+)
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
 
@@ -21,6 +32,70 @@ if TYPE_CHECKING:
 _LOGGER = logging.getLogger(__name__)
 
 
+class PurgeMetrics:
+    """Progress and throughput of purging in chunks."""
+
+    def __init__(self) -> None:
+        """Init the metrics."""
+        self.purge_before: datetime | None = None
+        self.oldest: datetime | None = None
+        self.purged_until: datetime | None = None
+        self.chunks = 0
+        self.events_purged = 0
+        self.states_purged = 0
+        self.elapsed = 0.0
+
+    def start(self, purge_before: datetime, oldest: datetime | None) -> None:
+        """Start tracking a purge of everything older than purge_before."""
+        self.purge_before = purge_before
+        self.oldest = oldest
+        self.purged_until = oldest
+        self.chunks = 0
+        self.events_purged = 0
+        self.states_purged = 0
+        self.elapsed = 0.0
+
+    def add_chunk(
+        self, purged_until: datetime, events: int, states: int, elapsed: float
+    ) -> None:
+        """Add a purged chunk."""
+        self.purged_until = purged_until
+        self.chunks += 1
+        self.events_purged += events
+        self.states_purged += states
+        self.elapsed += elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics."""
+        progress = None
+        if self.purge_before is not None:
+            progress = 100.0
+            if (
+                self.oldest is not None
+                and self.purged_until is not None
+                and self.oldest < self.purge_before
+            ):
+                progress = round(
+                    100
+                    * min(
+                        (self.purged_until - self.oldest)
+                        / (self.purge_before - self.oldest),
+                        1,
+                    ),
+                    1,
+                )
+        rows_purged = self.events_purged + self.states_purged
+        return {
+            "progress": progress,
+            "chunks": self.chunks,
+            "events_purged": self.events_purged,
+            "states_purged": self.states_purged,
+            "rows_per_second": round(rows_purged / self.elapsed)
+            if self.elapsed
+            else None,
+        }
+
+
 @retryable_database_job("purge")
 def purge_old_data(
     instance: Recorder, purge_before: datetime, repack: bool, apply_filter: bool = False
@@ -35,19 +110,18 @@ def purge_old_data(
     )
 
     with session_scope(session=instance.get_session()) as session:  # type: ignore
-        # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
-        event_ids = _select_event_ids_to_purge(session, purge_before)
-        state_ids = _select_state_ids_to_purge(session, purge_before, event_ids)
+        if instance.purge_chunk_size:
+            events_remaining = _purge_oldest_chunk(
+                instance, session, purge_before, instance.purge_chunk_size
+            )
+        else:
+            events_remaining = _purge_events_and_states(instance, session, purge_before)
+
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
             session, purge_before
         )
-
-        if state_ids:
-            _purge_state_ids(instance, session, state_ids)
-
-        if event_ids:
-            _purge_event_ids(session, event_ids)
+        state_snapshots = _select_state_snapshots_to_purge(session, purge_before)
 
         if statistics_runs:
             _purge_statistics_runs(session, statistics_runs)
@@ -55,7 +129,15 @@ def purge_old_data(
         if short_term_statistics:
             _purge_short_term_statistics(session, short_term_statistics)
 
-        if event_ids or statistics_runs or short_term_statistics:
+        if state_snapshots:
+            _purge_state_snapshots(session, state_snapshots)
+
+        if (
+            events_remaining
+            or statistics_runs
+            or short_term_statistics
+            or state_snapshots
+        ):
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
             return False
@@ -70,6 +152,173 @@ def purge_old_data(
     return True
 
 
+def _purge_events_and_states(
+    instance: Recorder, session: Session, purge_before: datetime
+) -> bool:
+    """Purge a batch of events and states, return True if more may remain."""
+    # Purge a max of MAX_ROWS_TO_PURGE, based on the oldest states or events record
+    event_ids = _select_event_ids_to_purge(session, purge_before)
+    state_ids, attributes_ids = _select_state_and_attributes_ids_to_purge(
+        session, purge_before, event_ids
+    )
+
+    if state_ids:
+        _purge_state_ids(instance, session, state_ids)
+
+    if attributes_ids:
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
+
+    if event_ids:
+        _purge_event_ids(session, event_ids)
+
+    return bool(event_ids)
+
+
+def _purge_oldest_chunk(
+    instance: Recorder, session: Session, purge_before: datetime, chunk_size: int
+) -> bool:
+    """Purge the oldest events and states, return True if more remain.
+
+    The chunk ends at the time of the chunk_size oldest event, everything
+    before it is deleted with statements on the time range instead of
+    lists of ids.
+    """
+    timer_start = time.perf_counter()
+    metrics: PurgeMetrics = instance.purge_metrics
+    if metrics.purge_before != purge_before:
+        metrics.start(purge_before, _select_oldest_time_fired(session, purge_before))
+
+    chunk_end = _select_chunk_end(session, purge_before, chunk_size)
+    attributes_ids = _select_attributes_ids_before(session, chunk_end)
+    cached_state_ids = _select_cached_old_state_ids_before(instance, session, chunk_end)
+    _disconnect_states_from_old_states_before(instance, session, chunk_end)
+    deleted_states = (
+        session.query(States)
+        .filter(States.last_updated < chunk_end)
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s states", deleted_states)
+    _evict_purged_states_from_old_states_cache(instance, cached_state_ids)
+
+    # The attributes still in use are looked up by id, stay within the
+    # maximum number of sqlite variables
+    attributes_ids_list = list(attributes_ids)
+    for idx in range(0, len(attributes_ids_list), MAX_ROWS_TO_PURGE):
+        _purge_unused_attributes_ids(
+            instance, session, set(attributes_ids_list[idx : idx + MAX_ROWS_TO_PURGE])
+        )
+
+    deleted_events = (
+        session.query(Events)
+        .filter(Events.time_fired < chunk_end)
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s events", deleted_events)
+
+    metrics.add_chunk(
+        chunk_end, deleted_events, deleted_states, time.perf_counter() - timer_start
+    )
+    return chunk_end < purge_before
+
+
+def _select_chunk_end(
+    session: Session, purge_before: datetime, chunk_size: int
+) -> datetime:
+    """Return the end of the chunk of the chunk_size oldest events."""
+    chunk_end = (
+        session.query(Events.time_fired)
+        .filter(Events.time_fired < purge_before)
+        .order_by(Events.time_fired)
+        .offset(chunk_size)
+        .limit(1)
+        .scalar()
+    )
+    if chunk_end is None:
+        return purge_before
+    chunk_end = process_timestamp(chunk_end)
+    if chunk_end > (oldest := _select_oldest_time_fired(session, purge_before)):
+        return chunk_end
+    # More than chunk_size events were fired at the oldest time
+    return (
+        _select_oldest_time_fired(session, purge_before, after=oldest) or purge_before
+    )
+
+
+def _select_oldest_time_fired(
+    session: Session, purge_before: datetime, after: datetime | None = None
+) -> datetime | None:
+    """Return the time the oldest event before purge_before was fired."""
+    query = session.query(func.min(Events.time_fired)).filter(
+        Events.time_fired < purge_before
+    )
+    if after is not None:
+        query = query.filter(Events.time_fired > after)
+    return process_timestamp(query.scalar())
+
+
+def _select_attributes_ids_before(session: Session, chunk_end: datetime) -> set[int]:
+    """Return the attributes ids of the states before chunk_end."""
+    attributes_ids = {
+        state.attributes_id
+        for state in session.query(States.attributes_id)
+        .filter(States.last_updated < chunk_end)
+        .filter(States.attributes_id.isnot(None))
+        .distinct()
+    }
+    _LOGGER.debug("Selected %s attributes ids to remove", len(attributes_ids))
+    return attributes_ids
+
+
+def _select_cached_old_state_ids_before(
+    instance: Recorder, session: Session, chunk_end: datetime
+) -> set[int]:
+    """Return the state ids in the old states cache of the states before chunk_end."""
+    old_states = instance._old_states  # pylint: disable=protected-access
+    cached_state_ids = [
+        old_state.state_id for old_state in old_states.values() if old_state.state_id
+    ]
+    state_ids: set[int] = set()
+    for idx in range(0, len(cached_state_ids), MAX_ROWS_TO_PURGE):
+        state_ids.update(
+            state.state_id
+            for state in session.query(States.state_id)
+            .filter(
+                States.state_id.in_(cached_state_ids[idx : idx + MAX_ROWS_TO_PURGE])
+            )
+            .filter(States.last_updated < chunk_end)
+        )
+    return state_ids
+
+
+def _disconnect_states_from_old_states_before(
+    instance: Recorder, session: Session, chunk_end: datetime
+) -> None:
+    """Unlink all states from their old states before chunk_end.
+
+    The states before chunk_end are unlinked as well, MySQL checks the
+    foreign key for each row while the range delete runs and would refuse
+    to delete a state that is still the old state of another one.
+    """
+    old_state = aliased(States, name="old_state")
+    if instance.engine.dialect.name == "mysql":
+        # MySQL can't select from the table being updated in a subquery
+        stmt = (
+            update(States)
+            .where(States.old_state_id == old_state.state_id)
+            .where(old_state.last_updated < chunk_end)
+        )
+    else:
+        stmt = update(States).where(
+            States.old_state_id.in_(
+                select(old_state.state_id).where(old_state.last_updated < chunk_end)
+            )
+        )
+    disconnected_rows = session.execute(
+        stmt.values(old_state_id=None).execution_options(synchronize_session=False)
+    ).rowcount
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+
 def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list[int]:
     """Return a list of event ids to purge."""
     events = (
@@ -82,20 +331,26 @@ def _select_event_ids_to_purge(session: Session, purge_before: datetime) -> list
     return [event.event_id for event in events]
 
 
-def _select_state_ids_to_purge(
+def _select_state_and_attributes_ids_to_purge(
     session: Session, purge_before: datetime, event_ids: list[int]
-) -> set[int]:
-    """Return a list of state ids to purge."""
+) -> tuple[set[int], set[int]]:
+    """Return a list of state ids and attributes ids to purge."""
     if not event_ids:
-        return set()
+        return set(), set()
     states = (
-        session.query(States.state_id)
+        session.query(States.state_id, States.attributes_id)
         .filter(States.last_updated < purge_before)
         .filter(States.event_id.in_(event_ids))
         .all()
     )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
-    return {state.state_id for state in states}
+    state_ids = set()
+    attributes_ids = set()
+    for state in states:
+        state_ids.add(state.state_id)
+        if state.attributes_id:
+            attributes_ids.add(state.attributes_id)
+    return state_ids, attributes_ids
 
 
 def _select_statistics_runs_to_purge(
@@ -133,6 +388,20 @@ def _select_short_term_statistics_to_purge(
     return [statistic.id for statistic in statistics]
 
 
+def _select_state_snapshots_to_purge(
+    session: Session, purge_before: datetime
+) -> list[int]:
+    """Return a list of state snapshot ids to purge."""
+    snapshots = (
+        session.query(StateSnapshots.snapshot_id)
+        .filter(StateSnapshots.start < purge_before)
+        .limit(MAX_ROWS_TO_PURGE)
+        .all()
+    )
+    _LOGGER.debug("Selected %s state snapshot rows to remove", len(snapshots))
+    return [snapshot.snapshot_id for snapshot in snapshots]
+
+
 def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int]) -> None:
     """Disconnect states and delete by state id."""
 
@@ -158,6 +427,56 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     _evict_purged_states_from_old_states_cache(instance, state_ids)
 
 
+def _purge_unused_attributes_ids(
+    instance: Recorder, session: Session, attributes_ids: set[int]
+) -> None:
+    """Delete the attributes ids that are no longer referenced by any state.
+
+    Must be called after the states referencing them have been deleted.
+    """
+    still_used_attributes_ids = {
+        state.attributes_id
+        for state in session.query(States.attributes_id)
+        .filter(States.attributes_id.in_(attributes_ids))
+        .distinct()
+        .all()
+    }
+    if not (unused_attributes_ids := attributes_ids - still_used_attributes_ids):
+        return
+
+    deleted_rows = (
+        session.query(StateAttributes)
+        .filter(StateAttributes.attributes_id.in_(unused_attributes_ids))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s attribute states", deleted_rows)
+
+    # Evict any entries in the state_attributes_ids cache referring to a purged row
+    _evict_purged_attributes_from_attributes_cache(instance, unused_attributes_ids)
+
+
+def _evict_purged_attributes_from_attributes_cache(
+    instance: Recorder, purged_attributes_ids: set[int]
+) -> None:
+    """Evict purged attribute ids from the attribute ids cache."""
+    # Make a map from attributes_id to shared_attrs
+    state_attributes_ids = (
+        instance._state_attributes_ids  # pylint: disable=protected-access
+    )
+    state_attributes_ids_reversed = {
+        attributes_id: attributes
+        for attributes, attributes_id in state_attributes_ids.items()
+    }
+
+    # Evict any purged attributes from the attributes cache
+    for purged_attribute_id in purged_attributes_ids.intersection(
+        state_attributes_ids_reversed
+    ):
+        state_attributes_ids.pop(
+            state_attributes_ids_reversed[purged_attribute_id], None
+        )
+
+
 def _evict_purged_states_from_old_states_cache(
     instance: Recorder, purged_state_ids: set[int]
 ) -> None:
@@ -197,6 +516,16 @@ def _purge_short_term_statistics(
     _LOGGER.debug("Deleted %s short term statistics", deleted_rows)
 
 
+def _purge_state_snapshots(session: Session, state_snapshots: list[int]) -> None:
+    """Delete by snapshot id."""
+    deleted_rows = (
+        session.query(StateSnapshots)
+        .filter(StateSnapshots.snapshot_id.in_(state_snapshots))
+        .delete(synchronize_session=False)
+    )
+    _LOGGER.debug("Deleted %s state snapshot rows", deleted_rows)
+
+
 def _purge_event_ids(session: Session, event_ids: list[int]) -> None:
     """Delete by event id."""
     deleted_rows = (
@@ -254,9 +583,10 @@ def _purge_filtered_states(
     """Remove filtered states and linked events."""
     state_ids: list[int]
     event_ids: list[int | None]
-    state_ids, event_ids = zip(
+    attributes_ids: list[int | None]
+    state_ids, event_ids, attributes_ids = zip(
         *(
-            session.query(States.state_id, States.event_id)
+            session.query(States.state_id, States.event_id, States.attributes_id)
             .filter(States.entity_id.in_(excluded_entity_ids))
             .limit(MAX_ROWS_TO_PURGE)
             .all()
@@ -268,6 +598,8 @@ def _purge_filtered_states(
     )
     _purge_state_ids(instance, session, set(state_ids))
     _purge_event_ids(session, event_ids)  # type: ignore  # type of event_ids already narrowed to 'list[int]'
+    if candidate_attributes_ids := {id_ for id_ in attributes_ids if id_ is not None}:
+        _purge_unused_attributes_ids(instance, session, candidate_attributes_ids)
 
 
 def _purge_filtered_events(
@@ -285,11 +617,18 @@ def _purge_filtered_events(
         "Selected %s event_ids to remove that should be filtered", len(event_ids)
     )
     states: list[States] = (
-        session.query(States.state_id).filter(States.event_id.in_(event_ids)).all()
+        session.query(States.state_id, States.attributes_id)
+        .filter(States.event_id.in_(event_ids))
+        .all()
     )
     state_ids: set[int] = {state.state_id for state in states}
+    attributes_ids: set[int] = {
+        state.attributes_id for state in states if state.attributes_id
+    }
     _purge_state_ids(instance, session, state_ids)
     _purge_event_ids(session, event_ids)
+    if attributes_ids:
+        _purge_unused_attributes_ids(instance, session, attributes_ids)
 
 
 @retryable_database_job("purge")
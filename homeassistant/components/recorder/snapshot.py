@@ -0,0 +1,147 @@
+"""Periodic snapshots of the latest state of every entity."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING
+
+from sqlalchemy import and_, func, select, union_all
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.selectable import Subquery
+
+import homeassistant.util.dt as dt_util
+
+from .models import StateSnapshots, States
+from .util import retryable_database_job, session_scope
+
+if TYPE_CHECKING:
+    from . import Recorder
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def most_recent_state_ids_subquery(
+    session: Session,
+    start: datetime,
+    end: datetime,
+    entity_ids: Iterable[str] | None = None,
+) -> Subquery:
+    """Return the id of the latest state of each entity updated in start - end.
+
+    The subquery has an entity_id and a state_id column.
+    """
+    most_recent_states_by_date = session.query(
+        States.entity_id.label("max_entity_id"),
+        func.max(States.last_updated).label("max_last_updated"),
+    ).filter((States.last_updated >= start) & (States.last_updated < end))
+    if entity_ids:
+        most_recent_states_by_date = most_recent_states_by_date.filter(
+            States.entity_id.in_(entity_ids)
+        )
+    most_recent_states_by_date = most_recent_states_by_date.group_by(
+        States.entity_id
+    ).subquery()
+    return (
+        session.query(
+            States.entity_id.label("entity_id"),
+            func.max(States.state_id).label("state_id"),
+        )
+        .join(
+            most_recent_states_by_date,
+            and_(
+                States.entity_id == most_recent_states_by_date.c.max_entity_id,
+                States.last_updated == most_recent_states_by_date.c.max_last_updated,
+            ),
+        )
+        .group_by(States.entity_id)
+        .subquery()
+    )
+
+
+def get_snapshot_start(
+    session: Session, run_start: datetime, utc_point_in_time: datetime
+) -> datetime | None:
+    """Return the start of the newest snapshot of a run before utc_point_in_time."""
+    return (
+        session.query(func.max(StateSnapshots.start))
+        .filter(StateSnapshots.start >= run_start)
+        .filter(StateSnapshots.start <= utc_point_in_time)
+        .scalar()
+    )
+
+
+def state_ids_at_point_in_time_subquery(
+    session: Session,
+    snapshot_start: datetime,
+    utc_point_in_time: datetime,
+    entity_ids: Iterable[str] | None = None,
+) -> Subquery:
+    """Return the id of the latest state of each entity before utc_point_in_time.
+
+    Entities updated after the snapshot was taken come from the states table,
+    all others from the snapshot. The subquery has a state_id column.
+    """
+    recent_state_ids = most_recent_state_ids_subquery(
+        session, snapshot_start, utc_point_in_time, entity_ids
+    )
+    snapshot_state_ids = select([StateSnapshots.state_id.label("state_id")]).where(
+        (StateSnapshots.start == snapshot_start)
+        & StateSnapshots.entity_id.notin_(select([recent_state_ids.c.entity_id]))
+    )
+    if entity_ids:
+        snapshot_state_ids = snapshot_state_ids.where(
+            StateSnapshots.entity_id.in_(entity_ids)
+        )
+    return union_all(
+        select([recent_state_ids.c.state_id.label("state_id")]), snapshot_state_ids
+    ).subquery()
+
+
+@retryable_database_job("state snapshot")
+def save_state_snapshot(instance: Recorder, start: datetime) -> bool:
+    """Save the latest state of every entity recorded in the current run.
+
+    The snapshot is built from the previous snapshot of the run, if any,
+    and the states recorded since, so only a short window of the states
+    table needs to be scanned.
+    """
+    start = dt_util.as_utc(start)
+    run_start = instance.recording_start
+    if start <= run_start:
+        return True
+
+    with session_scope(session=instance.get_session()) as session:  # type: ignore
+        if session.query(StateSnapshots.snapshot_id).filter_by(start=start).first():
+            _LOGGER.debug("State snapshot already saved for %s", start)
+            return True
+
+        previous_start = (
+            session.query(func.max(StateSnapshots.start))
+            .filter(StateSnapshots.start >= run_start)
+            .filter(StateSnapshots.start < start)
+            .scalar()
+        )
+        recent_state_ids = most_recent_state_ids_subquery(
+            session, previous_start or run_start, start
+        )
+        state_ids: dict[str, int] = dict(
+            session.query(recent_state_ids.c.entity_id, recent_state_ids.c.state_id)
+        )
+        if previous_start is not None:
+            for entity_id, state_id in session.query(
+                StateSnapshots.entity_id, StateSnapshots.state_id
+            ).filter(StateSnapshots.start == previous_start):
+                state_ids.setdefault(entity_id, state_id)
+
+        _LOGGER.debug("Saving state snapshot of %s entities", len(state_ids))
+        if state_ids:
+            session.execute(
+                StateSnapshots.__table__.insert(),
+                [
+                    {"start": start, "entity_id": entity_id, "state_id": state_id}
+                    for entity_id, state_id in state_ids.items()
+                ],
+            )
+
+    return True
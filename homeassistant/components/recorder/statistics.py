@@ -1051,6 +1051,59 @@ def get_last_short_term_statistics(
     )
 
 
+def get_latest_short_term_statistics_with_session(
+    hass: HomeAssistant,
+    session: scoped_session,
+    statistic_ids: list[str],
+    metadata: dict[str, tuple[int, StatisticMetaData]] | None = None,
+) -> dict[str, list[dict]]:
+    """Return the latest short term statistics for a list of statistic_ids.
+
+    The statistics of all statistic_ids are fetched in a single query, the result
+    is the same as calling get_last_short_term_statistics for each statistic_id with
+    number_of_stats 1 and convert_units False. Already fetched metadata can be passed
+    in to avoid fetching it again.
+    """
+    if metadata is None:
+        metadata = get_metadata_with_session(hass, session, statistic_ids=statistic_ids)
+    else:
+        metadata = {
+            statistic_id: metadata[statistic_id]
+            for statistic_id in statistic_ids
+            if statistic_id in metadata
+        }
+    if not metadata:
+        return {}
+
+    table = StatisticsShortTerm
+    most_recent_statistics = (
+        session.query(table.metadata_id, func.max(table.start).label("max_start"))
+        .filter(table.metadata_id.in_([meta[0] for meta in metadata.values()]))
+        .group_by(table.metadata_id)
+        .subquery()
+    )
+    query = session.query(*QUERY_STATISTICS_SHORT_TERM).join(
+        most_recent_statistics,
+        (table.metadata_id == most_recent_statistics.c.metadata_id)
+        & (table.start == most_recent_statistics.c.max_start),
+    )
+    stats = execute(query)
+    if not stats:
+        return {}
+
+    # Return statistics combined with metadata
+    return _sorted_statistics_to_dict(
+        hass,
+        session,
+        stats,
+        statistic_ids,
+        metadata,
+        False,
+        table,
+        None,
+    )
+
+
 def _statistics_at_time(
     session: scoped_session,
     metadata_ids: set[int],
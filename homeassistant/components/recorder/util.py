@@ -27,6 +27,8 @@ from .models import (
     ALL_TABLES,
     TABLE_RECORDER_RUNS,
     TABLE_SCHEMA_CHANGES,
+    TABLE_STATE_ATTRIBUTES,
+    TABLE_STATE_SNAPSHOTS,
     TABLE_STATISTICS,
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
@@ -202,8 +204,11 @@ def basic_sanity_check(cursor):
     """Check tables to make sure select does not fail."""
 
     for table in ALL_TABLES:
-        # The statistics tables may not be present in old databases
+        # The statistics, state attributes and state snapshots tables may not
+        # be present in old databases
         if table in [
+            TABLE_STATE_ATTRIBUTES,
+            TABLE_STATE_SNAPSHOTS,
             TABLE_STATISTICS,
             TABLE_STATISTICS_META,
             TABLE_STATISTICS_RUNS,
@@ -103,10 +103,25 @@ def ws_info(
     recording = instance.recording if instance else False
     thread_alive = instance.is_alive() if instance else False
 
+    history_cache = instance.history_cache.stats() if instance else None
+    purge_metrics = instance.purge_metrics.as_dict() if instance else None
+    queue_metrics = (
+        {
+            "coalesced": instance.coalescer.coalesced,
+            "shed": instance.coalescer.shed,
+            "commit_latency": instance.commit_latency,
+        }
+        if instance
+        else None
+    )
+
     recorder_info = {
         "backlog": backlog,
+        "history_cache": history_cache,
         "max_backlog": MAX_QUEUE_BACKLOG,
         "migration_in_progress": migration_in_progress,
+        "purge": purge_metrics,
+        "queue": queue_metrics,
         "recording": recording,
         "thread_running": thread_alive,
     }
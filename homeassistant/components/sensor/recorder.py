@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Sequence
 import datetime
-import itertools
 import logging
 import math
+import operator
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -145,46 +145,23 @@ def _get_sensor_states(hass: HomeAssistant) -> list[State]:
 
 
 def _time_weighted_average(
-    fstates: list[tuple[float, State]], start: datetime.datetime, end: datetime.datetime
+    fstates: list[float], times: list[float], start: float, end: float
 ) -> float:
     """Calculate a time weighted average.
 
     The average is calculated by weighting the states by duration in seconds between
-    state changes.
+    state changes, times are in seconds since the epoch.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = start if state.last_updated < start else state.last_updated
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    return accumulated / (end - start).total_seconds()
-
-
-def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
-    """Return True if all states have the same unit."""
-    return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    start_times = [start if time < start else time for time in times]
+    # Adjust start time, if there was no last known state
+    start = start_times[0]
+    # Weight each value by the duration until the next state change, the last value
+    # by the duration until the end of the period
+    durations = map(operator.sub, start_times[1:] + [end], start_times)
+    return sum(map(operator.mul, fstates, durations)) / (end - start)
 
 
 def _parse_float(state: str) -> float:
@@ -195,29 +172,35 @@ def _parse_float(state: str) -> float:
     return fstate
 
 
+def _parse_float_or_none(state: str | None) -> float | None:
+    """Parse a float string, return None if it's not a valid float."""
+    try:
+        return _parse_float(state)  # type: ignore[arg-type]
+    except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
+        return None
+
+
 def _normalize_states(
     hass: HomeAssistant,
-    session: Session,
     old_metadatas: dict[str, tuple[int, StatisticMetaData]],
-    entity_history: Iterable[State],
+    fstates: list[float | None],
+    units: list[str | None],
     device_class: str | None,
     entity_id: str,
-) -> tuple[str | None, list[tuple[float, State]]]:
-    """Normalize units."""
+) -> tuple[str | None, list[int], list[float]]:
+    """Normalize units.
+
+    Takes the parsed states of an entity, None for invalid states, and their units.
+    Returns the unit and the indexes and normalized values of the valid states.
+    """
     unit = None
 
     if device_class not in UNIT_CONVERSIONS:
         # We're not normalizing this device class, return the state as they are
-        fstates = []
-        for state in entity_history:
-            try:
-                fstate = _parse_float(state.state)
-            except (ValueError, TypeError):  # TypeError to guard for NULL state in DB
-                continue
-            fstates.append((fstate, state))
+        indexes = [idx for idx, fstate in enumerate(fstates) if fstate is not None]
 
-        if fstates:
-            all_units = _get_units(fstates)
+        if indexes:
+            all_units = {units[idx] for idx in indexes}
             if len(all_units) > 1:
                 if WARN_UNSTABLE_UNIT not in hass.data:
                     hass.data[WARN_UNSTABLE_UNIT] = set()
@@ -238,20 +221,19 @@ def _normalize_states(
                         extra,
                         LINK_DEV_STATISTICS,
                     )
-                return None, []
-            unit = fstates[0][1].attributes.get(ATTR_UNIT_OF_MEASUREMENT)
-        return unit, fstates
+                return None, [], []
+            unit = units[indexes[0]]
+        return unit, indexes, [fstates[idx] for idx in indexes]  # type: ignore[misc]
 
-    fstates = []
+    conversions = UNIT_CONVERSIONS[device_class]
+    indexes = []
+    normalized = []
 
-    for state in entity_history:
-        try:
-            fstate = _parse_float(state.state)
-        except ValueError:
+    for idx, (fstate, unit) in enumerate(zip(fstates, units)):
+        if fstate is None:
             continue
-        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         # Exclude unsupported units from statistics
-        if unit not in UNIT_CONVERSIONS[device_class]:
+        if unit not in conversions:
             if WARN_UNSUPPORTED_UNIT not in hass.data:
                 hass.data[WARN_UNSUPPORTED_UNIT] = set()
             if entity_id not in hass.data[WARN_UNSUPPORTED_UNIT]:
@@ -264,9 +246,10 @@ def _normalize_states(
                 )
             continue
 
-        fstates.append((UNIT_CONVERSIONS[device_class][unit](fstate), state))
+        indexes.append(idx)
+        normalized.append(conversions[unit](fstate))
 
-    return DEVICE_CLASS_UNITS[device_class], fstates
+    return DEVICE_CLASS_UNITS[device_class], indexes, normalized
 
 
 def _suggest_report_issue(hass: HomeAssistant, entity_id: str) -> str:
@@ -417,6 +400,7 @@ def _compile_statistics(  # noqa: C901
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
     ]
     history_list = {}
+    last_stats = {}
     if entities_full_history:
         history_list = history.get_significant_states_with_session(  # type: ignore
             hass,
@@ -426,39 +410,64 @@ def _compile_statistics(  # noqa: C901
             entity_ids=entities_full_history,
             significant_changes_only=False,
         )
+        last_stats = statistics.get_latest_short_term_statistics_with_session(
+            hass, session, entities_full_history, old_metadatas
+        )
     entities_significant_history = [
         i.entity_id
         for i in sensor_states
         if "sum" not in wanted_statistics[i.entity_id]
     ]
+    # The history of entities without sum is fetched as columns, which are used to
+    # compile their statistics without creating a state object for each row
+    history_columns: dict[str, Any] = {"states": [], "entities": {}}
     if entities_significant_history:
-        _history_list = history.get_significant_states_with_session(  # type: ignore
+        history_columns = history.get_significant_states_compressed_with_session(  # type: ignore
             hass,
             session,
             start - datetime.timedelta.resolution,
             end,
             entity_ids=entities_significant_history,
+            need_attributes=True,
         )
-        history_list = {**history_list, **_history_list}
-    # If there are no recent state changes, the sensor's state may already be pruned
-    # from the recorder. Get the state from the state machine instead.
-    for _state in sensor_states:
-        if _state.entity_id not in history_list:
-            history_list[_state.entity_id] = (_state,)
+    # Parse each distinct state only once
+    fstate_table = [_parse_float_or_none(state) for state in history_columns["states"]]
+    start_timestamp = start.timestamp()
+    end_timestamp = end.timestamp()
 
     for _state in sensor_states:  # pylint: disable=too-many-nested-blocks
         entity_id = _state.entity_id
-        if entity_id not in history_list:
-            continue
-
         state_class = _state.attributes[ATTR_STATE_CLASS]
         device_class = _state.attributes.get(ATTR_DEVICE_CLASS)
-        entity_history = history_list[entity_id]
-        unit, fstates = _normalize_states(
-            hass, session, old_metadatas, entity_history, device_class, entity_id
+
+        entity_history: Sequence[State] = ()
+        times: list[float] | None = None
+        if entity_id in history_list:
+            entity_history = history_list[entity_id]
+            fstates = [_parse_float_or_none(state.state) for state in entity_history]
+            units = [
+                state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+                for state in entity_history
+            ]
+        elif entity_id in history_columns["entities"]:
+            columns = history_columns["entities"][entity_id]
+            fstates = [fstate_table[idx] for idx in columns["s"]]
+            units = [
+                attributes.get(ATTR_UNIT_OF_MEASUREMENT) for attributes in columns["pa"]
+            ]
+            times = columns["t"]
+        else:
+            # If there are no recent state changes, the sensor's state may already be
+            # pruned from the recorder. Get the state from the state machine instead.
+            entity_history = (_state,)
+            fstates = [_parse_float_or_none(_state.state)]
+            units = [_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)]
+
+        unit, indexes, fstates = _normalize_states(
+            hass, old_metadatas, fstates, units, device_class, entity_id
         )
 
-        if not fstates:
+        if not indexes:
             continue
 
         # Check metadata
@@ -495,27 +504,32 @@ def _compile_statistics(  # noqa: C901
         # Make calculations
         stat: StatisticData = {"start": start}
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["max"] = max(fstates)
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(*itertools.islice(zip(*fstates), 1))  # type: ignore[typeddict-item]
+            stat["min"] = min(fstates)
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(fstates, start, end)
+            if times is None:
+                times = [state.last_updated.timestamp() for state in entity_history]
+            stat["mean"] = _time_weighted_average(
+                fstates,
+                [times[idx] for idx in indexes],
+                start_timestamp,
+                end_timestamp,
+            )
 
         if "sum" in wanted_statistics[entity_id]:
             last_reset = old_last_reset = None
             new_state = old_state = None
             _sum = 0.0
-            last_stats = statistics.get_last_short_term_statistics(
-                hass, 1, entity_id, False
-            )
             if entity_id in last_stats:
                 # We have compiled history for this sensor before, use that as a starting point
                 last_reset = old_last_reset = last_stats[entity_id][0]["last_reset"]
                 new_state = old_state = last_stats[entity_id][0]["state"]
                 _sum = last_stats[entity_id][0]["sum"] or 0.0
 
-            for fstate, state in fstates:
+            for idx, fstate in zip(indexes, fstates):
+                state = entity_history[idx]
                 reset = False
                 if (
                     state_class != STATE_CLASS_TOTAL_INCREASING
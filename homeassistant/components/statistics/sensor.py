@@ -9,6 +9,7 @@ import logging
 import statistics
 from typing import Any, Literal, cast
 
+from sqlalchemy.orm import joinedload
 import voluptuous as vol
 
 from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
@@ -484,8 +485,10 @@ class StatisticsSensor(SensorEntity):
         _LOGGER.debug("%s: initializing values from the database", self.entity_id)
 
         with session_scope(hass=self.hass) as session:
-            query = session.query(States).filter(
-                States.entity_id == self._source_entity_id.lower()
+            query = (
+                session.query(States)
+                .options(joinedload(States.state_attributes))
+                .filter(States.entity_id == self._source_entity_id.lower())
             )
 
             if self._samples_max_age is not None:
@@ -15,23 +15,35 @@ from homeassistant.const import (
     MATCH_ALL,
     SIGNAL_BOOTSTRAP_INTEGRATONS,
 )
-from homeassistant.core import Context, Event, HomeAssistant, callback
+from homeassistant.core import Context, Event, HomeAssistant, State, callback
 from homeassistant.exceptions import (
     HomeAssistantError,
     ServiceNotFound,
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity, template
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry,
+    entity,
+    entity_registry,
+    template,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import (
+    TrackStates,
     TrackTemplate,
     TrackTemplateResult,
+    async_track_state_change_filtered,
     async_track_template_result,
 )
-from homeassistant.helpers.json import ExtendedJSONEncoder
+from homeassistant.helpers.json import JSON_ENCODE_EXCEPTIONS, ExtendedJSONEncoder
 from homeassistant.helpers.service import async_get_all_descriptions
-from homeassistant.loader import IntegrationNotFound, async_get_integration
+from homeassistant.loader import (
+    IntegrationNotFound,
+    async_get_import_times,
+    async_get_integration,
+)
 from homeassistant.setup import DATA_SETUP_TIME, async_get_loaded_integrations
 
 from . import const, decorators, messages
@@ -52,12 +64,14 @@ def async_register_commands(
     async_reg(hass, handle_get_config)
     async_reg(hass, handle_get_services)
     async_reg(hass, handle_get_states)
+    async_reg(hass, handle_get_states_chunked)
     async_reg(hass, handle_manifest_get)
     async_reg(hass, handle_integration_setup_info)
     async_reg(hass, handle_manifest_list)
     async_reg(hass, handle_ping)
     async_reg(hass, handle_render_template)
     async_reg(hass, handle_subscribe_bootstrap_integrations)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_subscribe_trigger)
     async_reg(hass, handle_test_condition)
@@ -118,6 +132,103 @@ def handle_subscribe_events(
     connection.send_message(messages.result_message(msg["id"]))
 
 
+@callback
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "subscribe_entities",
+        vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("domains"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("area_ids"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+def handle_subscribe_entities(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle subscribe entities command.
+
+    Sends the compressed states of the entities matching any of the filters, or of
+    all entities without filters, then the diffs of their state changes. State
+    changes are routed to the subscription by entity_id, entities added later to
+    the domains are picked up. Areas are resolved when subscribing.
+    """
+    entity_ids = set(msg.get("entity_ids", []))
+    domains = {domain.lower() for domain in msg.get("domains", [])}
+    if "area_ids" in msg:
+        entity_ids.update(_async_area_entity_ids(hass, msg["area_ids"]))
+    all_states = not any(key in msg for key in ("entity_ids", "domains", "area_ids"))
+    entity_perm = connection.user.permissions.check_entity
+    last_event: Event | None = None
+
+    @callback
+    def forward_entity_changes(event: Event) -> None:
+        """Forward entity state changes to websocket."""
+        nonlocal last_event
+        # An entity added to one of the domains can match both by domain and
+        # by entity_id
+        if event is last_event:
+            return
+        last_event = event
+        if not entity_perm(event.data["entity_id"], POLICY_READ):
+            return
+
+        connection.send_message(messages.cached_state_diff_message(msg["id"], event))
+
+    # We must never await between sending the states and listening for
+    # state changed events or we will introduce a race condition
+    # where some states are missed
+    if all_states:
+        states = hass.states.async_all()
+    else:
+        states = [
+            state
+            for entity_id in entity_ids
+            if (state := hass.states.get(entity_id)) is not None
+            and state.domain not in domains
+        ]
+        if domains:
+            states.extend(hass.states.async_all(domains))
+    connection.subscriptions[msg["id"]] = async_track_state_change_filtered(
+        hass, TrackStates(all_states, entity_ids, domains), forward_entity_changes
+    ).async_remove
+
+    connection.send_result(msg["id"])
+    connection.send_message(
+        messages.event_message(
+            msg["id"],
+            {
+                messages.ENTITY_EVENT_ADD: {
+                    state.entity_id: messages.compressed_state(state)
+                    for state in states
+                    if entity_perm(state.entity_id, POLICY_READ)
+                }
+            },
+        )
+    )
+
+
+@callback
+def _async_area_entity_ids(hass: HomeAssistant, area_ids: list[str]) -> set[str]:
+    """Return the entity_ids in the areas or on devices in the areas."""
+    ent_reg = entity_registry.async_get(hass)
+    dev_reg = device_registry.async_get(hass)
+    entity_ids = set()
+    for area_id in area_ids:
+        entity_ids.update(
+            entry.entity_id
+            for entry in entity_registry.async_entries_for_area(ent_reg, area_id)
+        )
+        for device in device_registry.async_entries_for_area(dev_reg, area_id):
+            entity_ids.update(
+                entry.entity_id
+                for entry in entity_registry.async_entries_for_device(
+                    ent_reg, device.id
+                )
+                # Entities with their own area are not in the area of their device
+                if entry.area_id is None
+            )
+    return entity_ids
+
+
 @callback
 @decorators.websocket_command(
     {
@@ -233,17 +344,83 @@ def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
-    if connection.user.permissions.access_all_entities("read"):
-        states = hass.states.async_all()
-    else:
-        entity_perm = connection.user.permissions.check_entity
-        states = [
-            state
-            for state in hass.states.async_all()
-            if entity_perm(state.entity_id, "read")
-        ]
+    states = _async_get_allowed_states(hass, connection)
+
+    try:
+        serialized_states = [state.as_dict_json() for state in states]
+    except JSON_ENCODE_EXCEPTIONS:
+        # Serialize the message as a whole to report the bad data
+        connection.send_message(messages.result_message(msg["id"], states))
+        return
+
+    connection.send_message(
+        messages.construct_result_message(
+            msg["id"], "[" + ",".join(serialized_states) + "]"
+        )
+    )
+
+
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "get_states/chunked",
+        vol.Optional("chunk_size", default=const.GET_STATES_CHUNK_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+@decorators.async_response
+async def handle_get_states_chunked(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle get states command, sending the states in chunks.
+
+    The result is followed by event messages of at most chunk_size states,
+    the last one has done set. The event loop is yielded to between them.
+    """
+    msg_id = msg["id"]
+    chunk_size = msg["chunk_size"]
+    states = _async_get_allowed_states(hass, connection)
+    connection.send_result(msg_id)
+
+    for start in range(0, max(len(states), 1), chunk_size):
+        if start:
+            await asyncio.sleep(0)
+
+        serialized_states = []
+        for state in states[start : start + chunk_size]:
+            try:
+                serialized_states.append(state.as_dict_json())
+            except JSON_ENCODE_EXCEPTIONS:
+                connection.logger.error(
+                    "Unable to serialize state of %s to JSON", state.entity_id
+                )
+
+        done = start + chunk_size >= len(states)
+        connection.send_message(
+            messages.construct_event_message(
+                msg_id,
+                '{"states":['
+                + ",".join(serialized_states)
+                + '],"done":'
+                + ("true" if done else "false")
+                + "}",
+            )
+        )
+
 
-    connection.send_message(messages.result_message(msg["id"], states))
+@callback
+def _async_get_allowed_states(
+    hass: HomeAssistant, connection: ActiveConnection
+) -> list[State]:
+    """Return the states the user of the connection is allowed to read."""
+    if connection.user.permissions.access_all_entities("read"):
+        return hass.states.async_all()
+    entity_perm = connection.user.permissions.check_entity
+    return [
+        state
+        for state in hass.states.async_all()
+        if entity_perm(state.entity_id, "read")
+    ]
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -301,10 +478,15 @@ async def handle_integration_setup_info(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle integrations command."""
+    import_times = async_get_import_times(hass)
     connection.send_result(
         msg["id"],
         [
-            {"domain": integration, "seconds": timedelta.total_seconds()}
+            {
+                "domain": integration,
+                "seconds": timedelta.total_seconds(),
+                "import_seconds": sum(import_times.get(integration, {}).values()),
+            }
             for integration, timedelta in hass.data[DATA_SETUP_TIME].items()
         ],
     )
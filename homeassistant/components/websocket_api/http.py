@@ -61,7 +61,8 @@ class WebSocketHandler:
         """Initialize an active connection."""
         self.hass = hass
         self.request = request
-        self.wsock = web.WebSocketResponse(heartbeat=55)
+        # Negotiate permessage-deflate with the clients that offer it
+        self.wsock = web.WebSocketResponse(heartbeat=55, compress=True)
         self._to_write: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_MSG)
         self._handle_task: asyncio.Task | None = None
         self._writer_task: asyncio.Task | None = None
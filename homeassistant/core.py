@@ -247,6 +247,9 @@ class HomeAssistant:
         self.loop = asyncio.get_running_loop()
         self._pending_tasks: list[asyncio.Future[Any]] = []
         self._track_task = True
+        # Wraps the targets of the jobs run in the event loop, see
+        # async_set_job_wrapper
+        self._job_wrapper: Callable[[HassJob[Any]], Callable[..., Any]] | None = None
         self.bus = EventBus(self)
         self.services = ServiceRegistry(self)
         self.states = StateMachine(self.bus, self.loop)
@@ -435,10 +438,16 @@ class HomeAssistant:
         """
         task: asyncio.Future[_R]
         if hassjob.job_type == HassJobType.Coroutinefunction:
+            target = hassjob.target
+            if self._job_wrapper is not None:
+                target = self._job_wrapper(hassjob)
             task = self.loop.create_task(
-                cast(Callable[..., Awaitable[_R]], hassjob.target)(*args)
+                cast(Callable[..., Awaitable[_R]], target)(*args)
             )
         elif hassjob.job_type == HassJobType.Callback:
+            if self._job_wrapper is not None:
+                self.loop.call_soon(self._job_wrapper(hassjob), *args)
+                return None
             self.loop.call_soon(hassjob.target, *args)
             return None
         else:
@@ -487,6 +496,20 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_set_job_wrapper(
+        self, job_wrapper: Callable[[HassJob[Any]], Callable[..., Any]] | None
+    ) -> None:
+        """Set the wrapper of the jobs run in the event loop, None to remove it.
+
+        The wrapper is called with each callback and coroutine function job
+        added or run and returns the callable to run instead of its target.
+        It is used to profile the jobs, executor jobs are not wrapped.
+
+        This method must be run in the event loop.
+        """
+        self._job_wrapper = job_wrapper
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -523,6 +546,9 @@ class HomeAssistant:
         args: parameters for method to call.
         """
         if hassjob.job_type == HassJobType.Callback:
+            if self._job_wrapper is not None:
+                self._job_wrapper(hassjob)(*args)
+                return None
             cast(Callable[..., _R], hassjob.target)(*args)
             return None
 
@@ -781,12 +807,27 @@ class _FilterableJob(NamedTuple):
     event_filter: Callable[[Event], bool] | None
 
 
+class _DispatchStats:
+    """Number of events of a type fired and the time spent dispatching them."""
+
+    __slots__ = ("fired", "dispatch_time")
+
+    def __init__(self) -> None:
+        """Initialize the dispatch stats."""
+        self.fired = 0
+        self.dispatch_time = 0.0
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        # event_type -> event data key -> value -> jobs
+        self._indexed_listeners: dict[str, dict[str, dict[Any, list[HassJob]]]] = {}
+        self._indexed_listener_count: dict[str, int] = {}
+        self._dispatch_stats: dict[str, _DispatchStats] = {}
         self._hass = hass
 
     @callback
@@ -795,7 +836,24 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for key, count in self._indexed_listener_count.items():
+            listeners[key] = listeners.get(key, 0) + count
+        return listeners
+
+    @callback
+    def async_dispatch_stats(self) -> dict[str, dict[str, float]]:
+        """Return dictionary with events and their dispatch stats.
+
+        The stats are the number of events fired and the seconds spent
+        dispatching them to the listeners, without running the listeners.
+
+        This method must be run in the event loop.
+        """
+        return {
+            key: {"fired": stats.fired, "dispatch_time": stats.dispatch_time}
+            for key, stats in self._dispatch_stats.items()
+        }
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -832,21 +890,52 @@ class EventBus:
                 event_type, "event_type", MAX_LENGTH_EVENT_EVENT_TYPE
             )
 
-        listeners = self._listeners.get(event_type, [])
+        listeners = self._listeners.get(event_type)
+        indexed_listeners = self._indexed_listeners.get(event_type)
 
         # EVENT_HOMEASSISTANT_CLOSE should go only to this listeners
-        match_all_listeners = self._listeners.get(MATCH_ALL)
-        if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = match_all_listeners + listeners
+        if event_type == EVENT_HOMEASSISTANT_CLOSE:
+            match_all_listeners = None
+        else:
+            match_all_listeners = self._listeners.get(MATCH_ALL)
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
-        if not listeners:
+        if (stats := self._dispatch_stats.get(event_type)) is None:
+            stats = self._dispatch_stats[event_type] = _DispatchStats()
+        stats.fired += 1
+
+        if not listeners and not match_all_listeners and not indexed_listeners:
             return
 
+        start = monotonic()
+
+        if match_all_listeners:
+            self._async_dispatch(match_all_listeners, event)
+
+        if listeners:
+            self._async_dispatch(listeners, event)
+
+        if indexed_listeners:
+            data = event.data
+            for key, jobs_by_value in indexed_listeners.items():
+                try:
+                    jobs = jobs_by_value.get(data.get(key))
+                except TypeError:
+                    # The value is not hashable, so no listener can match it
+                    continue
+                if jobs:
+                    for job in jobs:
+                        self._hass.async_add_hass_job(job, event)
+
+        stats.dispatch_time += monotonic() - start
+
+    @callback
+    def _async_dispatch(self, listeners: list[_FilterableJob], event: Event) -> None:
+        """Dispatch an event to the listeners its filters pass."""
         for job, event_filter in listeners:
             if event_filter is not None:
                 try:
@@ -913,6 +1002,40 @@ class EventBus:
 
         return remove_listener
 
+    @callback
+    def async_listen_indexed(
+        self,
+        event_type: str,
+        data_key: str,
+        values: Iterable[Any],
+        listener: Callable[[Event], None | Awaitable[None]],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with one of the values in data_key.
+
+        For example listening for state_changed events with entity_id in a list
+        of entity ids. Fired events are routed to the listener with a dict
+        lookup on the value in their data, instead of calling a filter for
+        every listener.
+
+        This method must be run in the event loop.
+        """
+        values = set(values)
+        job = HassJob(listener)
+        jobs_by_value = self._indexed_listeners.setdefault(event_type, {}).setdefault(
+            data_key, {}
+        )
+        for value in values:
+            jobs_by_value.setdefault(value, []).append(job)
+        self._indexed_listener_count[event_type] = (
+            self._indexed_listener_count.get(event_type, 0) + 1
+        )
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._async_remove_indexed_listener(event_type, data_key, values, job)
+
+        return remove_listener
+
     def listen_once(
         self, event_type: str, listener: Callable[[Event], None | Awaitable[None]]
     ) -> CALLBACK_TYPE:
@@ -993,6 +1116,37 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_indexed_listener(
+        self, event_type: str, data_key: str, values: set[Any], job: HassJob
+    ) -> None:
+        """Remove an indexed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            indexes = self._indexed_listeners[event_type]
+            jobs_by_value = indexes[data_key]
+            for value in values:
+                jobs = jobs_by_value[value]
+                jobs.remove(job)
+                # delete the job list of the value if empty
+                if not jobs:
+                    del jobs_by_value[value]
+        except (KeyError, ValueError):
+            _LOGGER.exception("Unable to remove unknown job listener %s", job)
+            return
+
+        if not jobs_by_value:
+            del indexes[data_key]
+            if not indexes:
+                del self._indexed_listeners[event_type]
+
+        if self._indexed_listener_count[event_type] == 1:
+            del self._indexed_listener_count[event_type]
+        else:
+            self._indexed_listener_count[event_type] -= 1
+
 
 _StateT = TypeVar("_StateT", bound="State")
 
@@ -1020,6 +1174,7 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
     ]
 
     def __init__(
@@ -1055,6 +1210,7 @@ class State:
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: dict[str, Collection[Any]] | None = None
+        self._as_dict_json: str | None = None
 
     @property
     def name(self) -> str:
@@ -1087,6 +1243,21 @@ class State:
             }
         return self._as_dict
 
+    def as_dict_json(self) -> str:
+        """Return the State serialized to JSON.
+
+        Async friendly.
+
+        The JSON is cached on the State. StateMachine.async_set replaces the
+        State of an entity when it changes, which drops the cached JSON.
+        """
+        if self._as_dict_json is None:
+            # pylint: disable=import-outside-toplevel
+            from .helpers.json import json_dumps
+
+            self._as_dict_json = json_dumps(self)
+        return self._as_dict_json
+
     @classmethod
     def from_dict(cls: type[_StateT], json_dict: dict[str, Any]) -> _StateT | None:
         """Initialize a state from a dict.
@@ -1338,16 +1509,14 @@ class StateMachine:
         new_state = str(new_state)
         attributes = attributes or {}
         if (old_state := self._states.get(entity_id)) is None:
-            same_state = False
-            same_attr = False
             last_changed = None
+        elif old_state.state == new_state and not force_update:
+            # The attributes are only compared if the state is unchanged
+            if old_state.attributes == attributes:
+                return
+            last_changed = old_state.last_changed
         else:
-            same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == MappingProxyType(attributes)
-            last_changed = old_state.last_changed if same_state else None
-
-        if same_state and same_attr:
-            return
+            last_changed = None
 
         if context is None:
             context = Context()
@@ -4,7 +4,7 @@ from __future__ import annotations
 from collections import OrderedDict
 import logging
 import time
-from typing import TYPE_CHECKING, Any, NamedTuple, cast
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, cast
 
 import attr
 
@@ -47,6 +47,10 @@ ORPHANED_DEVICE_KEEP_SECONDS = 86400 * 30
 class _DeviceIndex(NamedTuple):
     identifiers: dict[tuple[str, str], str]
     connections: dict[tuple[str, str], str]
+    # The device ids are stored as dict keys, only registered devices are
+    # indexed by area and config entry
+    area_ids: dict[str, dict[str, Literal[True]]]
+    config_entries: dict[str, dict[str, Literal[True]]]
 
 
 class DeviceEntryDisabler(StrEnum):
@@ -285,13 +289,17 @@ class DeviceRegistry:
         self.devices[new_device.id] = new_device
 
         devices_index = self._registered_index
-        _remove_device_from_index(devices_index, old_device)
-        _add_device_to_index(devices_index, new_device)
+        _remove_device_from_index(devices_index, old_device, new_device)
+        _add_device_to_index(devices_index, new_device, old_device)
 
     def _clear_index(self) -> None:
         """Clear the index."""
-        self._registered_index = _DeviceIndex(identifiers={}, connections={})
-        self._deleted_index = _DeviceIndex(identifiers={}, connections={})
+        self._registered_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
+        self._deleted_index = _DeviceIndex(
+            identifiers={}, connections={}, area_ids={}, config_entries={}
+        )
 
     def _rebuild_index(self) -> None:
         """Create the index after loading devices."""
@@ -631,7 +639,7 @@ class DeviceRegistry:
     def async_clear_config_entry(self, config_entry_id: str) -> None:
         """Clear config entry from registry entries."""
         now_time = time.time()
-        for device in list(self.devices.values()):
+        for device in async_entries_for_config_entry(self, config_entry_id):
             self.async_update_device(device.id, remove_config_entry_id=config_entry_id)
         for deleted_device in list(self.deleted_devices.values()):
             config_entries = deleted_device.config_entries
@@ -644,8 +652,8 @@ class DeviceRegistry:
                 )
             else:
                 config_entries = config_entries - {config_entry_id}
-                # No need to reindex here since we currently
-                # do not have a lookup by config entry
+                # No need to reindex here since deleted devices
+                # are not indexed by config entry
                 self.deleted_devices[deleted_device.id] = attr.evolve(
                     deleted_device, config_entries=config_entries
                 )
@@ -672,9 +680,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self.async_update_device(dev_id, area_id=None)
+        for device in async_entries_for_area(self, area_id):
+            self.async_update_device(device.id, area_id=None)
 
 
 @callback
@@ -701,19 +708,23 @@ async def async_get_registry(hass: HomeAssistant) -> DeviceRegistry:
 
 @callback
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) -> list[DeviceEntry]:
-    """Return entries that match an area."""
-    return [device for device in registry.devices.values() if device.area_id == area_id]
+    """Return entries that match an area, in no particular order."""
+    return [
+        registry.devices[device_id]
+        for device_id in registry._registered_index.area_ids.get(area_id, ())
+    ]
 
 
 @callback
 def async_entries_for_config_entry(
     registry: DeviceRegistry, config_entry_id: str
 ) -> list[DeviceEntry]:
-    """Return entries that match a config entry."""
+    """Return entries that match a config entry, in no particular order."""
     return [
-        device
-        for device in registry.devices.values()
-        if config_entry_id in device.config_entries
+        registry.devices[device_id]
+        for device_id in registry._registered_index.config_entries.get(
+            config_entry_id, ()
+        )
     ]
 
 
@@ -856,22 +867,61 @@ def _normalize_connections(connections: set[tuple[str, str]]) -> set[tuple[str,
 def _add_device_to_index(
     devices_index: _DeviceIndex,
     device: DeviceEntry | DeletedDeviceEntry,
+    old_device: DeviceEntry | None = None,
 ) -> None:
-    """Add a device to the index."""
+    """Add a device to the index.
+
+    When an old version of the device is passed, only area and config entry
+    keys it did not have yet are added.
+    """
     for identifier in device.identifiers:
         devices_index.identifiers[identifier] = device.id
     for connection in device.connections:
         devices_index.connections[connection] = device.id
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id and (old_device is None or old_device.area_id != device.area_id):
+        devices_index.area_ids.setdefault(device.area_id, {})[device.id] = True
+    for config_entry_id in device.config_entries:
+        if old_device is None or config_entry_id not in old_device.config_entries:
+            devices_index.config_entries.setdefault(config_entry_id, {})[
+                device.id
+            ] = True
 
 
 def _remove_device_from_index(
     devices_index: _DeviceIndex,
     device: DeviceEntry | DeletedDeviceEntry,
+    new_device: DeviceEntry | None = None,
 ) -> None:
-    """Remove a device from the index."""
+    """Remove a device from the index.
+
+    When a new version of the device is passed, area and config entry keys
+    it still has are kept.
+    """
     for identifier in device.identifiers:
         if identifier in devices_index.identifiers:
             del devices_index.identifiers[identifier]
     for connection in device.connections:
         if connection in devices_index.connections:
             del devices_index.connections[connection]
+    if not isinstance(device, DeviceEntry):
+        return
+    if device.area_id and (new_device is None or new_device.area_id != device.area_id):
+        _remove_device_id_from_index(devices_index.area_ids, device.area_id, device.id)
+    for config_entry_id in device.config_entries:
+        if new_device is None or config_entry_id not in new_device.config_entries:
+            _remove_device_id_from_index(
+                devices_index.config_entries, config_entry_id, device.id
+            )
+
+
+def _remove_device_id_from_index(
+    index: dict[str, dict[str, Literal[True]]], key: str, device_id: str
+) -> None:
+    """Remove a device id from an area or config entry index."""
+    if (device_ids := index.get(key)) is None:
+        return
+    device_ids.pop(device_id, None)
+    if not device_ids:
+        del index[key]
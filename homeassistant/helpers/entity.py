@@ -43,7 +43,7 @@ from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
 from . import entity_registry as er
 from .device_registry import DeviceEntryType
 from .entity_platform import EntityPlatform
-from .event import async_track_entity_registry_updated_event
+from .event import async_call_later, async_track_entity_registry_updated_event
 from .frame import report
 from .typing import StateType
 
@@ -60,6 +60,8 @@ FLOAT_PRECISION = abs(int(math.floor(math.log10(abs(sys.float_info.epsilon)))))
 
 ENTITY_CATEGORIES_SCHEMA: Final = vol.In(ENTITY_CATEGORIES)
 
+DATA_SUPPRESSED_STATE_WRITES = "entity_suppressed_state_writes"
+
 
 @callback
 @bind_hass
@@ -104,6 +106,13 @@ def async_generate_entity_id(
     return test_string
 
 
+@callback
+def async_get_suppressed_state_writes(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of coalesced state writes per entity id."""
+    suppressed: dict[str, int] = hass.data.get(DATA_SUPPRESSED_STATE_WRITES, {})
+    return dict(suppressed)
+
+
 def get_capability(hass: HomeAssistant, entity_id: str, capability: str) -> Any | None:
     """Get a capability attribute of an entity.
 
@@ -287,6 +296,15 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _added = False
 
+    # Coalescing of state writes, see state_write_interval
+    _written_state: str | None = None
+    _state_written_at: float | None = None
+    _unsub_state_write: CALLBACK_TYPE | None = None
+
+    # Attributes which rarely change, see _async_static_attributes
+    _static_attributes_key: tuple[Any, ...] | None = None
+    _static_attributes: tuple[dict[str, Any], dict[str, Any] | None] = ({}, None)
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_attribution: str | None = None
@@ -303,6 +321,7 @@ class Entity(ABC):
     _attr_name: str | None
     _attr_should_poll: bool = True
     _attr_state: StateType = STATE_UNKNOWN
+    _attr_state_write_interval: timedelta | None
     _attr_supported_features: int | None = None
     _attr_unique_id: str | None = None
     _attr_unit_of_measurement: str | None
@@ -447,6 +466,20 @@ class Entity(ABC):
         """Time that a context is considered recent."""
         return self._attr_context_recent_time
 
+    @property
+    def state_write_interval(self) -> timedelta | None:
+        """Return the minimum time between writes not changing the state.
+
+        Writes within the interval only changing the attributes are coalesced
+        into a write of the latest state and attributes at the end of the
+        interval. Defaults to the STATE_WRITE_INTERVAL of the platform.
+        """
+        if hasattr(self, "_attr_state_write_interval"):
+            return self._attr_state_write_interval
+        if self.platform is not None:
+            return self.platform.state_write_interval
+        return None
+
     @property
     def entity_registry_enabled_default(self) -> bool:
         """Return if the entity should be enabled when first added to the entity registry."""
@@ -582,11 +615,8 @@ class Entity(ABC):
                 extra_state_attributes = self.device_state_attributes
             attr.update(extra_state_attributes or {})
 
-        unit_of_measurement = self.unit_of_measurement
-        if unit_of_measurement is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        entry = self.registry_entry
+        static_attributes, customize = self._async_static_attributes()
+        attr.update(static_attributes)
 
         if assumed_state := self.assumed_state:
             attr[ATTR_ASSUMED_STATE] = assumed_state
@@ -594,23 +624,9 @@ class Entity(ABC):
         if (attribution := self.attribution) is not None:
             attr[ATTR_ATTRIBUTION] = attribution
 
-        if (
-            device_class := (entry and entry.device_class) or self.device_class
-        ) is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
-
         if (entity_picture := self.entity_picture) is not None:
             attr[ATTR_ENTITY_PICTURE] = entity_picture
 
-        if (icon := (entry and entry.icon) or self.icon) is not None:
-            attr[ATTR_ICON] = icon
-
-        if (name := (entry and entry.name) or self.name) is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        if (supported_features := self.supported_features) is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
-
         end = timer()
 
         if end - start > 0.4 and not self._slow_reported:
@@ -625,8 +641,8 @@ class Entity(ABC):
             )
 
         # Overwrite properties that have been set in the config file.
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        if customize is not None:
+            attr.update(customize)
 
         # Convert temperature if we detect one
         try:
@@ -651,10 +667,107 @@ class Entity(ABC):
             self._context = None
             self._context_set = None
 
+        if (
+            write_interval := self.state_write_interval
+        ) is not None and self._async_coalesce_state_write(state, write_interval):
+            return
+
         self.hass.states.async_set(
             self.entity_id, state, attr, self.force_update, self._context
         )
 
+    @callback
+    def _async_static_attributes(
+        self,
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Return the attributes which rarely change and the customized attributes.
+
+        They are only rebuilt when the registry entry or the customize config
+        was replaced, or when one of the properties they come from changed.
+        """
+        entry = self.registry_entry
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
+        unit_of_measurement = self.unit_of_measurement
+        device_class = self.device_class
+        icon = self.icon
+        name = self.name
+        supported_features = self.supported_features
+        key = (
+            self.entity_id,
+            entry,
+            customize,
+            unit_of_measurement,
+            device_class,
+            icon,
+            name,
+            supported_features,
+        )
+        if key == self._static_attributes_key:
+            return self._static_attributes
+
+        attr: dict[str, Any] = {}
+
+        if unit_of_measurement is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        if (device_class := (entry and entry.device_class) or device_class) is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        if (icon := (entry and entry.icon) or icon) is not None:
+            attr[ATTR_ICON] = icon
+
+        if (name := (entry and entry.name) or name) is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        if supported_features is not None:
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        self._static_attributes_key = key
+        self._static_attributes = (
+            attr,
+            customize.get(self.entity_id) if customize is not None else None,
+        )
+        return self._static_attributes
+
+    @callback
+    def _async_coalesce_state_write(
+        self, state: str, write_interval: timedelta
+    ) -> bool:
+        """Return True if the write is coalesced into a later write.
+
+        A write is coalesced if the state is unchanged and the previous write is
+        more recent than the write interval.
+        """
+        now = self.hass.loop.time()
+        if (
+            state == self._written_state
+            and self._state_written_at is not None
+            and now - self._state_written_at < write_interval.total_seconds()
+        ):
+            suppressed = self.hass.data.setdefault(DATA_SUPPRESSED_STATE_WRITES, {})
+            suppressed[self.entity_id] = suppressed.get(self.entity_id, 0) + 1
+            if self._unsub_state_write is None:
+                self._unsub_state_write = async_call_later(
+                    self.hass,
+                    self._state_written_at + write_interval.total_seconds() - now,
+                    self._async_write_coalesced_state,
+                )
+            return True
+
+        if self._unsub_state_write is not None:
+            self._unsub_state_write()
+            self._unsub_state_write = None
+        self._written_state = state
+        self._state_written_at = now
+        return False
+
+    @callback
+    def _async_write_coalesced_state(self, _: datetime) -> None:
+        """Write the latest state at the end of the write interval."""
+        self._unsub_state_write = None
+        self._state_written_at = None
+        self._async_write_ha_state()
+
     def schedule_update_ha_state(self, force_refresh: bool = False) -> None:
         """Schedule an update ha state change task.
 
@@ -789,6 +902,13 @@ class Entity(ABC):
 
         self._added = False
 
+        if self._unsub_state_write is not None:
+            self._unsub_state_write()
+            self._unsub_state_write = None
+        self._state_written_at = None
+        if (suppressed := self.hass.data.get(DATA_SUPPRESSED_STATE_WRITES)) is not None:
+            suppressed.pop(self.entity_id, None)
+
         if self._on_remove is not None:
             while self._on_remove:
                 self._on_remove.pop()()
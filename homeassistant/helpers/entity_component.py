@@ -77,6 +77,7 @@ class EntityComponent:
 
         self.config: ConfigType | None = None
 
+        self._entities: dict[str, entity.Entity] = {}
         self._platforms: dict[
             str | tuple[str, timedelta | None, str | None], EntityPlatform
         ] = {domain: self._async_init_entity_platform(domain, None)}
@@ -94,11 +95,7 @@ class EntityComponent:
 
     def get_entity(self, entity_id: str) -> entity.Entity | None:
         """Get an entity."""
-        for platform in self._platforms.values():
-            entity_obj = platform.entities.get(entity_id)
-            if entity_obj is not None:
-                return entity_obj
-        return None
+        return self._entities.get(entity_id)
 
     def setup(self, config: ConfigType) -> None:
         """Set up a full entity component.
@@ -202,7 +199,7 @@ class EntityComponent:
         async def handle_service(call: ServiceCall) -> None:
             """Handle the service."""
             await self.hass.helpers.service.entity_service_call(
-                self._platforms.values(), func, call, required_features
+                self._entities, func, call, required_features
             )
 
         self.hass.services.async_register(self.domain, name, handle_service, schema)
@@ -317,6 +314,7 @@ class EntityComponent:
             platform=platform,
             scan_interval=scan_interval,
             entity_namespace=entity_namespace,
+            component_entities=self._entities,
         )
 
     async def _async_shutdown(self, event: Event) -> None:
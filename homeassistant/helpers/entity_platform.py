@@ -84,6 +84,7 @@ class EntityPlatform:
         platform: ModuleType | None,
         scan_interval: timedelta,
         entity_namespace: str | None,
+        component_entities: dict[str, Entity] | None = None,
     ) -> None:
         """Initialize the entity platform."""
         self.hass = hass
@@ -95,6 +96,8 @@ class EntityPlatform:
         self.entity_namespace = entity_namespace
         self.config_entry: config_entries.ConfigEntry | None = None
         self.entities: dict[str, Entity] = {}
+        # Entities of all platforms of the entity component, by entity_id
+        self._component_entities = component_entities
         self._tasks: list[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
@@ -106,6 +109,11 @@ class EntityPlatform:
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
+        # Minimum time between writes of entities not changing their state
+        self.state_write_interval: timedelta | None = getattr(
+            platform, "STATE_WRITE_INTERVAL", None
+        )
+
         # Platform is None for the EntityComponent "catch-all" EntityPlatform
         # which powers entity_component.add_entities
         self.parallel_updates_created = platform is None
@@ -596,6 +604,8 @@ class EntityPlatform:
 
         entity_id = entity.entity_id
         self.entities[entity_id] = entity
+        if self._component_entities is not None:
+            self._component_entities[entity_id] = entity
 
         if not restored:
             # Reserve the state in the state machine
@@ -608,6 +618,8 @@ class EntityPlatform:
         def remove_entity_cb() -> None:
             """Remove entity from entities list."""
             self.entities.pop(entity_id)
+            if self._component_entities is not None:
+                self._component_entities.pop(entity_id, None)
 
         entity.async_on_remove(remove_entity_cb)
 
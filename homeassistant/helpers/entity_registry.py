@@ -12,7 +12,7 @@ from __future__ import annotations
 from collections import UserDict
 from collections.abc import Callable, Iterable, Mapping
 import logging
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Literal, cast
 
 import attr
 import voluptuous as vol
@@ -185,9 +185,12 @@ class EntityRegistryStore(storage.Store):
 class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
     """Container for entity registry items, maps entity_id -> entry.
 
-    Maintains two additional indexes:
+    Maintains additional indexes:
     - id -> entry
     - (domain, platform, unique_id) -> entry
+    - device_id -> entity_ids
+    - area_id -> entity_ids
+    - config_entry_id -> entity_ids
     """
 
     def __init__(self) -> None:
@@ -195,24 +198,51 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         super().__init__()
         self._entry_ids: dict[str, RegistryEntry] = {}
         self._index: dict[tuple[str, str, str], str] = {}
+        # The entity_ids are stored as dict keys, the order of the entries
+        # returned by the lookups is not guaranteed
+        self._device_id_index: dict[str, dict[str, Literal[True]]] = {}
+        self._area_id_index: dict[str, dict[str, Literal[True]]] = {}
+        self._config_entry_id_index: dict[str, dict[str, Literal[True]]] = {}
 
     def __setitem__(self, key: str, entry: RegistryEntry) -> None:
         """Add an item."""
-        if key in self:
-            old_entry = self[key]
+        old_entry = self.data.get(key)
+        if old_entry is not None:
             del self._entry_ids[old_entry.id]
             del self._index[(old_entry.domain, old_entry.platform, old_entry.unique_id)]
         super().__setitem__(key, entry)
         self._entry_ids.__setitem__(entry.id, entry)
         self._index[(entry.domain, entry.platform, entry.unique_id)] = entry.entity_id
+        for index, attr_name in self._secondary_indexes():
+            old_value = getattr(old_entry, attr_name, None)
+            value = getattr(entry, attr_name)
+            if old_entry is not None and old_value == value:
+                # Nothing to reindex
+                continue
+            if old_entry is not None:
+                _remove_from_index(index, old_value, key)
+            if value is not None:
+                index.setdefault(value, {})[key] = True
 
     def __delitem__(self, key: str) -> None:
         """Remove an item."""
         entry = self[key]
         self._entry_ids.__delitem__(entry.id)
         self._index.__delitem__((entry.domain, entry.platform, entry.unique_id))
+        for index, attr_name in self._secondary_indexes():
+            _remove_from_index(index, getattr(entry, attr_name), key)
         super().__delitem__(key)
 
+    def _secondary_indexes(
+        self,
+    ) -> tuple[tuple[dict[str, dict[str, Literal[True]]], str], ...]:
+        """Return the secondary indexes and the entry attribute they index."""
+        return (
+            (self._device_id_index, "device_id"),
+            (self._area_id_index, "area_id"),
+            (self._config_entry_id_index, "config_entry_id"),
+        )
+
     def get_entity_id(self, key: tuple[str, str, str]) -> str | None:
         """Get entity_id from (domain, platform, unique_id)."""
         return self._index.get(key)
@@ -221,6 +251,43 @@ class EntityRegistryItems(UserDict[str, "RegistryEntry"]):
         """Get entry from id."""
         return self._entry_ids.get(key)
 
+    def get_entries_for_device_id(
+        self, device_id: str, include_disabled_entities: bool = False
+    ) -> list[RegistryEntry]:
+        """Get entries for device."""
+        return [
+            entry
+            for entity_id in self._device_id_index.get(device_id, ())
+            if not (entry := self.data[entity_id]).disabled_by
+            or include_disabled_entities
+        ]
+
+    def get_entries_for_area_id(self, area_id: str) -> list[RegistryEntry]:
+        """Get entries for area."""
+        return [
+            self.data[entity_id] for entity_id in self._area_id_index.get(area_id, ())
+        ]
+
+    def get_entries_for_config_entry_id(
+        self, config_entry_id: str
+    ) -> list[RegistryEntry]:
+        """Get entries for config entry."""
+        return [
+            self.data[entity_id]
+            for entity_id in self._config_entry_id_index.get(config_entry_id, ())
+        ]
+
+
+def _remove_from_index(
+    index: dict[str, dict[str, Literal[True]]], value: str | None, entity_id: str
+) -> None:
+    """Remove an entity_id from a secondary index."""
+    if value is None or (entity_ids := index.get(value)) is None:
+        return
+    entity_ids.pop(entity_id, None)
+    if not entity_ids:
+        del index[value]
+
 
 class EntityRegistry:
     """Class to hold a registry of entities."""
@@ -687,19 +754,14 @@ class EntityRegistry:
     @callback
     def async_clear_config_entry(self, config_entry: str) -> None:
         """Clear config entry from registry entries."""
-        for entity_id in [
-            entity_id
-            for entity_id, entry in self.entities.items()
-            if config_entry == entry.config_entry_id
-        ]:
-            self.async_remove(entity_id)
+        for entry in self.entities.get_entries_for_config_entry_id(config_entry):
+            self.async_remove(entry.entity_id)
 
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for entity_id, entry in self.entities.items():
-            if area_id == entry.area_id:
-                self.async_update_entity(entity_id, area_id=None)
+        for entry in self.entities.get_entries_for_area_id(area_id):
+            self.async_update_entity(entry.entity_id, area_id=None)
 
 
 @callback
@@ -728,33 +790,26 @@ async def async_get_registry(hass: HomeAssistant) -> EntityRegistry:
 def async_entries_for_device(
     registry: EntityRegistry, device_id: str, include_disabled_entities: bool = False
 ) -> list[RegistryEntry]:
-    """Return entries that match a device."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.device_id == device_id
-        and (not entry.disabled_by or include_disabled_entities)
-    ]
+    """Return entries that match a device, in no particular order."""
+    return registry.entities.get_entries_for_device_id(
+        device_id, include_disabled_entities
+    )
 
 
 @callback
 def async_entries_for_area(
     registry: EntityRegistry, area_id: str
 ) -> list[RegistryEntry]:
-    """Return entries that match an area."""
-    return [entry for entry in registry.entities.values() if entry.area_id == area_id]
+    """Return entries that match an area, in no particular order."""
+    return registry.entities.get_entries_for_area_id(area_id)
 
 
 @callback
 def async_entries_for_config_entry(
     registry: EntityRegistry, config_entry_id: str
 ) -> list[RegistryEntry]:
-    """Return entries that match a config entry."""
-    return [
-        entry
-        for entry in registry.entities.values()
-        if entry.config_entry_id == config_entry_id
-    ]
+    """Return entries that match a config entry, in no particular order."""
+    return registry.entities.get_entries_for_config_entry_id(config_entry_id)
 
 
 @callback
@@ -1,12 +1,13 @@
 """Helpers for listening to events."""
 from __future__ import annotations
 
-import asyncio
+from bisect import bisect_left, bisect_right
 from collections.abc import Awaitable, Callable, Iterable, Sequence
 import copy
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import functools as ft
+import heapq
 import logging
 import time
 from typing import Any, Union, cast
@@ -60,6 +61,16 @@ _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
 
+TEMPLATE_RENDER_STATS = "template_render_stats"
+# Renders skipped as the attributes read by the template did not change
+RENDERS_ATTRIBUTES_UNCHANGED = "attributes_unchanged"
+# Renders reused from an identical template rendered for the same event
+RENDERS_SHARED = "shared"
+
+_SHARED_TEMPLATE_RENDERS = "shared_template_renders"
+
+_TIMER_WHEEL = "timer_wheel"
+
 _LOGGER = logging.getLogger(__name__)
 
 _P = ParamSpec("_P")
@@ -931,6 +942,10 @@ class _TrackTemplateResultInfo:
             if not _event_triggers_rerender(event, info):
                 return False
 
+            if not _event_changes_read_attributes(event, info):
+                _async_count_avoided_render(self.hass, RENDERS_ATTRIBUTES_UNCHANGED)
+                return False
+
             had_timer = self._rate_limit.async_has_timer(template)
 
             if self._rate_limit.async_schedule_action(
@@ -951,9 +966,11 @@ class _TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        if event and not track_template_.variables:
+            info = _async_render_shared(self.hass, template, event)
+        else:
+            info = template.async_render_to_info(track_template_.variables)
+        self._info[template] = info
 
         try:
             result: str | TemplateError = info.result()
@@ -1251,6 +1268,193 @@ def async_track_point_in_time(
 track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 
 
+class _TimerEntry:
+    """A callback scheduled on the timer wheel."""
+
+    __slots__ = ("job", "point_in_time", "due", "seq", "cancelled")
+
+    def __init__(
+        self,
+        job: HassJob[Awaitable[None] | None],
+        point_in_time: datetime,
+        seq: int,
+    ) -> None:
+        """Initialize the entry."""
+        self.job = job
+        self.point_in_time = point_in_time
+        self.due = point_in_time.timestamp()
+        self.seq = seq
+        self.cancelled = False
+
+
+class _TimerWheel:
+    """Fire the point in time listeners of an instance in batches.
+
+    Listeners are grouped in buckets by the second they are due, and an
+    event loop timer is only armed when a listener is due earlier than the
+    armed ones. Each tick fires every listener that is due, in the order
+    they are due.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self.hass = hass
+        self._buckets: dict[int, dict[_TimerEntry, None]] = {}
+        self._bucket_seconds: list[int] = []
+        self._armed: list[float] = []
+        self._seq = 0
+        self.scheduled = 0
+        self.ticks = 0
+        self.fired = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+
+    @callback
+    def async_schedule(
+        self, job: HassJob[Awaitable[None] | None], point_in_time: datetime
+    ) -> _TimerEntry:
+        """Schedule a job to run at a point in time."""
+        self._seq += 1
+        entry = _TimerEntry(job, point_in_time, self._seq)
+        second = int(entry.due)
+        if (bucket := self._buckets.get(second)) is None:
+            bucket = self._buckets[second] = {}
+            heapq.heappush(self._bucket_seconds, second)
+        bucket[entry] = None
+        self.scheduled += 1
+        if not self._armed or entry.due < self._armed[0]:
+            self._async_arm(entry.due)
+        return entry
+
+    @callback
+    def async_cancel(self, entry: _TimerEntry) -> None:
+        """Cancel a scheduled job."""
+        if entry.cancelled:
+            return
+        entry.cancelled = True
+        second = int(entry.due)
+        if (bucket := self._buckets.get(second)) is None or entry not in bucket:
+            return
+        del bucket[entry]
+        self.scheduled -= 1
+        if not bucket:
+            # The second stays in the heap until it is reached
+            del self._buckets[second]
+
+    @callback
+    def _async_arm(self, due: float) -> None:
+        """Arm an event loop timer for the earliest due listener.
+
+        Timers armed for later listeners are left alone, they tick without
+        firing anything if nothing is due.
+        """
+        heapq.heappush(self._armed, due)
+        self.hass.loop.call_at(
+            self.hass.loop.time() + due - time.time(), self._async_tick, due
+        )
+
+    @callback
+    def _async_tick(self, armed_due: float) -> None:
+        """Fire the listeners that are due."""
+        self._armed.remove(armed_due)
+        heapq.heapify(self._armed)
+        now = time_tracker_utcnow().timestamp()
+        batch = self._async_pop_due(now)
+        if batch:
+            self.ticks += 1
+            jitter = now - batch[0].due
+            self.jitter_total += jitter
+            self.jitter_max = max(self.jitter_max, jitter)
+
+        for entry in batch:
+            # An earlier listener of the batch may have cancelled it
+            if entry.cancelled:
+                continue
+            entry.cancelled = True
+            self.fired += 1
+            try:
+                self.hass.async_run_hass_job(entry.job, entry.point_in_time)
+            except Exception as exc:  # pylint: disable=broad-except
+                self.hass.loop.call_exception_handler(
+                    {
+                        "message": f"Exception in timer callback {entry.job}",
+                        "exception": exc,
+                    }
+                )
+
+        if (next_due := self._async_next_due()) is not None and (
+            not self._armed or next_due < self._armed[0]
+        ):
+            self._async_arm(next_due)
+
+    @callback
+    def _async_pop_due(self, now: float) -> list[_TimerEntry]:
+        """Remove the listeners that are due and return them in order."""
+        batch: list[_TimerEntry] = []
+        now_second = int(now)
+        bucket_seconds = self._bucket_seconds
+        while bucket_seconds and bucket_seconds[0] <= now_second:
+            second = bucket_seconds[0]
+            if (bucket := self._buckets.get(second)) is None:
+                heapq.heappop(bucket_seconds)
+                continue
+            if second < now_second:
+                heapq.heappop(bucket_seconds)
+                del self._buckets[second]
+                batch.extend(bucket)
+                continue
+            # Listeners due later in the current second stay
+            due = [entry for entry in bucket if entry.due <= now]
+            for entry in due:
+                del bucket[entry]
+            if not bucket:
+                heapq.heappop(bucket_seconds)
+                del self._buckets[second]
+            batch.extend(due)
+            break
+        self.scheduled -= len(batch)
+        batch.sort(key=lambda entry: (entry.due, entry.seq))
+        return batch
+
+    @callback
+    def _async_next_due(self) -> float | None:
+        """Return when the earliest listener is due."""
+        bucket_seconds = self._bucket_seconds
+        while bucket_seconds:
+            if (bucket := self._buckets.get(bucket_seconds[0])) is not None:
+                return min(entry.due for entry in bucket)
+            heapq.heappop(bucket_seconds)
+        return None
+
+    @callback
+    def async_stats(self) -> dict[str, Any]:
+        """Return the number of scheduled listeners and how late ticks fired."""
+        return {
+            "scheduled": self.scheduled,
+            "buckets": len(self._buckets),
+            "ticks": self.ticks,
+            "fired": self.fired,
+            "jitter_max": self.jitter_max,
+            "jitter_mean": self.jitter_total / self.ticks if self.ticks else 0.0,
+        }
+
+
+@callback
+def _async_get_timer_wheel(hass: HomeAssistant) -> _TimerWheel:
+    """Return the timer wheel of an instance."""
+    if (wheel := hass.data.get(_TIMER_WHEEL)) is None:
+        wheel = hass.data[_TIMER_WHEEL] = _TimerWheel(hass)
+    return cast(_TimerWheel, wheel)
+
+
+@callback
+def async_get_timer_wheel_stats(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the number of scheduled point in time listeners and tick jitter."""
+    if (wheel := hass.data.get(_TIMER_WHEEL)) is None:
+        return {}
+    return cast(_TimerWheel, wheel).async_stats()
+
+
 @callback
 @bind_hass
 def async_track_point_in_utc_time(
@@ -1265,37 +1469,14 @@ def async_track_point_in_utc_time(
 
     # Since this is called once, we accept a HassJob so we can avoid
     # having to figure out how to call the action every time its called.
-    cancel_callback: asyncio.TimerHandle | None = None
-
-    @callback
-    def run_action(job: HassJob[Awaitable[None] | None]) -> None:
-        """Call the action."""
-        nonlocal cancel_callback
-
-        now = time_tracker_utcnow()
-
-        # Depending on the available clock support (including timer hardware
-        # and the OS kernel) it can happen that we fire a little bit too early
-        # as measured by utcnow(). That is bad when callbacks have assumptions
-        # about the current time. Thus, we rearm the timer for the remaining
-        # time.
-        if (delta := (utc_point_in_time - now).total_seconds()) > 0:
-            _LOGGER.debug("Called %f seconds too early, rearming", delta)
-
-            cancel_callback = hass.loop.call_later(delta, run_action, job)
-            return
-
-        hass.async_run_hass_job(job, utc_point_in_time)
-
     job = action if isinstance(action, HassJob) else HassJob(action)
-    delta = utc_point_in_time.timestamp() - time.time()
-    cancel_callback = hass.loop.call_later(delta, run_action, job)
+    wheel = _async_get_timer_wheel(hass)
+    entry = wheel.async_schedule(job, utc_point_in_time)
 
     @callback
     def unsub_point_in_time_listener() -> None:
-        """Cancel the call_later."""
-        assert cancel_callback is not None
-        cancel_callback.cancel()
+        """Cancel the listener."""
+        wheel.async_cancel(entry)
 
     return unsub_point_in_time_listener
 
@@ -1452,6 +1633,86 @@ track_sunset = threaded_listener_factory(async_track_sunset)
 time_tracker_utcnow = dt_util.utcnow
 
 
+class _TimePatternSchedule:
+    """Find the next time a time pattern matches.
+
+    The matching hours, minutes and seconds are turned into lookups once, so
+    the next match is found with integer arithmetic on the wall clock.
+    When the UTC offset differs between now and the match, a daylight
+    saving time transition is in between and the datetime based search
+    is used instead.
+    """
+
+    __slots__ = (
+        "seconds",
+        "minutes",
+        "hours",
+        "local",
+        "_minute_set",
+        "_hour_set",
+        "_first_of_hour",
+        "_first_of_day",
+    )
+
+    def __init__(
+        self, seconds: list[int], minutes: list[int], hours: list[int], local: bool
+    ) -> None:
+        """Initialize the schedule."""
+        if not seconds or not minutes or not hours:
+            raise ValueError("Cannot find a next time: Time expression never matches!")
+        self.seconds = seconds
+        self.minutes = minutes
+        self.hours = hours
+        self.local = local
+        self._minute_set = set(minutes)
+        self._hour_set = set(hours)
+        self._first_of_hour = minutes[0] * 60 + seconds[0]
+        self._first_of_day = hours[0] * 3600 + self._first_of_hour
+
+    def next_time(self, now: datetime) -> datetime:
+        """Return the first time at or after now the pattern matches."""
+        if not self.local:
+            offset = 0
+        elif (utcoffset := dt_util.as_local(now).utcoffset()) is None:
+            return self._find_next(now)
+        else:
+            offset = int(utcoffset.total_seconds())
+        wall = int(now.timestamp()) + offset
+        day_start = wall - wall % 86400
+        if (second_of_day := self._next_second_of_day(wall - day_start)) is None:
+            second_of_day = 86400 + self._first_of_day
+        result = dt_util.utc_from_timestamp(day_start + second_of_day - offset)
+        if self.local and dt_util.as_local(result).utcoffset() != utcoffset:
+            return self._find_next(now)
+        return result
+
+    def _next_second_of_day(self, second_of_day: int) -> int | None:
+        """Return the first matching second of the day at or after the given one."""
+        hour, second_of_hour = divmod(second_of_day, 3600)
+        if hour in self._hour_set:
+            minute, second = divmod(second_of_hour, 60)
+            if minute in self._minute_set:
+                seconds = self.seconds
+                if (index := bisect_left(seconds, second)) < len(seconds):
+                    return hour * 3600 + minute * 60 + seconds[index]
+            minutes = self.minutes
+            if (index := bisect_right(minutes, minute)) < len(minutes):
+                return hour * 3600 + minutes[index] * 60 + self.seconds[0]
+        hours = self.hours
+        if (index := bisect_right(hours, hour)) < len(hours):
+            return hours[index] * 3600 + self._first_of_hour
+        return None
+
+    def _find_next(self, now: datetime) -> datetime:
+        """Return the next match with the datetime based search."""
+        return dt_util.find_next_time_expression_time(
+            dt_util.as_local(now) if self.local else now,
+            self.seconds,
+            self.minutes,
+            self.hours,
+        )
+
+
 @callback
 @bind_hass
 def async_track_utc_time_change(
@@ -1475,16 +1736,12 @@ def async_track_utc_time_change(
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    matching_seconds = dt_util.parse_time_expression(second, 0, 59)
-    matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
-    matching_hours = dt_util.parse_time_expression(hour, 0, 23)
-
-    def calculate_next(now: datetime) -> datetime:
-        """Calculate and set the next time the trigger should fire."""
-        localized_now = dt_util.as_local(now) if local else now
-        return dt_util.find_next_time_expression_time(
-            localized_now, matching_seconds, matching_minutes, matching_hours
-        )
+    calculate_next = _TimePatternSchedule(
+        dt_util.parse_time_expression(second, 0, 59),
+        dt_util.parse_time_expression(minute, 0, 59),
+        dt_util.parse_time_expression(hour, 0, 23),
+        local,
+    ).next_time
 
     time_listener: CALLBACK_TYPE | None = None
 
@@ -1609,6 +1866,77 @@ def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     return bool(info.filter_lifecycle(entity_id))
 
 
+def _event_changes_read_attributes(event: Event, info: RenderInfo) -> bool:
+    """Determine if an event changes the attributes a template only read of an entity."""
+    if (
+        attributes := info.entity_attributes.get(event.data.get(ATTR_ENTITY_ID))
+    ) is None:
+        return True
+
+    old_state = event.data.get("old_state")
+    new_state = event.data.get("new_state")
+    if old_state is None or new_state is None:
+        return True
+
+    return any(
+        old_state.attributes.get(name) != new_state.attributes.get(name)
+        for name in attributes
+    )
+
+
+@callback
+def _async_count_avoided_render(hass: HomeAssistant, reason: str) -> None:
+    """Count a template render avoided."""
+    stats = hass.data.setdefault(TEMPLATE_RENDER_STATS, {})
+    stats[reason] = stats.get(reason, 0) + 1
+
+
+@callback
+def _async_render_shared(
+    hass: HomeAssistant, template: Template, event: Event
+) -> RenderInfo:
+    """Render a template without variables, sharing the render for an event.
+
+    Identical templates tracked by different listeners are rendered once for
+    an event, as long as the states the render read are unchanged.
+    """
+    shared = hass.data.get(_SHARED_TEMPLATE_RENDERS)
+    if shared is None or shared[0] is not event:
+        shared = hass.data[_SHARED_TEMPLATE_RENDERS] = (event, {})
+    renders: dict[str, tuple[RenderInfo, dict[str, State | None]]] = shared[1]
+
+    if (render := renders.get(template.template)) is not None:
+        info, states = render
+        if all(
+            hass.states.get(entity_id) is state for entity_id, state in states.items()
+        ):
+            _async_count_avoided_render(hass, RENDERS_SHARED)
+            return info
+
+    info = template.async_render_to_info()
+    # Only renders depending on specific entities can be checked to be current
+    if not (
+        info.exception
+        or info.has_time
+        or info.all_states
+        or info.all_states_lifecycle
+        or info.domains
+        or info.domains_lifecycle
+    ):
+        renders[template.template] = (
+            info,
+            {entity_id: hass.states.get(entity_id) for entity_id in info.entities},
+        )
+    return info
+
+
+@callback
+def async_get_template_render_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return the number of template renders avoided by reason."""
+    stats: dict[str, int] = hass.data.get(TEMPLATE_RENDER_STATS, {})
+    return dict(stats)
+
+
 @callback
 def _rate_limit_for_event(
     event: Event, info: RenderInfo, track_template_: TrackTemplate
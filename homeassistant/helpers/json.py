@@ -1,7 +1,31 @@
 """Helpers to help with encoding Home Assistant objects in JSON."""
 import datetime
 import json
-from typing import Any
+from typing import Any, Final
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from homeassistant.core import Context, Event, State
+
+# Exceptions raised by json_bytes and json_dumps for data which can't be serialized
+JSON_ENCODE_EXCEPTIONS: Final = (TypeError, ValueError)
+
+
+def json_encoder_default(obj: Any) -> Any:
+    """Convert Home Assistant objects.
+
+    Raises TypeError for other objects.
+    """
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -12,14 +36,85 @@ class JSONEncoder(json.JSONEncoder):
 
         Hand other objects to the original method.
         """
-        if isinstance(o, datetime.datetime):
-            return o.isoformat()
-        if isinstance(o, set):
-            return list(o)
-        if hasattr(o, "as_dict"):
-            return o.as_dict()
+        try:
+            return json_encoder_default(o)
+        except TypeError:
+            return json.JSONEncoder.default(self, o)
+
+
+if orjson is not None:
+
+    def _orjson_default(obj: Any) -> Any:
+        """Convert Home Assistant objects for orjson.
+
+        States, events and contexts are converted without as_dict, leaving their
+        datetimes to orjson.
+        """
+        obj_type = type(obj)
+        if obj_type is State:
+            return {
+                "entity_id": obj.entity_id,
+                "state": obj.state,
+                "attributes": dict(obj.attributes),
+                "last_changed": obj.last_changed,
+                "last_updated": obj.last_updated,
+                "context": obj.context,
+            }
+        if obj_type is Event:
+            return {
+                "event_type": obj.event_type,
+                "data": dict(obj.data),
+                "origin": str(obj.origin.value),
+                "time_fired": obj.time_fired,
+                "context": obj.context,
+            }
+        if obj_type is Context:
+            return {
+                "id": obj.id,
+                "parent_id": obj.parent_id,
+                "user_id": obj.user_id,
+            }
+        return json_encoder_default(obj)
+
+    def json_bytes(data: Any) -> bytes:
+        """Serialize data to JSON bytes.
+
+        orjson encodes datetimes, dataclasses and enums itself, and only calls
+        the default hook for other objects. NaN and infinity are encoded as null.
+        """
+        return orjson.dumps(
+            data, option=orjson.OPT_NON_STR_KEYS, default=_orjson_default
+        )
+
+    def json_dumps(data: Any) -> str:
+        """Serialize data to a JSON string."""
+        return json_bytes(data).decode("utf-8")
+
+else:  # pragma: no cover
+
+    def json_bytes(data: Any) -> bytes:
+        """Serialize data to JSON bytes, NaN and infinity are encoded as null."""
+        return json_dumps(data).encode("utf-8")
+
+    def json_dumps(data: Any) -> str:
+        """Serialize data to a JSON string, NaN and infinity are encoded as null."""
+        try:
+            return json.dumps(data, cls=JSONEncoder, allow_nan=False)
+        except ValueError:
+            pass
+        # Encode NaN and infinity as null like orjson does
+        return json.dumps(_replace_nan(data), cls=JSONEncoder, allow_nan=False)
+
+
+def _replace_nan(data: Any) -> Any:
+    """Return data with NaN and infinity replaced by None.
 
-        return json.JSONEncoder.default(self, o)
+    Raises ValueError for data which can't be serialized for other reasons,
+    such as circular references.
+    """
+    return json.loads(
+        json.dumps(data, cls=JSONEncoder), parse_constant=lambda constant: None
+    )
 
 
 class ExtendedJSONEncoder(JSONEncoder):
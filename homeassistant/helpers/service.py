@@ -6,7 +6,7 @@ from collections.abc import Awaitable, Callable, Iterable
 import dataclasses
 from functools import partial, wraps
 import logging
-from typing import TYPE_CHECKING, Any, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict, cast
 
 from typing_extensions import TypeGuard
 import voluptuous as vol
@@ -24,7 +24,7 @@ from homeassistant.const import (
     ENTITY_MATCH_ALL,
     ENTITY_MATCH_NONE,
 )
-from homeassistant.core import Context, HomeAssistant, ServiceCall, callback
+from homeassistant.core import Context, Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import (
     HomeAssistantError,
     TemplateError,
@@ -61,6 +61,8 @@ CONF_SERVICE_DATA_TEMPLATE = "data_template"
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_DESCRIPTION_CACHE = "service_description_cache"
+SERVICE_TARGET_CACHE = "service_target_cache"
+SERVICE_TARGET_CACHE_SIZE = 256
 
 
 class ServiceParams(TypedDict):
@@ -347,47 +349,175 @@ def async_extract_referenced_entity_ids(
     if not selector.device_ids and not selector.area_ids:
         return selected
 
-    ent_reg = entity_registry.async_get(hass)
-    dev_reg = device_registry.async_get(hass)
-    area_reg = area_registry.async_get(hass)
+    targets = _async_get_target_cache(hass).async_resolve(
+        frozenset(selector.area_ids), frozenset(selector.device_ids)
+    )
+    selected.indirectly_referenced.update(targets.indirectly_referenced)
+    selected.missing_devices.update(targets.missing_devices)
+    selected.missing_areas.update(targets.missing_areas)
+    selected.referenced_devices.update(targets.referenced_devices)
+    return selected
 
-    for device_id in selector.device_ids:
-        if device_id not in dev_reg.devices:
-            selected.missing_devices.add(device_id)
 
-    for area_id in selector.area_ids:
-        if area_id not in area_reg.areas:
-            selected.missing_areas.add(area_id)
+@dataclasses.dataclass(frozen=True)
+class _ResolvedTargets:
+    """Class to hold what a set of area and device ids resolve to."""
 
-    # Find devices for this area
-    selected.referenced_devices.update(selector.device_ids)
-    for device_entry in dev_reg.devices.values():
-        if device_entry.area_id in selector.area_ids:
-            selected.referenced_devices.add(device_entry.id)
+    indirectly_referenced: frozenset[str]
+    missing_devices: frozenset[str]
+    missing_areas: frozenset[str]
+    referenced_devices: frozenset[str]
 
-    if not selector.area_ids and not selected.referenced_devices:
-        return selected
 
-    for ent_entry in ent_reg.entities.values():
-        # Do not add config or diagnostic entities referenced by areas or devices
+class _TargetCache:
+    """Cache the resolution of area and device targets.
 
-        if ent_entry.entity_category is not None:
-            continue
+    The cache is cleared when the area, device or entity registry is updated.
+    """
 
-        if (
-            # when area matches the target area
-            ent_entry.area_id in selector.area_ids
-            # when device matches a referenced devices with no explicitly set area
-            or (
-                not ent_entry.area_id
-                and ent_entry.device_id in selected.referenced_devices
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._registries: tuple[
+            area_registry.AreaRegistry,
+            device_registry.DeviceRegistry,
+            entity_registry.EntityRegistry,
+        ] | None = None
+        self._targets: dict[
+            tuple[frozenset[str], frozenset[str]], _ResolvedTargets
+        ] = {}
+        for event_type in (
+            area_registry.EVENT_AREA_REGISTRY_UPDATED,
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED,
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED,
+        ):
+            # The cache is cleared from the event filter so a registry
+            # change is visible to the next lookup, even one made before
+            # the event loop gets to run the listeners.
+            hass.bus.async_listen(
+                event_type, _async_ignore_event, self._async_registry_updated
             )
-            # when device matches target device
-            or ent_entry.device_id in selector.device_ids
+
+    @callback
+    def _async_registry_updated(self, event: Event) -> bool:
+        """Clear the cache when a registry is updated."""
+        if self._targets:
+            self.invalidations += 1
+            self._targets.clear()
+        return False
+
+    @callback
+    def async_resolve(
+        self, area_ids: frozenset[str], device_ids: frozenset[str]
+    ) -> _ResolvedTargets:
+        """Return what the area and device ids resolve to."""
+        registries = (
+            area_registry.async_get(self.hass),
+            device_registry.async_get(self.hass),
+            entity_registry.async_get(self.hass),
+        )
+        if self._registries is None or any(
+            new is not old for new, old in zip(registries, self._registries)
         ):
-            selected.indirectly_referenced.add(ent_entry.entity_id)
+            # Registries can be replaced without an event in tests
+            self._registries = registries
+            self._targets.clear()
+
+        key = (area_ids, device_ids)
+        if (targets := self._targets.get(key)) is not None:
+            self.hits += 1
+            return targets
+
+        self.misses += 1
+        targets = _async_resolve_targets(*registries, area_ids, device_ids)
+        if len(self._targets) >= SERVICE_TARGET_CACHE_SIZE:
+            del self._targets[next(iter(self._targets))]
+        self._targets[key] = targets
+        return targets
+
+
+@callback
+def _async_ignore_event(event: Event) -> None:
+    """Ignore an event, the work is done in the event filter."""
+
+
+@callback
+def _async_get_target_cache(hass: HomeAssistant) -> _TargetCache:
+    """Return the target cache, creating it if needed."""
+    if (cache := hass.data.get(SERVICE_TARGET_CACHE)) is None:
+        cache = hass.data[SERVICE_TARGET_CACHE] = _TargetCache(hass)
+    return cast(_TargetCache, cache)
+
+
+@callback
+def _async_resolve_targets(
+    area_reg: area_registry.AreaRegistry,
+    dev_reg: device_registry.DeviceRegistry,
+    ent_reg: entity_registry.EntityRegistry,
+    area_ids: frozenset[str],
+    device_ids: frozenset[str],
+) -> _ResolvedTargets:
+    """Resolve area and device ids to devices and entities."""
+    missing_devices = {
+        device_id for device_id in device_ids if device_id not in dev_reg.devices
+    }
+    missing_areas = {area_id for area_id in area_ids if area_id not in area_reg.areas}
+
+    # Find devices for these areas
+    referenced_devices = set(device_ids)
+    for area_id in area_ids:
+        referenced_devices.update(
+            device_entry.id
+            for device_entry in device_registry.async_entries_for_area(dev_reg, area_id)
+        )
+
+    indirectly_referenced: set[str] = set()
+
+    # when area matches the target area
+    for area_id in area_ids:
+        indirectly_referenced.update(
+            ent_entry.entity_id
+            for ent_entry in entity_registry.async_entries_for_area(ent_reg, area_id)
+            # Do not add config or diagnostic entities referenced by areas or devices
+            if ent_entry.entity_category is None
+        )
+
+    for device_id in referenced_devices:
+        indirectly_referenced.update(
+            ent_entry.entity_id
+            for ent_entry in entity_registry.async_entries_for_device(
+                ent_reg, device_id, include_disabled_entities=True
+            )
+            if ent_entry.entity_category is None
+            and (
+                # when device matches a referenced devices with no explicitly set area
+                not ent_entry.area_id
+                # when device matches target device
+                or device_id in device_ids
+            )
+        )
+
+    return _ResolvedTargets(
+        indirectly_referenced=frozenset(indirectly_referenced),
+        missing_devices=frozenset(missing_devices),
+        missing_areas=frozenset(missing_areas),
+        referenced_devices=frozenset(referenced_devices),
+    )
 
-    return selected
+
+@callback
+def async_get_service_target_cache_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return how often area and device targets were resolved from the cache."""
+    if (cache := hass.data.get(SERVICE_TARGET_CACHE)) is None:
+        return {}
+    return {
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "invalidations": cache.invalidations,
+    }
 
 
 @bind_hass
@@ -529,14 +659,15 @@ def async_set_service_schema(
 @bind_hass
 async def entity_service_call(
     hass: HomeAssistant,
-    platforms: Iterable[EntityPlatform],
+    platforms: Iterable[EntityPlatform] | dict[str, Entity],
     func: str | Callable[..., Any],
     call: ServiceCall,
     required_features: Iterable[int] | None = None,
 ) -> None:
     """Handle an entity service call.
 
-    Calls all platforms simultaneously.
+    Calls all platforms simultaneously. Instead of platforms, a dict of
+    entities by entity_id can be passed to look up the targets directly.
     """
     if call.context.user_id:
         user = await hass.auth.async_get_user(call.context.user_id)
@@ -574,7 +705,31 @@ async def entity_service_call(
     # A list with entities to call the service on.
     entity_candidates: list[Entity] = []
 
-    if entity_perms is None:
+    if isinstance(platforms, dict):
+        if target_all_entities:
+            entity_candidates = [
+                entity
+                for entity in platforms.values()
+                if entity_perms is None
+                or entity_perms(entity.entity_id, POLICY_CONTROL)
+            ]
+        else:
+            assert all_referenced is not None
+            # Sorted to call the entities and check permissions in a stable order
+            for entity_id in sorted(all_referenced):
+                if (entity := platforms.get(entity_id)) is None:
+                    continue
+                if entity_perms is not None and not entity_perms(
+                    entity_id, POLICY_CONTROL
+                ):
+                    raise Unauthorized(
+                        context=call.context,
+                        entity_id=entity_id,
+                        permission=POLICY_CONTROL,
+                    )
+                entity_candidates.append(entity)
+
+    elif entity_perms is None:
         for platform in platforms:
             if target_all_entities:
                 entity_candidates.extend(platform.entities.values())
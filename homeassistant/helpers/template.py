@@ -9,16 +9,22 @@ from collections.abc import Callable, Generator, Iterable
 from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
-from functools import partial, wraps
+from functools import lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import attrgetter
+import os
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+from time import monotonic
+from types import CodeType
 from typing import Any, cast
 from urllib.parse import urlencode as urllib_urlencode
 import weakref
@@ -34,10 +40,14 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     STATE_UNKNOWN,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
+    Event,
     HomeAssistant,
     State,
     callback,
@@ -53,9 +63,11 @@ from homeassistant.util import (
     slugify as slugify_util,
 )
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.file import WriteError, write_bytes_file
 from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
+from .storage import STORAGE_DIR
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -69,6 +81,17 @@ _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
 
+DATA_BYTECODE_CACHE = "template.bytecode_cache"
+BYTECODE_CACHE_FILE = "template.bytecode_cache"
+# Compiled code is only valid for the Python and Jinja versions compiling it,
+# and the Home Assistant version whose filters, tests and globals it was
+# validated against
+BYTECODE_CACHE_VERSION = (MAGIC_NUMBER, jinja2.__version__, HA_VERSION)
+# Maximum number of compiled templates in the bytecode cache file
+BYTECODE_CACHE_MAX_TEMPLATES = 10000
+# Number of compiled templates kept in memory once no template uses them
+TEMPLATE_CACHE_SIZE = 1024
+
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -236,12 +259,14 @@ class RenderInfo:
         self.domains: collections.abc.Set[str] = set()
         self.domains_lifecycle: collections.abc.Set[str] = set()
         self.entities: collections.abc.Set[str] = set()
+        # Entities of which only some attributes were read, once frozen
+        self.entity_attributes: dict[str, collections.abc.Set[str]] = {}
         self.rate_limit: timedelta | None = None
         self.has_time = False
 
     def __repr__(self) -> str:
         """Representation of RenderInfo."""
-        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} rate_limit={self.rate_limit}> has_time={self.has_time}"
+        return f"<RenderInfo {self.template} all_states={self.all_states} all_states_lifecycle={self.all_states_lifecycle} domains={self.domains} domains_lifecycle={self.domains_lifecycle} entities={self.entities} entity_attributes={self.entity_attributes} rate_limit={self.rate_limit}> has_time={self.has_time}"
 
     def _filter_domains_and_entities(self, entity_id: str) -> bool:
         """Template should re-render if the entity state changes when we match specific domains or entities."""
@@ -269,7 +294,14 @@ class RenderInfo:
         self.all_states = False
 
     def _freeze_sets(self) -> None:
-        self.entities = frozenset(self.entities)
+        # Entities which were also read as a whole depend on all of their state
+        entity_attributes = {
+            entity_id: frozenset(attributes)
+            for entity_id, attributes in self.entity_attributes.items()
+            if entity_id not in self.entities
+        }
+        self.entities = frozenset({*self.entities, *self.entity_attributes})
+        self.entity_attributes = entity_attributes
         self.domains = frozenset(self.domains)
         self.domains_lifecycle = frozenset(self.domains_lifecycle)
 
@@ -283,6 +315,7 @@ class RenderInfo:
                 self.rate_limit = DOMAIN_STATES_RATE_LIMIT
 
         if self.exception:
+            self.entity_attributes = {}
             return
 
         if not self.all_states_lifecycle:
@@ -292,9 +325,15 @@ class RenderInfo:
                 self.filter_lifecycle = _false
 
         if self.all_states:
+            self.entity_attributes = {}
             return
 
         if self.domains:
+            self.entity_attributes = {
+                entity_id: attributes
+                for entity_id, attributes in self.entity_attributes.items()
+                if split_entity_id(entity_id)[0] not in self.domains
+            }
             self.filter = self._filter_domains_and_entities
         elif self.entities:
             self.filter = self._filter_entities
@@ -827,6 +866,11 @@ def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
         entity_collect.entities.add(entity_id)
 
 
+def _collect_state_attribute(hass: HomeAssistant, entity_id: str, name: str) -> None:
+    if (entity_collect := hass.data.get(_RENDER_INFO)) is not None:
+        entity_collect.entity_attributes.setdefault(entity_id, set()).add(name)
+
+
 def _state_generator(hass: HomeAssistant, domain: str | None) -> Generator:
     """State generator for a domain or all states."""
     for state in sorted(hass.states.async_all(domain), key=attrgetter("entity_id")):
@@ -1259,8 +1303,10 @@ def is_state_attr(hass: HomeAssistant, entity_id: str, name: str, value: Any) ->
 
 def state_attr(hass: HomeAssistant, entity_id: str, name: str) -> Any:
     """Get a specific attribute from a state."""
-    if (state_obj := _get_state(hass, entity_id)) is not None:
+    if (state_obj := hass.states.get(entity_id)) is not None:
+        _collect_state_attribute(hass, state_obj.entity_id, name)
         return state_obj.attributes.get(name)
+    _collect_state(hass, entity_id)
     return None
 
 
@@ -1855,6 +1901,116 @@ class LoggingUndefined(jinja2.Undefined):
         return super().__bool__()
 
 
+class TemplateBytecodeCache:
+    """Persist the code templates compile to between runs.
+
+    The code is keyed by the environment compiling it and the hash of the
+    template source, so a template is only compiled again when it changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.path = hass.config.path(STORAGE_DIR, BYTECODE_CACHE_FILE)
+        self.compiled = 0
+        self.loaded = 0
+        self.compile_time = 0.0
+        self._stored: dict[str, CodeType] = {}
+        self._used: dict[str, CodeType] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the code stored by the previous run."""
+        self._stored = await self.hass.async_add_executor_job(self._load)
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STARTED, self._async_save_on_event
+        )
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_save_on_event
+        )
+
+    def _load(self) -> dict[str, CodeType]:
+        """Read the stored code."""
+        try:
+            with open(self.path, "rb") as fdesc:
+                version, stored = marshal.load(fdesc)
+        except FileNotFoundError:
+            return {}
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.warning("Ignoring template bytecode cache %s: %s", self.path, err)
+            return {}
+        if version != BYTECODE_CACHE_VERSION or not isinstance(stored, dict):
+            return {}
+        return stored
+
+    def compile(
+        self, env_type: str, source: str, compile_func: Callable[[str], CodeType]
+    ) -> CodeType:
+        """Return the stored code of a template or compile it."""
+        key = f"{env_type}:{hashlib.sha256(source.encode()).hexdigest()}"
+        if (code := self._used.get(key)) is not None:
+            return code
+        if (code := self._stored.get(key)) is not None:
+            self.loaded += 1
+        else:
+            start = monotonic()
+            code = compile_func(source)
+            self.compile_time += monotonic() - start
+            self.compiled += 1
+            self._dirty = True
+        if len(self._used) < BYTECODE_CACHE_MAX_TEMPLATES:
+            self._used[key] = code
+        return code
+
+    async def _async_save_on_event(self, _: Event) -> None:
+        """Save the cache at the end of startup and on shutdown."""
+        await self.async_save()
+
+    async def async_save(self) -> None:
+        """Store the code of the templates compiled since the cache loaded.
+
+        Templates stored by the previous run which were not compiled yet are
+        kept, as long as they fit in the file.
+        """
+        if not self._dirty:
+            return
+        self._dirty = False
+        stored = dict(self._used)
+        for key, code in self._stored.items():
+            if len(stored) >= BYTECODE_CACHE_MAX_TEMPLATES:
+                break
+            stored.setdefault(key, code)
+        try:
+            await self.hass.async_add_executor_job(self._save, stored)
+        except WriteError:
+            self._dirty = True
+
+    def _save(self, stored: dict[str, CodeType]) -> None:
+        """Write the code to disk."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_bytes_file(
+            self.path, marshal.dumps((BYTECODE_CACHE_VERSION, stored)), private=True
+        )
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the template bytecode cache of the previous run."""
+    cache = hass.data[DATA_BYTECODE_CACHE] = TemplateBytecodeCache(hass)
+    await cache.async_load()
+
+
+@callback
+def async_get_template_compile_stats(hass: HomeAssistant) -> dict[str, Any]:
+    """Return how long compiling templates took and how many were compiled."""
+    if (cache := hass.data.get(DATA_BYTECODE_CACHE)) is None:
+        return {}
+    return {
+        "compile_time": cache.compile_time,
+        "compiled": cache.compiled,
+        "loaded": cache.loaded,
+    }
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -1866,7 +2022,17 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
+        if limited:
+            self.env_type = "limited"
+        elif strict:
+            self.env_type = "strict"
+        else:
+            self.env_type = "normal"
         self.template_cache = weakref.WeakValueDictionary()
+        # Keep recently compiled templates after the templates using them are gone
+        self._compile_cached = lru_cache(maxsize=TEMPLATE_CACHE_SIZE)(
+            self._compile_source
+        )
         self.filters["round"] = forgiving_round
         self.filters["multiply"] = multiply
         self.filters["log"] = logarithm
@@ -2059,9 +2225,18 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             return super().compile(source, name, filename, raw, defer_init)
 
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_cached(source)
 
         return cached
 
+    def _compile_source(self, source):
+        """Compile the template, using the bytecode cache if loaded."""
+        if (
+            self.hass is None
+            or (bytecode_cache := self.hass.data.get(DATA_BYTECODE_CACHE)) is None
+        ):
+            return super().compile(source)
+        return bytecode_cache.compile(self.env_type, source, super().compile)
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
@@ -7,14 +7,17 @@ documentation as possible to keep it understandable.
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from contextlib import suppress
 import functools as ft
 import importlib
+from importlib.machinery import all_suffixes
 import json
 import logging
+import os
 import pathlib
 import sys
+import time
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, TypedDict, TypeVar, cast
 
@@ -24,16 +27,23 @@ from awesomeversion import (
     AwesomeVersionStrategy,
 )
 
+from .const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
+    __version__,
+)
 from .generated.dhcp import DHCP
 from .generated.mqtt import MQTT
 from .generated.ssdp import SSDP
 from .generated.usb import USB
 from .generated.zeroconf import HOMEKIT, ZEROCONF
+from .util import package as pkg_util
 from .util.async_ import gather_with_concurrency
+from .util.file import WriteError, write_utf8_file
 
 # Typing imports that create a circular dependency
 if TYPE_CHECKING:
-    from .core import HomeAssistant
+    from .core import Event, HomeAssistant
 
 CALLABLE_T = TypeVar(  # pylint: disable=invalid-name
     "CALLABLE_T", bound=Callable[..., Any]
@@ -44,6 +54,11 @@ _LOGGER = logging.getLogger(__name__)
 DATA_COMPONENTS = "components"
 DATA_INTEGRATIONS = "integrations"
 DATA_CUSTOM_COMPONENTS = "custom_components"
+DATA_IMPORT_TIME = "integration_import_time"
+DATA_PREIMPORT = "integration_preimport"
+DATA_INTEGRATION_INDEX = "integration_index"
+INTEGRATION_INDEX_FILE = "loader.integration_index"
+INTEGRATION_INDEX_VERSION = 1
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -56,6 +71,7 @@ CUSTOM_WARNING = (
 _UNDEF = object()  # Internal; not helpers.typing.UNDEFINED due to circular dependency
 
 MAX_LOAD_CONCURRENTLY = 4
+MAX_IMPORT_CONCURRENTLY = 8
 
 MOVED_ZEROCONF_PROPS = ("macaddress", "model", "manufacturer")
 
@@ -102,6 +118,196 @@ def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
     }
 
 
+def _list_sub_directories(path: str) -> list[str]:
+    """Return the names of the sub directories of a path."""
+    return [entry.name for entry in pathlib.Path(path).iterdir() if entry.is_dir()]
+
+
+def _list_modules(path: pathlib.Path) -> set[str]:
+    """Return the names of the modules and packages in a directory."""
+    suffixes = all_suffixes()
+    modules = set()
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                modules.add(entry.name)
+                continue
+            for suffix in suffixes:
+                if entry.name.endswith(suffix):
+                    modules.add(entry.name[: -len(suffix)])
+                    break
+    return modules
+
+
+def _read_integration(manifest_path: pathlib.Path) -> tuple[Manifest, set[str]] | None:
+    """Read the manifest and list the modules of an integration."""
+    if not manifest_path.is_file():
+        return None
+
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except ValueError as err:
+        _LOGGER.error("Error parsing manifest.json file at %s: %s", manifest_path, err)
+        return None
+
+    return manifest, _list_modules(manifest_path.parent)
+
+
+def _integration_mtime(file_path: pathlib.Path) -> list[int]:
+    """Return the modification times of an integration and its manifest.
+
+    The directory changes when modules are added or removed, the manifest
+    when it is edited.
+    """
+    return [
+        file_path.stat().st_mtime_ns,
+        (file_path / "manifest.json").stat().st_mtime_ns,
+    ]
+
+
+class IntegrationIndex:
+    """Persist the manifests and modules of integrations between runs.
+
+    The index is only used by the Home Assistant version which stored it.
+    An entry is used as long as the integration directory and its manifest
+    were not modified, otherwise the integration is read again.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        # pylint: disable-next=import-outside-toplevel
+        from .helpers.storage import STORAGE_DIR
+
+        self.hass = hass
+        self.path = hass.config.path(STORAGE_DIR, INTEGRATION_INDEX_FILE)
+        self.loaded = 0
+        self.read = 0
+        self._stored_integrations: dict[str, dict[str, Any]] = {}
+        self._stored_directories: dict[str, dict[str, Any]] = {}
+        self._integrations: dict[str, dict[str, Any]] = {}
+        self._directories: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the index stored by the previous run."""
+        stored = await self.hass.async_add_executor_job(self._load)
+        self._stored_integrations = stored.get("integrations", {})
+        self._stored_directories = stored.get("directories", {})
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STARTED, self._async_save_on_event
+        )
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_save_on_event
+        )
+
+    def _load(self) -> dict[str, Any]:
+        """Read the stored index."""
+        try:
+            with open(self.path, encoding="utf-8") as fdesc:
+                stored = json.loads(fdesc.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Ignoring integration index %s: %s", self.path, err)
+            return {}
+        if (
+            not isinstance(stored, dict)
+            or stored.get("version") != INTEGRATION_INDEX_VERSION
+            or stored.get("ha_version") != __version__
+        ):
+            return {}
+        return stored
+
+    def sub_directories(
+        self, path: str, list_func: Callable[[str], list[str]]
+    ) -> list[str]:
+        """Return the stored sub directories of a path or list them."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return list_func(path)
+        if (entry := self._stored_directories.get(path)) is None or entry[
+            "mtime"
+        ] != mtime:
+            entry = {"mtime": mtime, "names": list_func(path)}
+            self._dirty = True
+        self._directories[path] = entry
+        return list(entry["names"])
+
+    def integration(
+        self,
+        pkg_path: str,
+        file_path: pathlib.Path,
+        read_func: Callable[[pathlib.Path], tuple[Manifest, set[str]] | None],
+    ) -> tuple[Manifest, set[str]] | None:
+        """Return the stored manifest and modules of an integration or read them."""
+        manifest_path = file_path / "manifest.json"
+        try:
+            mtime = _integration_mtime(file_path)
+        except OSError:
+            return read_func(manifest_path)
+        if (
+            (entry := self._stored_integrations.get(pkg_path)) is not None
+            and entry["path"] == str(file_path)
+            and entry["mtime"] == mtime
+        ):
+            self.loaded += 1
+        else:
+            if (result := read_func(manifest_path)) is None:
+                return None
+            self.read += 1
+            manifest, modules = result
+            entry = {
+                "path": str(file_path),
+                "mtime": mtime,
+                "manifest": manifest,
+                "modules": sorted(modules),
+            }
+            self._dirty = True
+        self._integrations[pkg_path] = entry
+        return entry["manifest"], set(entry["modules"])
+
+    async def _async_save_on_event(self, _: Event) -> None:
+        """Save the index at the end of startup and on shutdown."""
+        await self.async_save()
+
+    async def async_save(self) -> None:
+        """Store the integrations and directories used since the index loaded."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        data = json.dumps(
+            {
+                "version": INTEGRATION_INDEX_VERSION,
+                "ha_version": __version__,
+                "integrations": self._integrations,
+                "directories": self._directories,
+            }
+        )
+        try:
+            await self.hass.async_add_executor_job(self._save, data)
+        except WriteError:
+            self._dirty = True
+
+    def _save(self, data: str) -> None:
+        """Write the index to disk."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_utf8_file(self.path, data, private=True)
+
+
+async def async_load_integration_index(hass: HomeAssistant) -> None:
+    """Load the integration index of the previous run."""
+    index = hass.data[DATA_INTEGRATION_INDEX] = IntegrationIndex(hass)
+    await index.async_load()
+
+
+def async_get_integration_index_stats(hass: HomeAssistant) -> dict[str, int]:
+    """Return how many integrations were loaded from the index and read."""
+    if (index := hass.data.get(DATA_INTEGRATION_INDEX)) is None:
+        return {}
+    return {"loaded": index.loaded, "read": index.read}
+
+
 async def _async_get_custom_components(
     hass: HomeAssistant,
 ) -> dict[str, Integration]:
@@ -114,13 +320,16 @@ async def _async_get_custom_components(
     except ImportError:
         return {}
 
-    def get_sub_directories(paths: list[str]) -> list[pathlib.Path]:
-        """Return all sub directories in a set of paths."""
+    index: IntegrationIndex | None = hass.data.get(DATA_INTEGRATION_INDEX)
+
+    def get_sub_directories(paths: list[str]) -> list[str]:
+        """Return the names of all sub directories in a set of paths."""
+        if index is None:
+            return [name for path in paths for name in _list_sub_directories(path)]
         return [
-            entry
+            name
             for path in paths
-            for entry in pathlib.Path(path).iterdir()
-            if entry.is_dir()
+            for name in index.sub_directories(path, _list_sub_directories)
         ]
 
     dirs = await hass.async_add_executor_job(
@@ -131,9 +340,9 @@ async def _async_get_custom_components(
         MAX_LOAD_CONCURRENTLY,
         *(
             hass.async_add_executor_job(
-                Integration.resolve_from_root, hass, custom_components, comp.name
+                Integration.resolve_from_root, hass, custom_components, name
             )
-            for comp in dirs
+            for name in dirs
         ),
     )
 
@@ -318,26 +527,22 @@ class Integration:
         cls, hass: HomeAssistant, root_module: ModuleType, domain: str
     ) -> Integration | None:
         """Resolve an integration from a root module."""
+        index: IntegrationIndex | None = hass.data.get(DATA_INTEGRATION_INDEX)
+        pkg_path = f"{root_module.__name__}.{domain}"
+
         for base in root_module.__path__:
-            manifest_path = pathlib.Path(base) / domain / "manifest.json"
+            file_path = pathlib.Path(base) / domain
 
-            if not manifest_path.is_file():
-                continue
+            if index is None:
+                result = _read_integration(file_path / "manifest.json")
+            else:
+                result = index.integration(pkg_path, file_path, _read_integration)
 
-            try:
-                manifest = json.loads(manifest_path.read_text())
-            except ValueError as err:
-                _LOGGER.error(
-                    "Error parsing manifest.json file at %s: %s", manifest_path, err
-                )
+            if result is None:
                 continue
 
-            integration = cls(
-                hass,
-                f"{root_module.__name__}.{domain}",
-                manifest_path.parent,
-                manifest,
-            )
+            manifest, modules = result
+            integration = cls(hass, pkg_path, file_path, manifest, modules)
 
             if integration.is_built_in:
                 return integration
@@ -381,12 +586,14 @@ class Integration:
         pkg_path: str,
         file_path: pathlib.Path,
         manifest: Manifest,
+        modules: set[str] | None = None,
     ) -> None:
         """Initialize an integration."""
         self.hass = hass
         self.pkg_path = pkg_path
         self.file_path = file_path
         self.manifest = manifest
+        self._modules = modules
         manifest["is_built_in"] = self.is_built_in
 
         if self.dependencies:
@@ -550,7 +757,7 @@ class Integration:
             return cache[self.domain]
 
         try:
-            cache[self.domain] = importlib.import_module(self.pkg_path)
+            cache[self.domain] = self._import_module(self.pkg_path, self.domain)
         except ImportError:
             raise
         except Exception as err:
@@ -584,9 +791,57 @@ class Integration:
 
         return cache[full_name]
 
+    def platform_exists(self, platform_name: str) -> bool:
+        """Return if the integration has a module for the platform."""
+        if self._modules is not None:
+            return platform_name in self._modules
+        return (self.file_path / f"{platform_name}.py").is_file() or (
+            self.file_path / platform_name
+        ).is_dir()
+
     def _import_platform(self, platform_name: str) -> ModuleType:
         """Import the platform."""
-        return importlib.import_module(f"{self.pkg_path}.{platform_name}")
+        name = f"{self.pkg_path}.{platform_name}"
+        # Avoid searching for the module when the integration has no file for it
+        if (
+            self._modules is not None
+            and platform_name not in self._modules
+            and name not in sys.modules
+        ):
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+        return self._import_module(name, f"{self.domain}.{platform_name}")
+
+    def _import_module(self, name: str, key: str) -> ModuleType:
+        """Import a module of the integration and record how long it took."""
+        imported = name in sys.modules
+        start = time.monotonic()
+        module = importlib.import_module(name)
+        if not imported:
+            import_time = self.hass.data.setdefault(DATA_IMPORT_TIME, {})
+            import_time.setdefault(self.domain, {})[key] = time.monotonic() - start
+        return module
+
+    def preimport(self, platform_names: Iterable[str]) -> bool:
+        """Import the integration and the platforms it has out of the given ones.
+
+        Only imports into sys.modules, the component and platform caches are
+        filled when the setup gets them. Returns False without importing
+        anything if a requirement is not installed yet, the setup imports
+        the integration once it installed the requirements.
+        """
+        if not all(pkg_util.is_installed(req) for req in self.requirements):
+            return False
+        self._import_module(self.pkg_path, self.domain)
+        for platform_name in platform_names:
+            if self.platform_exists(platform_name):
+                self._import_platform(platform_name)
+        return True
+
+    async def async_wait_preimport(self) -> None:
+        """Wait until the import started ahead of setup finished."""
+        tasks: dict[str, asyncio.Task] = self.hass.data.get(DATA_PREIMPORT, {})
+        if (task := tasks.get(self.domain)) is not None and not task.done():
+            await asyncio.shield(task)
 
     def __repr__(self) -> str:
         """Text representation of class."""
@@ -648,6 +903,55 @@ async def _async_get_integration(hass: HomeAssistant, domain: str) -> Integratio
     raise IntegrationNotFound(domain)
 
 
+def async_preimport_integrations(
+    hass: HomeAssistant,
+    integrations: Iterable[Integration],
+    platform_names: Iterable[str],
+) -> None:
+    """Import integrations and their platforms in the executor ahead of setup.
+
+    An integration is imported once the integrations it depends on are, so
+    independent integrations are imported in parallel. Integrations with
+    requirements which are not installed yet, and the integrations depending
+    on them, are left for the setup to import after it installed them. Errors
+    are left for the setup of the integration to report.
+    """
+    tasks: dict[str, asyncio.Task] = hass.data.setdefault(DATA_PREIMPORT, {})
+    platform_names = list(platform_names)
+    semaphore = asyncio.Semaphore(MAX_IMPORT_CONCURRENTLY)
+
+    async def _async_preimport(integration: Integration) -> bool:
+        if integration.all_dependencies_resolved and (
+            dependencies := [
+                tasks[domain] for domain in integration.dependencies if domain in tasks
+            ]
+        ):
+            await asyncio.wait(dependencies)
+            if not all(task.result() for task in dependencies):
+                return False
+        try:
+            async with semaphore:
+                return await hass.async_add_executor_job(
+                    integration.preimport, platform_names
+                )
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.debug(
+                "Unable to import %s ahead of setup", integration.domain, exc_info=True
+            )
+            return False
+
+    for integration in integrations:
+        if integration.domain not in tasks:
+            tasks[integration.domain] = hass.async_create_task(
+                _async_preimport(integration)
+            )
+
+
+def async_get_import_times(hass: HomeAssistant) -> dict[str, dict[str, float]]:
+    """Return how long importing the modules of each integration took."""
+    return cast(dict[str, dict[str, float]], hass.data.get(DATA_IMPORT_TIME, {}))
+
+
 class LoaderError(Exception):
     """Loader base error."""
 
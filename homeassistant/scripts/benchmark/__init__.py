@@ -6,9 +6,11 @@ import asyncio
 import collections
 from collections.abc import Callable
 from contextlib import suppress
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import logging
+import os
+import tempfile
 from timeit import default_timer as timer
 from typing import TypeVar
 
@@ -24,6 +26,8 @@ from homeassistant.util import dt as dt_util
 
 CALLABLE_T = TypeVar("CALLABLE_T", bound=Callable)  # pylint: disable=invalid-name
 
+_LOGGER = logging.getLogger(__name__)
+
 BENCHMARKS: dict[str, Callable] = {}
 
 
@@ -119,6 +123,60 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_filtered_listeners(hass):
+    """Fire 10k events to 10k listeners, each filtering for one entity."""
+    return await _fire_events_entity_listeners(hass, False, 10 ** 4)
+
+
+@benchmark
+async def fire_events_indexed_listeners(hass):
+    """Fire 100k events to 10k listeners, each indexed by one entity."""
+    return await _fire_events_entity_listeners(hass, True, 10 ** 5)
+
+
+async def _fire_events_entity_listeners(hass, indexed, events_to_fire):
+    count = 0
+    event_name = "benchmark_event"
+    listeners = 10 ** 4
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    def entity_filter(entity_id):
+        @core.callback
+        def event_filter(event):
+            """Filter event."""
+            return event.data["entity_id"] == entity_id
+
+        return event_filter
+
+    entity_ids = [f"sensor.benchmark_{idx}" for idx in range(listeners)]
+    for entity_id in entity_ids:
+        if indexed:
+            hass.bus.async_listen_indexed(
+                event_name, "entity_id", [entity_id], listener
+            )
+        else:
+            hass.bus.async_listen(
+                event_name, listener, event_filter=entity_filter(entity_id)
+            )
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.bus.async_fire(event_name, {"entity_id": entity_ids[idx % listeners]})
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire
+
+    return timer() - start
+
+
 @benchmark
 async def time_changed_helper(hass):
     """Run a million events through time changed helper."""
@@ -304,6 +362,97 @@ async def _logbook_filtering(hass, last_changed, last_updated):
     return timer() - start
 
 
+def _create_registries(hass):
+    """Create registries with 8k entities and 1k devices in 50 areas."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import (
+        area_registry as ar,
+        device_registry as dr,
+        entity_registry as er,
+    )
+
+    area_reg = hass.data[ar.DATA_REGISTRY] = ar.AreaRegistry(hass)
+    dev_reg = hass.data[dr.DATA_REGISTRY] = dr.DeviceRegistry(hass)
+    dev_reg.devices = {}
+    dev_reg.deleted_devices = {}
+    ent_reg = hass.data[er.DATA_REGISTRY] = er.EntityRegistry(hass)
+    ent_reg.entities = er.EntityRegistryItems()
+
+    config_entry_ids = [f"config_entry_{idx}" for idx in range(20)]
+    area_ids = [f"area_{idx}" for idx in range(50)]
+    device_ids = [f"device_{idx}" for idx in range(1000)]
+
+    for area_id in area_ids:
+        area_reg.areas[area_id] = ar.AreaEntry(
+            name=area_id, normalized_name=area_id, id=area_id
+        )
+    for idx, device_id in enumerate(device_ids):
+        dev_reg._add_device(  # pylint: disable=protected-access
+            dr.DeviceEntry(
+                id=device_id,
+                area_id=area_ids[idx % len(area_ids)],
+                config_entries={config_entry_ids[idx % len(config_entry_ids)]},
+            )
+        )
+    for idx in range(8000):
+        entity_id = f"sensor.benchmark_{idx}"
+        device_idx = idx % len(device_ids)
+        ent_reg.entities[entity_id] = er.RegistryEntry(
+            entity_id=entity_id,
+            unique_id=str(idx),
+            platform="benchmark",
+            device_id=device_ids[device_idx],
+            area_id=area_ids[idx % len(area_ids)] if idx % 4 == 0 else None,
+            config_entry_id=config_entry_ids[device_idx % len(config_entry_ids)],
+        )
+
+    return dev_reg, ent_reg, area_ids, device_ids, config_entry_ids
+
+
+@benchmark
+async def registry_lookups(hass):
+    """Look up 8k entities and 1k devices by device, area and config entry."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    dev_reg, ent_reg, area_ids, device_ids, config_entry_ids = _create_registries(hass)
+
+    start = timer()
+
+    for area_id in area_ids:
+        dr.async_entries_for_area(dev_reg, area_id)
+        er.async_entries_for_area(ent_reg, area_id)
+
+    for config_entry_id in config_entry_ids:
+        dr.async_entries_for_config_entry(dev_reg, config_entry_id)
+        er.async_entries_for_config_entry(ent_reg, config_entry_id)
+
+    for device_id in device_ids:
+        er.async_entries_for_device(ent_reg, device_id)
+
+    return timer() - start
+
+
+@benchmark
+async def extract_area_targets(hass):
+    """Resolve 10k service calls targeting areas with 8k entities."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.helpers.service import async_extract_referenced_entity_ids
+
+    _, _, area_ids, _, _ = _create_registries(hass)
+    calls = [
+        core.ServiceCall("light", "turn_on", {"area_id": area_id})
+        for area_id in area_ids
+    ]
+
+    start = timer()
+
+    for idx in range(10 ** 4):
+        async_extract_referenced_entity_ids(hass, calls[idx % len(calls)], False)
+
+    return timer() - start
+
+
 @benchmark
 async def filtering_entity_id(hass):
     """Run a 100k state changes through entity filter."""
@@ -391,6 +540,503 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def json_serialize_state_changed_events(hass):
+    """Serialize 100k state changed event messages with the websocket serializer."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api.messages import (
+        IDEN_TEMPLATE,
+        event_message,
+        message_to_json,
+    )
+
+    time_fired = dt_util.utcnow()
+    events = []
+    for idx in range(10 ** 5):
+        old_state = core.State(
+            "light.kitchen",
+            "off",
+            {"friendly_name": "Kitchen Lights", "brightness": idx},
+            last_changed=time_fired,
+            last_updated=time_fired,
+        )
+        new_state = core.State(
+            "light.kitchen",
+            "on",
+            {"friendly_name": "Kitchen Lights", "brightness": idx + 1},
+            last_changed=time_fired,
+            last_updated=time_fired,
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": "light.kitchen",
+                    "old_state": old_state,
+                    "new_state": new_state,
+                },
+                time_fired=time_fired,
+            )
+        )
+
+    start = timer()
+    for event in events:
+        message_to_json(event_message(IDEN_TEMPLATE, event))
+    return timer() - start
+
+
+@benchmark
+async def recorder_state_changed(hass):
+    """Replay 100k state changes through the recorder ORM write path."""
+    return await _recorder_state_changed(hass, bulk_insert=False)
+
+
+@benchmark
+async def recorder_state_changed_bulk_insert(hass):
+    """Replay 100k state changes through the recorder bulk insert write path."""
+    return await _recorder_state_changed(hass, bulk_insert=True)
+
+
+async def _recorder_state_changed(hass, bulk_insert):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        bulk_insert=bulk_insert,
+        purge_chunk_size=None,
+    )
+    events = []
+    time_fired = dt_util.utcnow()
+    for idx in range(10 ** 5):
+        entity_id = f"sensor.benchmark_{idx % 1000}"
+        state = core.State(
+            entity_id,
+            str(idx % 7),
+            {"unit_of_measurement": "W", "friendly_name": entity_id},
+            last_changed=time_fired,
+            last_updated=time_fired,
+        )
+        events.append(
+            core.Event(
+                EVENT_STATE_CHANGED,
+                {"entity_id": entity_id, "old_state": None, "new_state": state},
+                time_fired=time_fired,
+            )
+        )
+
+    def _replay():
+        instance._setup_connection()
+        instance._setup_run()
+        start = timer()
+        for idx, event in enumerate(events):
+            instance._process_one_event(event)
+            # A busy instance commits every second
+            if idx % 1000 == 999:
+                instance._commit_event_session_or_retry()
+        instance._commit_event_session_or_retry()
+        elapsed = timer() - start
+        instance._close_event_session()
+        instance._close_connection()
+        return elapsed
+
+    return await hass.async_add_executor_job(_replay)
+
+
+@benchmark
+async def recorder_purge(hass):
+    """Purge 1M of 2M events and states from a SQLite database in batches."""
+    return await _recorder_purge(hass, purge_chunk_size=None)
+
+
+@benchmark
+async def recorder_purge_chunked(hass):
+    """Purge 1M of 2M events and states from a SQLite database in chunks."""
+    return await _recorder_purge(hass, purge_chunk_size=10000)
+
+
+async def _recorder_purge(hass, purge_chunk_size):
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import purge
+    from homeassistant.components.recorder.models import (
+        Events,
+        StateAttributes,
+        States,
+    )
+
+    rows = 2 * 10 ** 6
+    entities = 1000
+    batch_size = 10000
+
+    def _generate(instance):
+        """Generate a row for each second of events and states."""
+        first_time_fired = dt_util.utcnow() - timedelta(seconds=rows + 60)
+        with instance.engine.begin() as connection:
+            connection.execute(
+                StateAttributes.__table__.insert(),
+                [
+                    {
+                        "attributes_id": idx + 1,
+                        "hash": idx,
+                        "shared_attrs": f'{{"friendly_name":"Benchmark {idx}"}}',
+                    }
+                    for idx in range(entities)
+                ],
+            )
+            for start in range(0, rows, batch_size):
+                events = []
+                states = []
+                for idx in range(start, start + batch_size):
+                    time_fired = first_time_fired + timedelta(seconds=idx)
+                    events.append(
+                        {
+                            "event_id": idx + 1,
+                            "event_type": EVENT_STATE_CHANGED,
+                            "event_data": "{}",
+                            "origin": "LOCAL",
+                            "time_fired": time_fired,
+                        }
+                    )
+                    states.append(
+                        {
+                            "state_id": idx + 1,
+                            "entity_id": f"sensor.benchmark_{idx % entities}",
+                            "domain": "sensor",
+                            "state": str(idx % 7),
+                            "event_id": idx + 1,
+                            "last_changed": time_fired,
+                            "last_updated": time_fired,
+                            "old_state_id": idx + 1 - entities
+                            if idx >= entities
+                            else None,
+                            "attributes_id": idx % entities + 1,
+                        }
+                    )
+                connection.execute(Events.__table__.insert(), events)
+                connection.execute(States.__table__.insert(), states)
+        return first_time_fired + timedelta(seconds=rows // 2)
+
+    def _purge(instance):
+        instance._setup_connection()
+        instance._setup_run()
+        purge_before = _generate(instance)
+        start = timer()
+        while not purge.purge_old_data(instance, purge_before, repack=False):
+            pass
+        elapsed = timer() - start
+        _LOGGER.info("Purge metrics: %s", instance.purge_metrics.as_dict())
+        instance._close_connection()
+        return elapsed
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        instance = recorder.Recorder(
+            hass,
+            auto_purge=False,
+            keep_days=1,
+            commit_interval=1,
+            uri=f"sqlite:///{os.path.join(tmpdir, 'benchmark.db')}",
+            db_max_retries=1,
+            db_retry_wait=0,
+            entity_filter=lambda entity_id: True,
+            exclude_t=[],
+            bulk_insert=False,
+            purge_chunk_size=purge_chunk_size,
+        )
+        return await hass.async_add_executor_job(_purge, instance)
+
+
+@benchmark
+async def sensor_compile_statistics(hass):
+    """Compile 5 minute statistics for 5k sensors with 10 states each."""
+    # pylint: disable=import-outside-toplevel,protected-access
+    from homeassistant.components import recorder
+    from homeassistant.components.recorder import history, statistics
+    from homeassistant.components.recorder.const import DATA_INSTANCE
+    from homeassistant.components.recorder.models import (
+        StateAttributes,
+        States,
+        StatisticsMeta,
+        StatisticsShortTerm,
+    )
+    from homeassistant.components.sensor import recorder as sensor_recorder
+
+    sensors = 5000
+    states_per_sensor = 10
+    end = dt_util.utcnow().replace(second=0, microsecond=0)
+    end -= timedelta(minutes=end.minute % 5)
+    start = end - timedelta(minutes=5)
+
+    attributes = {}
+    for idx in range(sensors):
+        entity_id = f"sensor.benchmark_{idx}"
+        if idx % 5:
+            attributes[entity_id] = {
+                "device_class": "power",
+                "state_class": "measurement",
+                "unit_of_measurement": "W",
+            }
+        else:
+            attributes[entity_id] = {
+                "device_class": "energy",
+                "state_class": "total_increasing",
+                "unit_of_measurement": "kWh",
+            }
+
+    def _generate(instance):
+        """Generate the history of the sensors and their previous statistics."""
+        with instance.engine.begin() as connection:
+            connection.execute(
+                StateAttributes.__table__.insert(),
+                [
+                    {
+                        "attributes_id": idx + 1,
+                        "hash": idx,
+                        "shared_attrs": json.dumps(attributes[entity_id]),
+                    }
+                    for idx, entity_id in enumerate(attributes)
+                ],
+            )
+            states = []
+            for step in range(states_per_sensor):
+                last_updated = start + timedelta(seconds=step * 30)
+                for idx, entity_id in enumerate(attributes):
+                    states.append(
+                        {
+                            "entity_id": entity_id,
+                            "domain": "sensor",
+                            "state": str(idx + step if idx % 5 else idx * 10 + step),
+                            "last_changed": last_updated,
+                            "last_updated": last_updated,
+                            "attributes_id": idx + 1,
+                        }
+                    )
+            connection.execute(States.__table__.insert(), states)
+            total_increasing = [
+                entity_id for idx, entity_id in enumerate(attributes) if not idx % 5
+            ]
+            connection.execute(
+                StatisticsMeta.__table__.insert(),
+                [
+                    {
+                        "id": idx + 1,
+                        "statistic_id": entity_id,
+                        "source": "recorder",
+                        "unit_of_measurement": "kWh",
+                        "has_mean": False,
+                        "has_sum": True,
+                    }
+                    for idx, entity_id in enumerate(total_increasing)
+                ],
+            )
+            connection.execute(
+                StatisticsShortTerm.__table__.insert(),
+                [
+                    {
+                        "metadata_id": idx + 1,
+                        "created": start,
+                        "start": start - timedelta(minutes=5),
+                        "state": 0.0,
+                        "sum": 0.0,
+                    }
+                    for idx in range(len(total_increasing))
+                ],
+            )
+
+    def _compile(instance):
+        instance._setup_connection()
+        instance._setup_run()
+        _generate(instance)
+        timing = timer()
+        result = sensor_recorder.compile_statistics(hass, start, end)
+        elapsed = timer() - timing
+        assert len(result) == sensors
+        instance._close_connection()
+        return elapsed
+
+    instance = recorder.Recorder(
+        hass,
+        auto_purge=False,
+        keep_days=1,
+        commit_interval=1,
+        uri="sqlite://",
+        db_max_retries=1,
+        db_retry_wait=0,
+        entity_filter=lambda entity_id: True,
+        exclude_t=[],
+        bulk_insert=False,
+        purge_chunk_size=None,
+    )
+    hass.data[DATA_INSTANCE] = instance
+    history.async_setup(hass)
+    statistics.async_setup(hass)
+    for idx, entity_id in enumerate(attributes):
+        hass.states.async_set(
+            entity_id, str(idx + states_per_sensor - 1), attributes[entity_id]
+        )
+    return await hass.async_add_executor_job(_compile, instance)
+
+
+@benchmark
+async def websocket_subscribe_events_state_changed(hass):
+    """Send 10k state changes to 50 clients subscribed to all state changes."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import commands
+
+    return await _websocket_state_changed(
+        hass,
+        commands.handle_subscribe_events,
+        lambda client: {"event_type": EVENT_STATE_CHANGED},
+    )
+
+
+@benchmark
+async def websocket_subscribe_entities(hass):
+    """Send 10k state changes to 50 clients subscribed to 20 entities each."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import commands
+
+    return await _websocket_state_changed(
+        hass,
+        commands.handle_subscribe_entities,
+        lambda client: {
+            "entity_ids": [
+                f"sensor.benchmark_{client * 20 + offset}" for offset in range(20)
+            ]
+        },
+    )
+
+
+async def _websocket_state_changed(hass, handler, subscription):
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth import models as auth_models
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+
+    clients = 50
+    entities = 1000
+    events = 10 ** 4
+    user = auth_models.User(
+        name="Benchmark", perm_lookup=None, is_owner=True, is_active=True
+    )
+    refresh_token = auth_models.RefreshToken(
+        user=user, client_id=None, access_token_expiration=timedelta(minutes=30)
+    )
+    sent = 0
+
+    def send_message(message):
+        nonlocal sent
+        sent += 1
+
+    for idx in range(entities):
+        hass.states.async_set(f"sensor.benchmark_{idx}", "0")
+
+    # pylint: disable=protected-access
+    for client in range(clients):
+        connection = ActiveConnection(
+            logging.getLogger(__name__), hass, send_message, user, refresh_token
+        )
+        msg = handler._ws_schema(
+            {"id": 1, "type": handler._ws_command, **subscription(client)}
+        )
+        handler(hass, connection, msg)
+
+    sent = 0
+    start = timer()
+    for idx in range(events):
+        hass.states.async_set(f"sensor.benchmark_{idx % entities}", str(idx))
+    await hass.async_block_till_done()
+    elapsed = timer() - start
+    _LOGGER.info("%s messages sent", sent)
+    return elapsed
+
+
+@benchmark
+async def sensor_write_state(hass):
+    """Write the state of 100 sensors 10k times, two thirds of them unchanged."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.sensor import SensorEntity
+
+    class BenchmarkSensor(SensorEntity):
+        """Sensor measuring the power of a benchmark device."""
+
+        _attr_device_class = "power"
+        _attr_native_unit_of_measurement = "W"
+        _attr_should_poll = False
+        _attr_state_class = "measurement"
+
+    sensors = []
+    for idx in range(100):
+        sensor = BenchmarkSensor()
+        sensor.hass = hass
+        sensor.entity_id = f"sensor.benchmark_{idx}"
+        sensor._attr_name = f"Benchmark {idx}"  # pylint: disable=protected-access
+        sensors.append(sensor)
+
+    writes = 10 ** 4
+    start = timer()
+    for idx in range(writes):
+        sensor = sensors[idx % 100]
+        sensor._attr_native_value = idx // 300  # pylint: disable=protected-access
+        sensor.async_write_ha_state()
+    return timer() - start
+
+
+@benchmark
+async def websocket_get_states(hass):
+    """Send the 6k states to 100 clients reconnecting, 100 states change between."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth import models as auth_models
+    from homeassistant.components.websocket_api import commands
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+    from homeassistant.components.websocket_api.messages import message_to_json
+
+    clients = 100
+    entities = 6000
+    user = auth_models.User(
+        name="Benchmark", perm_lookup=None, is_owner=True, is_active=True
+    )
+    refresh_token = auth_models.RefreshToken(
+        user=user, client_id=None, access_token_expiration=timedelta(minutes=30)
+    )
+    size = 0
+
+    def send_message(message):
+        nonlocal size
+        if not isinstance(message, str):
+            message = message_to_json(message)
+        size += len(message)
+
+    attributes = {
+        "unit_of_measurement": "W",
+        "device_class": "power",
+        "friendly_name": "Benchmark sensor",
+    }
+    for idx in range(entities):
+        hass.states.async_set(f"sensor.benchmark_{idx}", "0", attributes)
+
+    connection = ActiveConnection(
+        logging.getLogger(__name__), hass, send_message, user, refresh_token
+    )
+    start = timer()
+    for client in range(clients):
+        for idx in range(100):
+            hass.states.async_set(
+                f"sensor.benchmark_{client * 100 + idx}", str(client), attributes
+            )
+        commands.handle_get_states(hass, connection, {"id": client + 1})
+    elapsed = timer() - start
+    _LOGGER.info("%s bytes per client", size // clients)
+    return elapsed
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -413,6 +1059,7 @@ def _create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -421,6 +1068,7 @@ def _create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
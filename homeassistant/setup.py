@@ -178,6 +178,7 @@ async def _async_setup_component(
 
     # Some integrations fail on import because they call functions incorrectly.
     # So we do it before validating config to catch these errors.
+    await integration.async_wait_preimport()
     try:
         component = integration.get_component()
     except ImportError as err:
@@ -303,6 +304,7 @@ async def async_prepare_setup_platform(
         log_error(str(err))
         return None
 
+    await integration.async_wait_preimport()
     try:
         platform = integration.get_platform(domain)
     except ImportError as exc:
@@ -52,15 +52,35 @@ def write_utf8_file(
 
     Writes all or nothing.
     """
+    _write_file(filename, utf8_data, private)
 
+
+def write_bytes_file(
+    filename: str,
+    data: bytes,
+    private: bool = False,
+) -> None:
+    """Write a binary file and rename it into place.
+
+    Writes all or nothing.
+    """
+    _write_file(filename, data, private)
+
+
+def _write_file(filename: str, data: str | bytes, private: bool) -> None:
+    """Write text or binary data to a temporary file and rename it into place."""
     tmp_filename = ""
     tmp_path = os.path.split(filename)[0]
     try:
         # Modern versions of Python tempfile create this file with mode 0o600
-        with tempfile.NamedTemporaryFile(
-            mode="w", encoding="utf-8", dir=tmp_path, delete=False
+        with (
+            tempfile.NamedTemporaryFile(mode="wb", dir=tmp_path, delete=False)
+            if isinstance(data, bytes)
+            else tempfile.NamedTemporaryFile(
+                mode="w", encoding="utf-8", dir=tmp_path, delete=False
+            )
         ) as fdesc:
-            fdesc.write(utf8_data)
+            fdesc.write(data)
             tmp_filename = fdesc.name
             if not private:
                 os.fchmod(fdesc.fileno(), 0o644)
@@ -2,15 +2,26 @@
 from __future__ import annotations
 
 from collections import OrderedDict
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 import fnmatch
+from io import StringIO
 import logging
 import os
 from pathlib import Path
+import pickle
+import threading
 from typing import Any, TextIO, TypeVar, Union, overload
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as FastestAvailableSafeLoader
+
+    HAS_C_LOADER = True
+except ImportError:
+    HAS_C_LOADER = False
+    from yaml import SafeLoader as FastestAvailableSafeLoader  # type: ignore[misc]
+
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import SECRET_YAML
@@ -88,6 +99,28 @@ class Secrets:
         return secrets
 
 
+class FastSafeLoader(FastestAvailableSafeLoader):
+    """Loader class using libyaml when available.
+
+    libyaml does not expose the stream and its name, they are kept here so
+    included files and references resolve like with the Python loader.
+    """
+
+    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+        """Initialize a fast safe loader."""
+        super().__init__(stream)
+        if isinstance(stream, str):
+            self.name = "<unicode string>"
+            self.stream = None
+        elif isinstance(stream, bytes):
+            self.name = "<byte string>"
+            self.stream = None
+        else:
+            self.name = getattr(stream, "name", "<file>")
+            self.stream = stream
+        self.secrets = secrets
+
+
 class SafeLineLoader(yaml.SafeLoader):
     """Loader class that keeps track of line numbers."""
 
@@ -104,21 +137,148 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
-def load_yaml(fname: str, secrets: Secrets | None = None) -> JSON_TYPE:
-    """Load a YAML file."""
+LoaderType = Union[FastSafeLoader, SafeLineLoader]
+
+
+class _Dependencies:
+    """What the result of loading a YAML file depends on."""
+
+    __slots__ = ("files", "directories", "secrets", "env_vars")
+
+    def __init__(self) -> None:
+        """Initialize the dependencies."""
+        self.files: dict[str, str] = {}
+        self.directories: dict[tuple[str, str], list[str]] = {}
+        self.secrets: dict[tuple[str, str], str] = {}
+        self.env_vars: dict[str, str] = {}
+
+    def update(self, other: _Dependencies) -> None:
+        """Add the dependencies of an included file."""
+        self.files.update(other.files)
+        self.directories.update(other.directories)
+        self.secrets.update(other.secrets)
+        self.env_vars.update(other.env_vars)
+
+    def unchanged(self, secrets: Secrets | None) -> bool:
+        """Return if the files, secrets and environment variables are unchanged."""
+        for fname, content in self.files.items():
+            try:
+                if _read_file(fname) != content:
+                    return False
+            except (OSError, HomeAssistantError):
+                return False
+        for (directory, pattern), files in self.directories.items():
+            if list(_find_files(directory, pattern)) != files:
+                return False
+        if self.secrets:
+            if secrets is None:
+                return False
+            try:
+                for (requester, secret), value in self.secrets.items():
+                    if secrets.get(requester, secret) != value:
+                        return False
+            except HomeAssistantError:
+                return False
+        for env_var, value in self.env_vars.items():
+            try:
+                if _get_env_var(env_var) != value:
+                    return False
+            except HomeAssistantError:
+                return False
+        return True
+
+
+class _ParsedFile:
+    """The result of loading a YAML file."""
+
+    __slots__ = ("dependencies", "data")
+
+    def __init__(self, dependencies: _Dependencies, data: bytes) -> None:
+        """Initialize the parsed file."""
+        self.dependencies = dependencies
+        self.data = data
+
+
+# The parsed files are reused as long as the content of the files they are
+# made of, the secrets and the environment variables they use are unchanged
+_PARSED_FILES: dict[str, _ParsedFile] = {}
+_LOADING = threading.local()
+
+
+def _loading() -> list[_Dependencies]:
+    """Return the dependencies of the files being loaded by this thread."""
+    if (loading := getattr(_LOADING, "stack", None)) is None:
+        loading = _LOADING.stack = []
+    return loading
+
+
+def _read_file(fname: str) -> str:
+    """Read a YAML file."""
     try:
         with open(fname, encoding="utf-8") as conf_file:
-            return parse_yaml(conf_file, secrets)
+            return conf_file.read()
     except UnicodeDecodeError as exc:
         _LOGGER.error("Unable to read file %s: %s", fname, exc)
         raise HomeAssistantError(exc) from exc
 
 
+def load_yaml(fname: str, secrets: Secrets | None = None) -> JSON_TYPE:
+    """Load a YAML file.
+
+    The file is only parsed again when it, the files it includes or the
+    secrets and environment variables it uses changed since it was loaded.
+    """
+    loading = _loading()
+    content = _read_file(fname)
+
+    if (parsed := _PARSED_FILES.get(fname)) is not None and (
+        parsed.dependencies.files.get(fname) == content
+        and parsed.dependencies.unchanged(secrets)
+    ):
+        if loading:
+            loading[-1].update(parsed.dependencies)
+        return pickle.loads(parsed.data)  # type: ignore[no-any-return]
+
+    dependencies = _Dependencies()
+    dependencies.files[fname] = content
+    loading.append(dependencies)
+    try:
+        stream = StringIO(content)
+        stream.name = fname
+        result = parse_yaml(stream, secrets)
+    finally:
+        loading.pop()
+    if loading:
+        loading[-1].update(dependencies)
+
+    try:
+        _PARSED_FILES[fname] = _ParsedFile(dependencies, pickle.dumps(result))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        _PARSED_FILES.pop(fname, None)
+    return result
+
+
+def _load_yaml(fname: str, secrets: Secrets | None = None) -> JSON_TYPE:
+    """Load a YAML file without reusing the result of an earlier load."""
+    stream = StringIO(_read_file(fname))
+    stream.name = fname
+    return parse_yaml(stream, secrets)
+
+
 def parse_yaml(content: str | TextIO, secrets: Secrets | None = None) -> JSON_TYPE:
     """Load a YAML file."""
     try:
         # If configuration file is empty YAML returns None
         # We convert that to an empty dict
+        return (
+            yaml.load(content, Loader=lambda stream: FastSafeLoader(stream, secrets))
+            or OrderedDict()
+        )
+    except yaml.YAMLError:
+        # Parse again with the Python loader, its errors quote the line
+        if not isinstance(content, str):
+            content.seek(0)
+    try:
         return (
             yaml.load(content, Loader=lambda stream: SafeLineLoader(stream, secrets))
             or OrderedDict()
@@ -130,26 +290,24 @@ def parse_yaml(content: str | TextIO, secrets: Secrets | None = None) -> JSON_TY
 
 @overload
 def _add_reference(
-    obj: list | NodeListClass, loader: SafeLineLoader, node: yaml.nodes.Node
+    obj: list | NodeListClass, loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeListClass:
     ...
 
 
 @overload
 def _add_reference(
-    obj: str | NodeStrClass, loader: SafeLineLoader, node: yaml.nodes.Node
+    obj: str | NodeStrClass, loader: LoaderType, node: yaml.nodes.Node
 ) -> NodeStrClass:
     ...
 
 
 @overload
-def _add_reference(
-    obj: DICT_T, loader: SafeLineLoader, node: yaml.nodes.Node
-) -> DICT_T:
+def _add_reference(obj: DICT_T, loader: LoaderType, node: yaml.nodes.Node) -> DICT_T:
     ...
 
 
-def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type: ignore
+def _add_reference(obj, loader: LoaderType, node: yaml.nodes.Node):  # type: ignore
     """Add file reference information to an object."""
     if isinstance(obj, list):
         obj = NodeListClass(obj)
@@ -160,7 +318,7 @@ def _add_reference(obj, loader: SafeLineLoader, node: yaml.nodes.Node):  # type:
     return obj
 
 
-def _include_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load another YAML file and embeds it using the !include tag.
 
     Example:
@@ -191,13 +349,19 @@ def _find_files(directory: str, pattern: str) -> Iterator[str]:
                 yield filename
 
 
-def _include_dir_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
-) -> OrderedDict:
+def _find_included_files(directory: str) -> list[str]:
+    """Return the YAML files in a directory and remember them for the cache."""
+    files = list(_find_files(directory, "*.yaml"))
+    if loading := _loading():
+        loading[-1].directories[(directory, "*.yaml")] = files
+    return files
+
+
+def _include_dir_named_yaml(loader: LoaderType, node: yaml.nodes.Node) -> OrderedDict:
     """Load multiple files from directory as a dictionary."""
     mapping: OrderedDict = OrderedDict()
     loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loc):
         filename = os.path.splitext(os.path.basename(fname))[0]
         if os.path.basename(fname) == SECRET_YAML:
             continue
@@ -206,12 +370,12 @@ def _include_dir_named_yaml(
 
 
 def _include_dir_merge_named_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> OrderedDict:
     """Load multiple files from directory as a merged dictionary."""
     mapping: OrderedDict = OrderedDict()
     loc = os.path.join(os.path.dirname(loader.name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname, loader.secrets)
@@ -221,24 +385,24 @@ def _include_dir_merge_named_yaml(
 
 
 def _include_dir_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> list[JSON_TYPE]:
     """Load multiple files from directory as a list."""
     loc = os.path.join(os.path.dirname(loader.name), node.value)
     return [
         load_yaml(f, loader.secrets)
-        for f in _find_files(loc, "*.yaml")
+        for f in _find_included_files(loc)
         if os.path.basename(f) != SECRET_YAML
     ]
 
 
 def _include_dir_merge_list_yaml(
-    loader: SafeLineLoader, node: yaml.nodes.Node
+    loader: LoaderType, node: yaml.nodes.Node
 ) -> JSON_TYPE:
     """Load multiple files from directory as a merged list."""
     loc: str = os.path.join(os.path.dirname(loader.name), node.value)
     merged_list: list[JSON_TYPE] = []
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
         loaded_yaml = load_yaml(fname, loader.secrets)
@@ -247,7 +411,7 @@ def _include_dir_merge_list_yaml(
     return _add_reference(merged_list, loader, node)
 
 
-def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> OrderedDict:
+def _ordered_dict(loader: LoaderType, node: yaml.nodes.MappingNode) -> OrderedDict:
     """Load YAML mappings into an ordered dictionary to preserve key order."""
     loader.flatten_mapping(node)
     nodes = loader.construct_pairs(node)
@@ -279,46 +443,57 @@ def _ordered_dict(loader: SafeLineLoader, node: yaml.nodes.MappingNode) -> Order
     return _add_reference(OrderedDict(nodes), loader, node)
 
 
-def _construct_seq(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _construct_seq(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Add line number and file name to Load YAML sequence."""
     (obj,) = loader.construct_yaml_seq(node)
     return _add_reference(obj, loader, node)
 
 
-def _env_var_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> str:
-    """Load environment variables and embed it into the configuration YAML."""
-    args = node.value.split()
+def _get_env_var(value: str) -> str:
+    """Return the environment variable or the default of an !env_var tag."""
+    args = value.split()
 
     # Check for a default value
     if len(args) > 1:
         return os.getenv(args[0], " ".join(args[1:]))
     if args[0] in os.environ:
         return os.environ[args[0]]
-    _LOGGER.error("Environment variable %s not defined", node.value)
-    raise HomeAssistantError(node.value)
+    _LOGGER.error("Environment variable %s not defined", value)
+    raise HomeAssistantError(value)
 
 
-def secret_yaml(loader: SafeLineLoader, node: yaml.nodes.Node) -> JSON_TYPE:
+def _env_var_yaml(loader: LoaderType, node: yaml.nodes.Node) -> str:
+    """Load environment variables and embed it into the configuration YAML."""
+    env_var = _get_env_var(node.value)
+    if loading := _loading():
+        loading[-1].env_vars[node.value] = env_var
+    return env_var
+
+
+def secret_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """Load secrets and embed it into the configuration YAML."""
     if loader.secrets is None:
         raise HomeAssistantError("Secrets not supported in this YAML file")
 
-    return loader.secrets.get(loader.name, node.value)
-
-
-SafeLineLoader.add_constructor("!include", _include_yaml)
-SafeLineLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict
-)
-SafeLineLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq
-)
-SafeLineLoader.add_constructor("!env_var", _env_var_yaml)
-SafeLineLoader.add_constructor("!secret", secret_yaml)
-SafeLineLoader.add_constructor("!include_dir_list", _include_dir_list_yaml)
-SafeLineLoader.add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
-SafeLineLoader.add_constructor("!include_dir_named", _include_dir_named_yaml)
-SafeLineLoader.add_constructor(
-    "!include_dir_merge_named", _include_dir_merge_named_yaml
-)
-SafeLineLoader.add_constructor("!input", Input.from_node)
+    secret = loader.secrets.get(loader.name, node.value)
+    if loading := _loading():
+        loading[-1].secrets[(loader.name, node.value)] = secret
+    return secret
+
+
+def add_constructor(tag: str, constructor: Callable) -> None:
+    """Add a constructor to the fast and the line tracking loader."""
+    FastSafeLoader.add_constructor(tag, constructor)
+    SafeLineLoader.add_constructor(tag, constructor)
+
+
+add_constructor("!include", _include_yaml)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, _ordered_dict)
+add_constructor(yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
+add_constructor("!env_var", _env_var_yaml)
+add_constructor("!secret", secret_yaml)
+add_constructor("!include_dir_list", _include_dir_list_yaml)
+add_constructor("!include_dir_merge_list", _include_dir_merge_list_yaml)
+add_constructor("!include_dir_named", _include_dir_named_yaml)
+add_constructor("!include_dir_merge_named", _include_dir_merge_named_yaml)
+add_constructor("!input", Input.from_node)
@@ -691,6 +691,10 @@ class MockEntityPlatform(entity_platform.EntityPlatform):
         # Otherwise the constructor will blow up.
         if isinstance(platform, Mock) and isinstance(platform.PARALLEL_UPDATES, Mock):
             platform.PARALLEL_UPDATES = 0
+        if isinstance(platform, Mock) and isinstance(
+            platform.STATE_WRITE_INTERVAL, Mock
+        ):
+            platform.STATE_WRITE_INTERVAL = None
 
         super().__init__(
             hass=hass,
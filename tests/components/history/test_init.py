@@ -590,6 +590,37 @@ async def test_fetch_period_api(hass, hass_client):
     assert response.status == HTTPStatus.OK
 
 
+async def test_fetch_period_api_streams_chunks(hass, hass_client):
+    """Test the fetch period view streams the history in chunks."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    for entity_id in ("light.kitchen", "light.cow", "switch.match"):
+        hass.states.async_set(entity_id, "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    with patch("homeassistant.components.history.STREAM_CHUNK_SIZE", 1):
+        response = await client.get(
+            f"/api/history/period/{start.isoformat()}"
+            "?filter_entity_id=switch.match,light.kitchen,light.cow"
+        )
+        assert response.status == HTTPStatus.OK
+        assert response.headers["Transfer-Encoding"] == "chunked"
+        response_json = await response.json()
+
+    assert [states[0]["entity_id"] for states in response_json] == [
+        "switch.match",
+        "light.kitchen",
+        "light.cow",
+    ]
+    assert all(states[0]["state"] == "on" for states in response_json)
+
+
 async def test_fetch_period_api_with_use_include_order(hass, hass_client):
     """Test the fetch period view for history with include order."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -614,6 +645,39 @@ async def test_fetch_period_api_with_minimal_response(hass, hass_client):
     assert response.status == HTTPStatus.OK
 
 
+async def test_fetch_period_api_with_compressed_response(hass, hass_client):
+    """Test the fetch period view for history in the compressed format."""
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    start = dt_util.utcnow()
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 0})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_client()
+    response = await client.get(
+        f"/api/history/period/{start.isoformat()}"
+        "?filter_entity_id=light.kitchen&compressed"
+    )
+    assert response.status == HTTPStatus.OK
+    response_json = await response.json()
+    state_table = response_json["states"]
+    entity = response_json["entities"]["light.kitchen"]
+    assert [state_table[index] for index in entity["s"]] == ["on", "off"]
+    assert len(entity["t"]) == 2
+    assert entity["a"] == {"brightness": 0}
+
+    response = await client.get(
+        f"/api/history/period/{(start + timedelta(days=2)).isoformat()}?compressed"
+    )
+    assert response.status == HTTPStatus.OK
+    assert await response.json() == {"states": [], "entities": {}}
+
+
 async def test_fetch_period_api_with_no_timestamp(hass, hass_client):
     """Test the fetch period view for history with no timestamp."""
     await hass.async_add_executor_job(init_recorder_component, hass)
@@ -922,6 +986,54 @@ async def test_statistics_during_period(
     }
 
 
+async def test_history_during_period(hass, hass_ws_client):
+    """Test history_during_period returns the compressed format."""
+    now = dt_util.utcnow()
+
+    await hass.async_add_executor_job(init_recorder_component, hass)
+    await async_setup_component(hass, "history", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    hass.states.async_set("sensor.test", "1", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.test", "2", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.other", "1")
+    await hass.async_block_till_done()
+
+    await hass.async_add_executor_job(trigger_db_commit, hass)
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "entity_ids": ["sensor.test"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert list(result["entities"]) == ["sensor.test"]
+    entity = result["entities"]["sensor.test"]
+    assert [result["states"][index] for index in entity["s"]] == ["1", "2"]
+    assert entity["t"] == sorted(entity["t"])
+    assert entity["a"] == {"unit_of_measurement": "W"}
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": now.isoformat(),
+            "end_time": "dogs",
+            "entity_ids": ["sensor.test"],
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_end_time"
+
+
 async def test_statistics_during_period_bad_start_time(hass, hass_ws_client):
     """Test statistics_during_period."""
     await hass.async_add_executor_job(init_recorder_component, hass)
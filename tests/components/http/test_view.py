@@ -1,5 +1,6 @@
 """Tests for Home Assistant View."""
 from http import HTTPStatus
+import json
 from unittest.mock import AsyncMock, Mock
 
 from aiohttp.web_exceptions import (
@@ -32,11 +33,19 @@ def mock_request_with_stopping():
 async def test_invalid_json(caplog):
     """Test trying to return invalid JSON."""
     view = HomeAssistantView()
+    data = object()
 
     with pytest.raises(HTTPInternalServerError):
-        view.json(float("NaN"))
+        view.json(data)
 
-    assert str(float("NaN")) in caplog.text
+    assert str(data) in caplog.text
+
+
+async def test_nan_serialized_to_null():
+    """Test NaN is serialized to null."""
+    view = HomeAssistantView()
+    response = view.json(float("NaN"))
+    assert json.loads(response.body) is None
 
 
 async def test_handling_unauthorized(mock_request):
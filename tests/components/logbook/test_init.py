@@ -278,6 +278,7 @@ def create_state_changed_event_from_old_new(
             "entity_id"
             "domain"
             "attributes"
+            "shared_attrs"
             "state_id",
             "old_state_id",
         ],
@@ -286,6 +287,7 @@ def create_state_changed_event_from_old_new(
     row.event_type = EVENT_STATE_CHANGED
     row.event_data = "{}"
     row.attributes = attributes_json
+    row.shared_attrs = attributes_json
     row.time_fired = event_time_fired
     row.state = new_state and new_state.get("state")
     row.entity_id = entity_id
@@ -1864,6 +1866,121 @@ async def test_context_filter(hass, hass_client):
     assert response.status == HTTPStatus.BAD_REQUEST
 
 
+async def test_logbook_view_pages(hass, hass_client):
+    """Test the logbook view returns pages of whole groups of events."""
+    await async_init_recorder_component(hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    context = ha.Context()
+    base = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(
+        hours=2
+    )
+    hass.bus.async_fire(
+        EVENT_CALL_SERVICE,
+        {ATTR_DOMAIN: "light", ATTR_SERVICE: "turn_on"},
+        context=context,
+        time_fired=base,
+    )
+    for minutes in (0, 1, 20, 40, 60):
+        hass.bus.async_fire(
+            logbook.EVENT_LOGBOOK_ENTRY,
+            {
+                logbook.ATTR_NAME: str(minutes),
+                logbook.ATTR_MESSAGE: "message",
+                ATTR_ENTITY_ID: "light.kitchen",
+            },
+            context=context,
+            time_fired=base + timedelta(minutes=minutes),
+        )
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    pages = []
+    params = {"limit": "1"}
+    with patch.object(logbook, "CONTEXT_LOOKUP_CACHE_SIZE", 1):
+        while True:
+            page = await _async_fetch_logbook(client, dict(params))
+            pages.append([entry["name"] for entry in page["entries"]])
+            for entry in page["entries"]:
+                assert entry["context_domain"] == "light"
+                assert entry["context_service"] == "turn_on"
+            if page["cursor"] is None:
+                break
+            params["cursor"] = page["cursor"]
+
+    # Entries in the same group of minutes are never split across pages
+    assert pages == [["0", "1"], ["20"], ["40"], ["60"]]
+
+    for params in ({"limit": "0"}, {"limit": "many"}, {"cursor": base.isoformat()}):
+        response = await client.get("/api/logbook", params=params)
+        assert response.status == HTTPStatus.BAD_REQUEST
+
+
+async def test_logbook_entity_context_lookup_batches(hass, hass_client):
+    """Test contexts are found when looked up in batches of events."""
+    await async_init_recorder_component(hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    contexts = [ha.Context() for _ in range(3)]
+    for context in contexts:
+        hass.bus.async_fire(
+            EVENT_CALL_SERVICE,
+            {ATTR_DOMAIN: "switch", ATTR_SERVICE: "turn_on"},
+            context=context,
+        )
+    for state in (STATE_OFF, STATE_ON):
+        for index, context in enumerate(contexts):
+            hass.states.async_set(f"switch.test_{index}", state, context=context)
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    with patch.object(logbook, "CONTEXT_LOOKUP_BATCH_SIZE", 2):
+        entries = await _async_fetch_logbook(
+            client, {"entity": "switch.test_0,switch.test_1,switch.test_2"}
+        )
+
+    assert len(entries) == 3
+    for index, entry in enumerate(entries):
+        _assert_entry(entry, entity_id=f"switch.test_{index}", state=STATE_ON)
+        assert entry["context_domain"] == "switch"
+        assert entry["context_service"] == "turn_on"
+
+
+async def test_logbook_context_lookup_group_larger_than_cache(hass, hass_client):
+    """Test contexts are found when a group has more contexts than are cached."""
+    await async_init_recorder_component(hass)
+    assert await async_setup_component(hass, "logbook", {})
+    await hass.async_add_executor_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+    contexts = [ha.Context() for _ in range(5)]
+    for context in contexts:
+        hass.bus.async_fire(
+            EVENT_CALL_SERVICE,
+            {ATTR_DOMAIN: "switch", ATTR_SERVICE: "turn_on"},
+            context=context,
+        )
+    for state in (STATE_OFF, STATE_ON):
+        for index, context in enumerate(contexts):
+            hass.states.async_set(f"switch.test_{index}", state, context=context)
+    await _async_commit_and_wait(hass)
+    client = await hass_client()
+
+    with patch.object(logbook, "CONTEXT_LOOKUP_CACHE_SIZE", 2), patch.object(
+        logbook, "CONTEXT_LOOKUP_BATCH_SIZE", 2
+    ):
+        entries = await _async_fetch_logbook(client)
+
+    # All state changes happened in the same group of minutes
+    entries = [entry for entry in entries if "entity_id" in entry]
+    assert len(entries) == 5
+    for index, entry in enumerate(entries):
+        _assert_entry(entry, entity_id=f"switch.test_{index}", state=STATE_ON)
+        assert entry["context_domain"] == "switch"
+        assert entry["context_service"] == "turn_on"
+
+
 async def _async_fetch_logbook(client, params=None):
     if params is None:
         params = {}
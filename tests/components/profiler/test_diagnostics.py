@@ -0,0 +1,34 @@
+"""Test the Profiler diagnostics."""
+from homeassistant.components.profiler import SERVICE_START_JOB_PROFILER
+from homeassistant.components.profiler.const import DOMAIN
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+
+
+async def test_diagnostics(hass, hass_client):
+    """Test the job stats are in the diagnostics."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_JOB_PROFILER, {})
+    await hass.async_block_till_done()
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+    job_stats = diagnostics["job_stats"]
+    assert job_stats["running"] is True
+    assert job_stats["duration"] > 0
+    assert "integrations" in job_stats
+    assert "event_types" in job_stats
+    assert diagnostics["integration_index"] == {}
+    assert diagnostics["service_target_cache"] == {}
+    assert diagnostics["suppressed_state_writes"] == {}
+    assert diagnostics["template_renders_avoided"] == {}
+    assert diagnostics["template_compile"] == {}
+    assert diagnostics["timer_wheel"]["scheduled"] >= 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
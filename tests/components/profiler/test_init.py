@@ -1,4 +1,5 @@
 """Test the Profiler config flow."""
+import asyncio
 from datetime import timedelta
 import os
 from unittest.mock import patch
@@ -10,11 +11,14 @@ from homeassistant.components.profiler import (
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_MEMORY,
     SERVICE_START,
+    SERVICE_START_JOB_PROFILER,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_STOP_JOB_PROFILER,
     SERVICE_STOP_LOG_OBJECTS,
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.core import callback
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -185,3 +189,51 @@ async def test_log_scheduled(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_job_profiler(hass, hass_ws_client):
+    """Test we can time the jobs run in the event loop."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    calls = []
+
+    @callback
+    def listener(event):
+        calls.append(event)
+
+    async def async_listener(event):
+        await asyncio.sleep(0)
+        calls.append(event)
+
+    hass.bus.async_listen("test_event", listener)
+    hass.bus.async_listen("test_event", async_listener)
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_JOB_PROFILER, {})
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_JOB_PROFILER, {})
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 4
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/job_stats"})
+    msg = await client.receive_json()
+    assert msg["success"]
+    stats = msg["result"]
+    assert stats["running"] is False
+    # The callback runs once and the coroutine in two steps
+    assert stats["event_types"]["test_event"]["count"] == 3
+    assert stats["integrations"]["tests.components.profiler.test_init"]["count"] == 3
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 2, "type": "profiler/job_stats"})
+    msg = await client.receive_json()
+    assert not msg["success"]
@@ -0,0 +1,75 @@
+"""The tests for the recorder state change coalescer."""
+from homeassistant.components.recorder.coalesce import StateChangeCoalescer
+from homeassistant.core import Event
+
+
+def _state_changed(entity_id: str, state: str) -> Event:
+    return Event("state_changed", {"entity_id": entity_id, "new_state": state})
+
+
+def test_coalesce_keeps_first_and_latest():
+    """Test a state change replaces the last queued one of the entity."""
+    coalescer = StateChangeCoalescer(10, 100, {"sensor"})
+
+    first = coalescer.add(_state_changed("switch.test", "on"), 0)
+    second = coalescer.add(_state_changed("switch.test", "off"), 10)
+    assert first is not None
+    assert second is not None
+    assert coalescer.add(_state_changed("switch.test", "on"), 10) is None
+    assert coalescer.add(_state_changed("switch.test", "unknown"), 10) is None
+    assert coalescer.coalesced == 2
+
+    assert coalescer.take(first).data["new_state"] == "on"
+    assert coalescer.take(second).data["new_state"] == "unknown"
+
+    # Nothing is queued anymore, so the next state change is queued again
+    assert coalescer.add(_state_changed("switch.test", "off"), 10) is not None
+
+
+def test_coalesce_below_backlog():
+    """Test state changes are all queued below the coalesce backlog."""
+    coalescer = StateChangeCoalescer(10, 100, {"sensor"})
+
+    for state in range(5):
+        assert coalescer.add(_state_changed("switch.test", str(state)), 9)
+    assert coalescer.coalesced == 0
+
+
+def test_shed_low_priority_domains():
+    """Test only the latest state change of low priority domains is kept."""
+    coalescer = StateChangeCoalescer(10, 100, {"sensor"})
+
+    sensor = coalescer.add(_state_changed("sensor.test", "1"), 0)
+    switch = coalescer.add(_state_changed("switch.test", "1"), 0)
+    assert coalescer.add(_state_changed("sensor.test", "2"), 100) is None
+    assert coalescer.add(_state_changed("switch.test", "2"), 100) is not None
+    assert coalescer.shed == 1
+
+    assert coalescer.take(sensor).data["new_state"] == "2"
+    assert coalescer.take(switch).data["new_state"] == "1"
+
+
+def test_clear():
+    """Test clearing forgets the queued state changes."""
+    coalescer = StateChangeCoalescer(0, 100, {"sensor"})
+
+    coalescer.add(_state_changed("switch.test", "1"), 0)
+    coalescer.add(_state_changed("switch.test", "2"), 0)
+    coalescer.clear()
+    assert coalescer.add(_state_changed("switch.test", "3"), 0) is not None
+    assert coalescer.coalesced == 0
+
+
+def test_take_after_clear():
+    """Test a state change taken after clearing the queue is still recorded."""
+    coalescer = StateChangeCoalescer(0, 100, {"sensor"})
+
+    first = coalescer.add(_state_changed("switch.test", "1"), 0)
+    coalescer.clear()
+    assert coalescer.take(first).data["new_state"] == "1"
+
+    # The entity was queued again after the queue was cleared
+    second = coalescer.add(_state_changed("switch.test", "2"), 0)
+    assert coalescer.take(first).data["new_state"] == "1"
+    assert coalescer.take(second).data["new_state"] == "2"
+    assert coalescer.add(_state_changed("switch.test", "3"), 10) is not None
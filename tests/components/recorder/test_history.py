@@ -3,10 +3,18 @@
 from copy import copy
 from datetime import timedelta
 import json
+from operator import attrgetter
 from unittest.mock import patch, sentinel
 
 from homeassistant.components.recorder import history
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import (
+    States,
+    StateSnapshots,
+    process_timestamp,
+)
+from homeassistant.components.recorder.snapshot import save_state_snapshot
+from homeassistant.components.recorder.util import session_scope
 import homeassistant.core as ha
 from homeassistant.helpers.json import JSONEncoder
 import homeassistant.util.dt as dt_util
@@ -75,6 +83,69 @@ def test_get_states(hass_recorder):
     assert history.get_state(hass, time_before_recorder_ran, "demo.id") is None
 
 
+def test_get_states_from_snapshot(hass_recorder):
+    """Test getting states at a specific point in time with a state snapshot."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    def set_states(point, entity_ids, state):
+        with patch(
+            "homeassistant.components.recorder.dt_util.utcnow", return_value=point
+        ):
+            for entity_id in entity_ids:
+                hass.states.set(entity_id, state, {"attr": state})
+            wait_recording_done(hass)
+
+    start = dt_util.utcnow() + timedelta(seconds=1)
+    snapshot_start = start + timedelta(minutes=1)
+    entity_ids = [f"test.snapshot_{i}" for i in range(4)]
+    set_states(start, entity_ids, "before")
+    set_states(start, ["zone.home"], "zoning")
+
+    assert save_state_snapshot(instance, snapshot_start)
+    # Saving the same snapshot again is a no-op
+    assert save_state_snapshot(instance, snapshot_start)
+    with session_scope(hass=hass) as session:
+        assert session.query(StateSnapshots).count() == 5
+
+    set_states(snapshot_start + timedelta(seconds=1), entity_ids[:2], "after")
+    set_states(snapshot_start + timedelta(seconds=1), ["test.new"], "after")
+    point = snapshot_start + timedelta(seconds=2)
+
+    expected = {
+        "test.snapshot_0": "after",
+        "test.snapshot_1": "after",
+        "test.snapshot_2": "before",
+        "test.snapshot_3": "before",
+        "test.new": "after",
+    }
+    states = history.get_states(hass, point)
+    assert {state.entity_id: state.state for state in states} == expected
+    assert {state.entity_id: state.attributes["attr"] for state in states} == expected
+
+    states = history.get_states(hass, point, ["test.snapshot_1", "test.snapshot_2"])
+    assert {state.entity_id: state.state for state in states} == {
+        "test.snapshot_1": "after",
+        "test.snapshot_2": "before",
+    }
+
+    # Points in time before the snapshot don't use it
+    states = history.get_states(hass, start + timedelta(seconds=1))
+    assert {state.entity_id: state.state for state in states} == {
+        entity_id: "before" for entity_id in entity_ids
+    }
+
+    # A later snapshot is built from the previous one
+    assert save_state_snapshot(instance, point)
+    with session_scope(hass=hass) as session:
+        assert (
+            session.query(StateSnapshots).filter(StateSnapshots.start == point).count()
+            == 6
+        )
+    states = history.get_states(hass, point + timedelta(seconds=1))
+    assert {state.entity_id: state.state for state in states} == expected
+
+
 def test_state_changes_during_period(hass_recorder):
     """Test state change during period."""
     hass = hass_recorder()
@@ -184,6 +255,156 @@ def test_get_significant_states(hass_recorder):
     assert states == hist
 
 
+def test_stream_significant_states(hass_recorder):
+    """Test streaming significant states per entity."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+
+    with session_scope(hass=hass) as session:
+        streamed = list(
+            history.stream_significant_states_with_session(hass, session, zero, four)
+        )
+    assert [entity_id for entity_id, _ in streamed] == sorted(states)
+    assert dict(streamed) == states
+
+    entity_ids = ["thermostat.test", "media_player.test", "thermostat.test2"]
+    with session_scope(hass=hass) as session:
+        streamed = list(
+            history.stream_significant_states_with_session(
+                hass, session, zero, four, entity_ids, minimal_response=True
+            )
+        )
+    assert [entity_id for entity_id, _ in streamed] == entity_ids
+    assert dict(streamed) == history.get_significant_states(
+        hass, zero, four, entity_ids, minimal_response=True
+    )
+
+
+def test_stream_significant_states_in_database_order(hass_recorder):
+    """Test the start states are merged whatever order the database sorts in."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    start = zero + timedelta(seconds=2.5)
+
+    with session_scope(hass=hass) as session:
+        rows = list(
+            history._get_significant_states_rows(
+                hass, session, start, four, None, None, True
+            )
+        )
+        # A collation sorting the entity_ids differently than Python does
+        rows.sort(key=attrgetter("entity_id"), reverse=True)
+        streamed = list(
+            history._sorted_states_to_entity_lists(hass, session, rows, start, None)
+        )
+
+    entity_ids = [entity_id for entity_id, _ in streamed]
+    assert len(entity_ids) == len(set(entity_ids))
+    assert dict(streamed) == history.get_significant_states(hass, start, four)
+
+
+def test_get_significant_states_from_history_cache(hass_recorder):
+    """Test significant states of recently recorded states come from the cache."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    entity_ids = ["sensor.cached", "media_player.cached", "sensor.unchanged"]
+
+    def set_state(entity_id, state, **attributes):
+        hass.states.set(entity_id, state, attributes)
+        wait_recording_done(hass)
+
+    set_state("sensor.unchanged", "1")
+    set_state("sensor.cached", "1")
+    start = dt_util.utcnow()
+    set_state("sensor.cached", "2")
+    set_state("media_player.cached", "idle", title="one")
+    set_state("media_player.cached", "idle", title="two")
+    set_state("sensor.cached", "3")
+    set_state("sensor.not_requested", "1")
+
+    def get_significant_states(**kwargs):
+        return history.get_significant_states(hass, start, None, entity_ids, **kwargs)
+
+    with patch.object(
+        instance.history_cache,
+        "states_during_period",
+        wraps=instance.history_cache.states_during_period,
+    ) as states_during_period:
+        from_cache = get_significant_states()
+        from_cache_minimal = get_significant_states(minimal_response=True)
+        from_cache_all_changes = get_significant_states(significant_changes_only=False)
+    assert states_during_period.call_count == 3
+    assert instance.history_cache.hits == 9
+    assert instance.history_cache.misses == 0
+
+    with patch(
+        "homeassistant.components.recorder.history._history_cache",
+        return_value=None,
+    ):
+        assert from_cache == get_significant_states()
+        assert from_cache_minimal == get_significant_states(minimal_response=True)
+        assert from_cache_all_changes == get_significant_states(
+            significant_changes_only=False
+        )
+
+    assert list(from_cache) == entity_ids
+    assert [state.state for state in from_cache["sensor.cached"]] == ["1", "2", "3"]
+    assert len(from_cache["media_player.cached"]) == 1
+    assert len(from_cache_all_changes["media_player.cached"]) == 2
+
+
+def test_get_significant_states_of_removed_entity_from_history_cache(
+    hass_recorder,
+):
+    """Test the cached states of a removed entity match the recorded ones."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    entity_ids = ["sensor.removed"]
+
+    hass.states.set("sensor.removed", "1")
+    wait_recording_done(hass)
+    start = dt_util.utcnow()
+    hass.states.set("sensor.removed", "2")
+    wait_recording_done(hass)
+    hass.states.remove("sensor.removed")
+    wait_recording_done(hass)
+    hass.states.set("sensor.removed", "3")
+    wait_recording_done(hass)
+
+    def get_significant_states_compressed():
+        with session_scope(hass=hass) as session:
+            return history.get_significant_states_compressed_with_session(
+                hass, session, start, None, entity_ids
+            )
+
+    from_cache = history.get_significant_states(hass, start, None, entity_ids)
+    from_cache_minimal = history.get_significant_states(
+        hass, start, None, entity_ids, minimal_response=True
+    )
+    from_cache_compressed = get_significant_states_compressed()
+    assert instance.history_cache.hits == 3
+
+    with patch(
+        "homeassistant.components.recorder.history._history_cache",
+        return_value=None,
+    ):
+        assert from_cache == history.get_significant_states(
+            hass, start, None, entity_ids
+        )
+        assert from_cache_minimal == history.get_significant_states(
+            hass, start, None, entity_ids, minimal_response=True
+        )
+        assert from_cache_compressed == get_significant_states_compressed()
+
+    assert [state.state for state in from_cache["sensor.removed"]] == [
+        "1",
+        "2",
+        "",
+        "3",
+    ]
+    assert from_cache_minimal["sensor.removed"][2]["state"] == ""
+
+
 def test_get_significant_states_minimal_response(hass_recorder):
     """Test that only significant states are returned.
 
@@ -217,6 +438,108 @@ def test_get_significant_states_minimal_response(hass_recorder):
     assert states == hist
 
 
+def test_get_significant_states_compressed(hass_recorder):
+    """Test the compressed format holds the points of a minimal response."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    hist = history.get_significant_states(hass, zero, four, minimal_response=True)
+    with session_scope(hass=hass) as session:
+        compressed = history.get_significant_states_compressed_with_session(
+            hass, session, zero, four
+        )
+
+    state_table = compressed["states"]
+    assert len(state_table) == len(set(state_table))
+    assert list(compressed["entities"]) == list(hist)
+    for entity_id, states in hist.items():
+        entity = compressed["entities"][entity_id]
+        need_attributes = entity_id.startswith("thermostat.")
+        expected_states = []
+        expected_times = []
+        for state in states:
+            if isinstance(state, dict):
+                expected_states.append(state["state"])
+                expected_times.append(
+                    dt_util.parse_datetime(state["last_changed"]).timestamp()
+                )
+                continue
+            expected_states.append(state.state)
+            if need_attributes:
+                expected_times.append(state.last_updated.timestamp())
+            else:
+                expected_times.append(state.last_changed.timestamp())
+
+        assert [state_table[index] for index in entity["s"]] == expected_states
+        assert entity["t"] == expected_times
+        assert entity["a"] == states[-1].attributes
+        if need_attributes:
+            assert entity["pa"] == [state.attributes for state in states]
+        else:
+            assert "pa" not in entity
+
+
+def test_get_significant_states_compressed_need_attributes(hass_recorder):
+    """Test the compressed format has the attributes of all points if needed."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    hist = history.get_significant_states(hass, zero, four)
+    with session_scope(hass=hass) as session:
+        compressed = history.get_significant_states_compressed_with_session(
+            hass, session, zero, four, need_attributes=True
+        )
+
+    state_table = compressed["states"]
+    assert list(compressed["entities"]) == list(hist)
+    for entity_id, states in hist.items():
+        entity = compressed["entities"][entity_id]
+        assert [state_table[index] for index in entity["s"]] == [
+            state.state for state in states
+        ]
+        assert entity["t"] == [state.last_updated.timestamp() for state in states]
+        assert entity["pa"] == [state.attributes for state in states]
+        assert entity["a"] == states[-1].attributes
+
+
+def test_get_significant_states_compressed_purged_attributes(hass_recorder):
+    """Test the compressed format handles rows without any attributes."""
+    hass = hass_recorder()
+    zero, four, _ = record_states(hass)
+    with session_scope(hass=hass) as session:
+        session.query(States).filter(States.entity_id == "thermostat.test").update(
+            {States.attributes: None, States.attributes_id: None}
+        )
+    with session_scope(hass=hass) as session:
+        compressed = history.get_significant_states_compressed_with_session(
+            hass, session, zero, four, need_attributes=True
+        )
+
+    entity = compressed["entities"]["thermostat.test"]
+    assert entity["pa"] == [{}] * len(entity["s"])
+    assert entity["a"] == {}
+
+
+def test_get_significant_states_compressed_with_initial(hass_recorder):
+    """Test the compressed format includes the state at the start time."""
+    hass = hass_recorder()
+    zero, four, states = record_states(hass)
+    one = zero + timedelta(seconds=1.5)
+    with session_scope(hass=hass) as session:
+        compressed = history.get_significant_states_compressed_with_session(
+            hass, session, one, four, ["media_player.test", "media_player.test2"]
+        )
+
+    state_table = compressed["states"]
+    entity = compressed["entities"]["media_player.test"]
+    assert [state_table[index] for index in entity["s"]] == ["YouTube", "Netflix"]
+    assert entity["t"][0] == one.timestamp()
+    assert entity["a"] == states["media_player.test"][-1].attributes
+    # Entities without changes only have their initial state
+    entity = compressed["entities"]["media_player.test2"]
+    assert [state_table[index] for index in entity["s"]] == ["YouTube"]
+    assert entity["t"] == [one.timestamp()]
+    assert entity["a"] == states["media_player.test2"][0].attributes
+
+
 def test_get_significant_states_with_initial(hass_recorder):
     """Test that only significant states are returned.
 
@@ -0,0 +1,141 @@
+"""The tests for the recorder history cache."""
+from datetime import timedelta
+
+from homeassistant.components.recorder.history_cache import BUCKET_SIZE, HistoryCache
+from homeassistant.const import EVENT_STATE_CHANGED
+import homeassistant.core as ha
+import homeassistant.util.dt as dt_util
+
+
+def _state_changed_event(entity_id, state, point_in_time):
+    """Return a state_changed event for a state updated at point_in_time."""
+    new_state = ha.State(
+        entity_id,
+        state,
+        {"state": state},
+        last_changed=point_in_time,
+        last_updated=point_in_time,
+    )
+    return ha.Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "new_state": new_state},
+        time_fired=point_in_time,
+    )
+
+
+def _add_state(cache, entity_id, state, point_in_time):
+    """Add a state to the cache."""
+    cache.add_state(
+        _state_changed_event(entity_id, state, point_in_time),
+        f'{{"state":"{state}"}}',
+    )
+
+
+def test_states_during_period():
+    """Test the cache returns the states of a period."""
+    cache = HistoryCache(1024 * 1024)
+    start = dt_util.utcnow().replace(minute=30, second=0, microsecond=0)
+
+    # Nothing is cached before the cache is reset
+    _add_state(cache, "sensor.one", "0", start)
+    assert cache.split_time(["sensor.one"], start) is None
+    assert cache.memory_usage == 0
+
+    cache.reset(start)
+    for minutes in range(0, 120, 10):
+        _add_state(
+            cache, "sensor.one", str(minutes), start + timedelta(minutes=minutes)
+        )
+    _add_state(cache, "sensor.two", "on", start + timedelta(minutes=5))
+    # States recorded out of order are sorted
+    _add_state(cache, "sensor.two", "off", start + timedelta(minutes=1))
+
+    assert cache.split_time(["sensor.one", "sensor.two"], start) == start
+    assert cache.hits == 2
+    assert cache.misses == 0
+
+    states = cache.states_during_period(
+        ["sensor.one", "sensor.two", "sensor.three"],
+        start + timedelta(minutes=10),
+        start + timedelta(minutes=70),
+    )
+    assert [row.state for row in states["sensor.one"]] == [
+        "10",
+        "20",
+        "30",
+        "40",
+        "50",
+        "60",
+    ]
+    assert "sensor.two" not in states
+    assert "sensor.three" not in states
+
+    states = cache.states_during_period(
+        ["sensor.two"], start, None, lambda row: row.state == "on"
+    )
+    assert [row.state for row in states["sensor.two"]] == ["on"]
+
+    states = cache.states_before(
+        ["sensor.one", "sensor.two"], start + timedelta(minutes=35)
+    )
+    assert states["sensor.one"].state == "30"
+    assert states["sensor.two"].state == "on"
+    assert cache.states_before(["sensor.one"], start) == {}
+
+
+def test_lru_eviction():
+    """Test the least recently used buckets are evicted."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    cache = HistoryCache(1024 * 1024)
+    cache.reset(start)
+    _add_state(cache, "sensor.one", "0", start)
+    row_size = cache.memory_usage
+
+    cache = HistoryCache(3 * row_size)
+    cache.reset(start)
+    _add_state(cache, "sensor.one", "0", start)
+    _add_state(cache, "sensor.one", "1", start + BUCKET_SIZE)
+    _add_state(cache, "sensor.two", "0", start)
+    assert cache.stats() == {
+        "buckets": 3,
+        "hits": 0,
+        "max_memory": 3 * row_size,
+        "memory_usage": 3 * row_size,
+        "misses": 0,
+    }
+
+    # Using the first bucket of sensor.one makes sensor.one's second bucket
+    # the least recently used one
+    cache.states_during_period(["sensor.one"], start, start + timedelta(minutes=1))
+    _add_state(cache, "sensor.two", "1", start + BUCKET_SIZE)
+
+    assert cache.memory_usage == 2 * row_size
+    # The evicted bucket was the last one of sensor.one
+    assert cache.split_time(["sensor.one"], start) == start + 2 * BUCKET_SIZE
+    assert cache.split_time(["sensor.two"], start) == start
+    assert cache.states_during_period(["sensor.one"], start, None) == {}
+    assert cache.states_before(["sensor.one"], start + 3 * BUCKET_SIZE) == {}
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_purge():
+    """Test purged states are removed from the cache."""
+    start = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+    cache = HistoryCache(1024 * 1024)
+    cache.reset(start)
+    for hours in range(3):
+        _add_state(cache, "sensor.one", str(hours), start + hours * BUCKET_SIZE)
+        _add_state(cache, "sensor.two", str(hours), start + hours * BUCKET_SIZE)
+
+    cache.purge_before(start + BUCKET_SIZE)
+    assert cache.stats()["buckets"] == 4
+    assert cache.split_time(["sensor.one"], start) == start + BUCKET_SIZE
+
+    now = dt_util.utcnow()
+    cache.purge_entities(lambda entity_id: entity_id == "sensor.one")
+    assert cache.stats()["buckets"] == 2
+    assert cache.states_during_period(["sensor.one"], start + BUCKET_SIZE, None) == {}
+    # Only states recorded after the purge are cached
+    assert cache.split_time(["sensor.one"], start + BUCKET_SIZE) >= now
+    assert cache.split_time(["sensor.two"], start + BUCKET_SIZE) == start + BUCKET_SIZE
@@ -30,6 +30,7 @@ from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
     StatisticsRuns,
     process_timestamp,
@@ -75,6 +76,8 @@ def _default_recorder(hass):
         db_retry_wait=3,
         entity_filter=CONFIG_SCHEMA({DOMAIN: {}}),
         exclude_t=[],
+        bulk_insert=False,
+        purge_chunk_size=None,
     )
 
 
@@ -141,14 +144,56 @@ async def test_saving_state(
     await async_wait_recording_done(hass, instance)
 
     with session_scope(hass=hass) as session:
-        db_states = list(session.query(States))
+        db_states = []
+        for db_state, db_state_attributes in session.query(
+            States, StateAttributes
+        ).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            db_states.append(db_state)
+            state = db_state.to_native()
+            state.attributes = db_state_attributes.to_native()
         assert len(db_states) == 1
         assert db_states[0].event_id > 0
-        state = db_states[0].to_native()
 
     assert state == _state_empty_context(hass, entity_id)
 
 
+async def test_saving_state_deduplicates_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test states with identical attributes share one state_attributes row."""
+    instance = await async_setup_recorder_instance(hass)
+
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+
+    hass.states.async_set("test.one", "on", attributes)
+    hass.states.async_set("test.two", "on", attributes)
+    await async_wait_recording_done(hass, instance)
+    hass.states.async_set("test.one", "off", attributes)
+    hass.states.async_set("test.two", "off", {"test_attr": 6})
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States).order_by(States.state_id))
+        db_state_attributes = list(session.query(StateAttributes))
+        assert len(db_states) == 4
+        assert len(db_state_attributes) == 2
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert (
+            db_states[0].attributes_id
+            == db_states[1].attributes_id
+            == db_states[2].attributes_id
+        )
+        assert db_states[3].attributes_id != db_states[0].attributes_id
+        shared_attrs = {
+            db_state_attribute.attributes_id: db_state_attribute.to_native()
+            for db_state_attribute in db_state_attributes
+        }
+        assert shared_attrs[db_states[0].attributes_id] == attributes
+        assert shared_attrs[db_states[3].attributes_id] == {"test_attr": 6}
+
+
 async def test_saving_many_states(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -375,7 +420,14 @@ def _add_entities(hass, entity_ids):
     wait_recording_done(hass)
 
     with session_scope(hass=hass) as session:
-        return [st.to_native() for st in session.query(States)]
+        states = []
+        for state, state_attributes in session.query(States, StateAttributes).outerjoin(
+            StateAttributes, States.attributes_id == StateAttributes.attributes_id
+        ):
+            native_state = state.to_native()
+            native_state.attributes = state_attributes.to_native()
+            states.append(native_state)
+        return states
 
 
 def _add_events(hass, events):
@@ -832,6 +884,68 @@ def test_saving_sets_old_state(hass_recorder):
         assert states[3].old_state_id == states[1].state_id
 
 
+def test_saving_sets_old_state_bulk_insert(hass_recorder):
+    """Test saving sets old state and shared attributes with bulk insert."""
+    hass = hass_recorder({"bulk_insert": True})
+    instance = hass.data[DATA_INSTANCE]
+    assert instance._bulk_writer is not None
+
+    hass.states.set("test.one", "on", {"same": True})
+    hass.states.set("test.two", "on", {"same": True})
+    wait_recording_done(hass)
+    hass.states.set("test.one", "off", {"same": True})
+    hass.states.set("test.two", "off", {"same": False})
+    hass.states.set("test.one", "on", {"same": True})
+    hass.states.remove("test.two")
+    hass.bus.fire("test_event", {"some": "data"})
+    wait_recording_done(hass)
+
+    assert isinstance(instance._old_states["test.one"].state_id, int)
+    assert "test.two" not in instance._old_states
+
+    with session_scope(hass=hass) as session:
+        states = list(session.query(States).order_by(States.state_id))
+        assert len(states) == 6
+
+        assert [state.entity_id for state in states] == [
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+            "test.one",
+            "test.two",
+        ]
+        assert [state.state for state in states] == [
+            "on",
+            "on",
+            "off",
+            "off",
+            "on",
+            "",
+        ]
+
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id is None
+        assert states[2].old_state_id == states[0].state_id
+        assert states[3].old_state_id == states[1].state_id
+        assert states[4].old_state_id == states[2].state_id
+        assert states[5].old_state_id == states[3].state_id
+        assert instance._old_states["test.one"].state_id == states[4].state_id
+
+        assert states[0].attributes_id == states[1].attributes_id
+        assert states[0].attributes_id == states[4].attributes_id
+        assert states[3].attributes_id != states[0].attributes_id
+        assert session.query(StateAttributes).count() == 3
+
+        for state in states:
+            event = session.query(Events).filter_by(event_id=state.event_id).one()
+            assert event.event_type == "state_changed"
+            assert event.event_data == "{}"
+
+        event = session.query(Events).filter_by(event_type="test_event").one()
+        assert event.to_native().data == {"some": "data"}
+
+
 def test_saving_state_with_serializable_data(hass_recorder, caplog):
     """Test saving data that cannot be serialized does not crash."""
     hass = hass_recorder()
@@ -1236,3 +1350,48 @@ async def test_database_lock_without_instance(hass):
             assert await instance.lock_database()
         finally:
             assert instance.unlock_database()
+
+
+async def test_state_changes_coalesced_when_backlogged(hass):
+    """Test queued state changes are coalesced when the recorder falls behind."""
+    await async_init_recorder_component(hass)
+    instance: Recorder = hass.data[DATA_INSTANCE]
+    await async_wait_recording_done(hass, instance)
+
+    class BlockQueue(recorder.RecorderTask):
+        event: threading.Event = threading.Event()
+
+        def run(self, instance: Recorder) -> None:
+            self.event.wait()
+
+    block_task = BlockQueue()
+    instance.queue.put(block_task)
+    instance.coalescer.coalesce_backlog = 1
+    instance.coalescer.shed_backlog = 1
+    try:
+        for state in range(5):
+            hass.states.async_set("switch.test", str(state))
+        for state in range(5):
+            hass.states.async_set("sensor.test", str(state))
+        await hass.async_block_till_done()
+    finally:
+        block_task.event.set()
+    await async_wait_recording_done(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        switch_states = [
+            state.state
+            for state in session.query(States)
+            .filter(States.entity_id == "switch.test")
+            .order_by(States.state_id)
+        ]
+        sensor_states = [
+            state.state
+            for state in session.query(States)
+            .filter(States.entity_id == "sensor.test")
+            .order_by(States.state_id)
+        ]
+    assert switch_states == ["0", "4"]
+    assert sensor_states == ["4"]
+    assert instance.coalescer.coalesced == 3
+    assert instance.coalescer.shed == 4
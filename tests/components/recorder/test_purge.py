@@ -8,12 +8,14 @@ from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import PurgeTask
+from homeassistant.components.recorder import PurgeTask, purge
 from homeassistant.components.recorder.const import MAX_ROWS_TO_PURGE
 from homeassistant.components.recorder.models import (
     Events,
     RecorderRuns,
+    StateAttributes,
     States,
+    StateSnapshots,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -91,6 +93,111 @@ async def test_purge_old_states(
         assert "test.recorder2" in instance._old_states
 
 
+async def test_purge_old_states_in_chunks(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old states in time ordered chunks."""
+    instance = await async_setup_recorder_instance(hass)
+    instance.purge_chunk_size = 1
+
+    await _add_test_states(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        assert states.count() == 6
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+
+        # The two oldest states were recorded at the same time and are
+        # purged together
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+        assert states.count() == 4
+        assert [state.state for state in states] == [
+            "purgeme_2",
+            "purgeme_3",
+            "dontpurgeme_4",
+            "dontpurgeme_5",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        # Purged from eleven until five days ago out of seven days
+        assert instance.purge_metrics.as_dict()["progress"] == 85.7
+        assert instance.purge_metrics.as_dict()["states_purged"] == 2
+
+        # The last chunk ends at purge_before
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert states.count() == 2
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+        assert "test.recorder2" in instance._old_states
+        assert (
+            session.query(Events).filter(Events.event_type == "state_changed").count()
+            == 2
+        )
+
+    metrics = instance.purge_metrics.as_dict()
+    assert metrics["progress"] == 100
+    assert metrics["chunks"] == 2
+    assert metrics["states_purged"] == 4
+    assert metrics["events_purged"] == 4
+    assert metrics["rows_per_second"] > 0
+
+
+async def test_purge_chunk_of_chained_states(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purging a chunk of states linked to each other through old_state_id."""
+    instance = await async_setup_recorder_instance(hass)
+    instance.purge_chunk_size = 3
+
+    await _add_test_states(hass, instance)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        chunk_state_ids = [
+            state.state_id for state in states if state.state.startswith("autopurge")
+        ]
+        assert len(chunk_state_ids) == 2
+        # The second state of the chunk refers to the first one
+        assert states[1].old_state_id == chunk_state_ids[0]
+        assert states[2].old_state_id == chunk_state_ids[1]
+
+        disconnect = purge._disconnect_states_from_old_states_before
+
+        def disconnect_and_check(instance, session, chunk_end):
+            """Check no state refers to the chunk when the range delete runs."""
+            disconnect(instance, session, chunk_end)
+            # MySQL checks the foreign key for each deleted row, the states
+            # within the chunk must be unlinked as well
+            assert (
+                session.query(States)
+                .filter(States.old_state_id.in_(chunk_state_ids))
+                .count()
+                == 0
+            )
+
+        with patch(
+            "homeassistant.components.recorder.purge."
+            "_disconnect_states_from_old_states_before",
+            side_effect=disconnect_and_check,
+        ) as disconnect_mock:
+            finished = purge_old_data(
+                instance, dt_util.utcnow() - timedelta(days=4), repack=False
+            )
+
+        assert not finished
+        assert disconnect_mock.called
+        assert [state.state for state in states] == [
+            "purgeme_2",
+            "purgeme_3",
+            "dontpurgeme_4",
+            "dontpurgeme_5",
+        ]
+        assert states[0].old_state_id is None
+        assert states[1].old_state_id == states[0].state_id
+
+
 async def test_purge_old_states_encouters_database_corruption(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -184,6 +291,52 @@ async def test_purge_old_states_encounters_operational_error(
     assert "Error executing purge" in caplog.text
 
 
+async def test_purge_old_states_removes_unused_attributes(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test purging states removes attributes only once they are unreferenced."""
+    instance = await async_setup_recorder_instance(hass)
+
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+
+    with recorder.session_scope(hass=hass) as session:
+        purged_attributes = StateAttributes(
+            attributes_id=1000, shared_attrs='{"purge":true}', hash=1
+        )
+        shared_attributes = StateAttributes(
+            attributes_id=1001, shared_attrs='{"keep":true}', hash=2
+        )
+        session.add_all((purged_attributes, shared_attributes))
+        for event_id, timestamp, attributes_id in (
+            (1000, eleven_days_ago, 1000),
+            (1001, eleven_days_ago, 1001),
+            (1002, utcnow, 1001),
+        ):
+            _add_state_and_state_changed_event(
+                session, "sensor.attributes", "on", timestamp, event_id
+            )
+            session.flush()
+            session.query(States).filter(States.event_id == event_id).update(
+                {"attributes_id": attributes_id}
+            )
+    instance._state_attributes_ids['{"purge":true}'] = 1000
+    instance._state_attributes_ids['{"keep":true}'] = 1001
+
+    with session_scope(hass=hass) as session:
+        purge_before = dt_util.utcnow() - timedelta(days=4)
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+
+        assert session.query(States).count() == 1
+        assert {
+            state_attributes.attributes_id
+            for state_attributes in session.query(StateAttributes)
+        } == {1001}
+        assert '{"purge":true}' not in instance._state_attributes_ids
+        assert instance._state_attributes_ids['{"keep":true}'] == 1001
+
+
 async def test_purge_old_events(
     hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
 ):
@@ -257,6 +410,41 @@ async def test_purge_old_statistics_runs(
         assert statistics_runs.count() == 1
 
 
+async def test_purge_old_state_snapshots(
+    hass: HomeAssistant, async_setup_recorder_instance: SetupRecorderInstanceT
+):
+    """Test deleting old state snapshots."""
+    instance = await async_setup_recorder_instance(hass)
+
+    utcnow = dt_util.utcnow()
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass, instance)
+
+    with recorder.session_scope(hass=hass) as session:
+        for days_ago in (11, 5, 0):
+            for state_id in range(3):
+                session.add(
+                    StateSnapshots(
+                        start=utcnow - timedelta(days=days_ago),
+                        entity_id=f"test.snapshot_{state_id}",
+                        state_id=state_id,
+                    )
+                )
+
+    with session_scope(hass=hass) as session:
+        state_snapshots = session.query(StateSnapshots)
+        assert state_snapshots.count() == 9
+
+        purge_before = utcnow - timedelta(days=4)
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert not finished
+
+        finished = purge_old_data(instance, purge_before, repack=False)
+        assert finished
+        assert state_snapshots.count() == 3
+
+
 async def test_purge_method(
     hass: HomeAssistant,
     async_setup_recorder_instance: SetupRecorderInstanceT,
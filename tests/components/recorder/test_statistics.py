@@ -23,6 +23,7 @@ from homeassistant.components.recorder.statistics import (
     delete_duplicates,
     get_last_short_term_statistics,
     get_last_statistics,
+    get_latest_short_term_statistics_with_session,
     get_metadata,
     list_statistic_ids,
     statistics_during_period,
@@ -117,6 +118,27 @@ def test_compile_hourly_statistics(hass_recorder):
     stats = get_last_short_term_statistics(hass, 1, "sensor.test3", True)
     assert stats == {}
 
+    # Test get_latest_short_term_statistics_with_session
+    with session_scope(hass=hass) as session:
+        stats = get_latest_short_term_statistics_with_session(
+            hass, session, ["sensor.test1", "sensor.test2", "sensor.test3"]
+        )
+        assert stats == {
+            **get_last_short_term_statistics(hass, 1, "sensor.test1", False),
+            **get_last_short_term_statistics(hass, 1, "sensor.test2", False),
+        }
+
+        metadata = get_metadata(hass, statistic_ids=["sensor.test1"])
+        stats = get_latest_short_term_statistics_with_session(
+            hass, session, ["sensor.test1", "sensor.test2"], metadata
+        )
+        assert stats == get_last_short_term_statistics(hass, 1, "sensor.test1", False)
+
+        stats = get_latest_short_term_statistics_with_session(
+            hass, session, ["sensor.test3"]
+        )
+        assert stats == {}
+
 
 @pytest.fixture
 def mock_sensor_statistics():
@@ -2,7 +2,7 @@
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
 import threading
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 from pytest import approx
@@ -263,8 +263,23 @@ async def test_recorder_info(hass, hass_ws_client):
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "history_cache": {
+            "buckets": 0,
+            "hits": 0,
+            "max_memory": 32 * 1024 * 1024,
+            "memory_usage": 0,
+            "misses": 0,
+        },
         "max_backlog": 30000,
         "migration_in_progress": False,
+        "purge": {
+            "chunks": 0,
+            "events_purged": 0,
+            "progress": None,
+            "rows_per_second": None,
+            "states_purged": 0,
+        },
+        "queue": {"coalesced": 0, "commit_latency": ANY, "shed": 0},
         "recording": True,
         "thread_running": True,
     }
@@ -16,12 +16,22 @@ from homeassistant.components.websocket_api.const import URL
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATONS
 from homeassistant.core import Context, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import entity
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
-from homeassistant.loader import async_get_integration
+from homeassistant.loader import DATA_IMPORT_TIME, async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
 
-from tests.common import MockEntity, MockEntityPlatform, async_mock_service
+from tests.common import (
+    MockConfigEntry,
+    MockEntity,
+    MockEntityPlatform,
+    async_mock_service,
+)
 
 
 async def test_fire_event(hass, websocket_client):
@@ -469,6 +479,60 @@ async def test_get_states(hass, websocket_client):
     assert msg["result"] == states
 
 
+async def test_get_states_chunked(hass, websocket_client):
+    """Test get_states/chunked command."""
+    for idx in range(5):
+        hass.states.async_set(f"sensor.test_{idx}", str(idx))
+
+    await websocket_client.send_json(
+        {"id": 5, "type": "get_states/chunked", "chunk_size": 2}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    states = []
+    for done in (False, False, True):
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == 5
+        assert msg["type"] == "event"
+        assert msg["event"]["done"] is done
+        states.extend(msg["event"]["states"])
+
+    assert states == [state.as_dict() for state in hass.states.async_all()]
+
+
+async def test_get_states_chunked_no_states(hass, websocket_client):
+    """Test get_states/chunked command without states sends one empty chunk."""
+    await websocket_client.send_json({"id": 5, "type": "get_states/chunked"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"states": [], "done": True}
+
+
+async def test_get_states_chunked_skips_not_serializable(
+    hass, websocket_client, caplog
+):
+    """Test get_states/chunked command skips states which can't be serialized."""
+    hass.states.async_set("greeting.hello", "world", {"hello": object()})
+    hass.states.async_set("greeting.bye", "universe")
+
+    await websocket_client.send_json({"id": 5, "type": "get_states/chunked"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["done"]
+    assert [state["entity_id"] for state in msg["event"]["states"]] == ["greeting.bye"]
+    assert "Unable to serialize state of greeting.hello" in caplog.text
+
+
 async def test_get_services(hass, websocket_client):
     """Test get_services command."""
     await websocket_client.send_json({"id": 5, "type": "get_services"})
@@ -585,12 +649,23 @@ async def test_states_filters_visible(hass, hass_admin_user, websocket_client):
     assert msg["result"][0]["entity_id"] == "test.entity"
 
 
-async def test_get_states_not_allows_nan(hass, websocket_client):
-    """Test get_states command not allows NaN floats."""
+async def test_get_states_nan_serialized_to_null(hass, websocket_client):
+    """Test get_states command serializes NaN floats to null."""
     hass.states.async_set("greeting.hello", "world", {"hello": float("NaN")})
 
     await websocket_client.send_json({"id": 5, "type": "get_states"})
 
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert msg["result"][0]["attributes"] == {"hello": None}
+
+
+async def test_get_states_not_serializable(hass, websocket_client):
+    """Test get_states command fails on attributes which can't be serialized."""
+    hass.states.async_set("greeting.hello", "world", {"hello": object()})
+
+    await websocket_client.send_json({"id": 5, "type": "get_states"})
+
     msg = await websocket_client.receive_json()
     assert not msg["success"]
     assert msg["error"]["code"] == const.ERR_UNKNOWN_ERROR
@@ -659,6 +734,169 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg["event"]["data"]["entity_id"] == "light.permitted"
 
 
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribe_entities sends compressed states and their diffs."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy(
+        {"entities": {"entity_ids": {"light.permitted": True, "light.new": True}}}
+    )
+    hass.states.async_set("light.permitted", "off", {"color": "red", "brightness": 1})
+    hass.states.async_set("light.not_permitted", "off")
+    state = hass.states.get("light.permitted")
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == "event"
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "s": "off",
+                "a": {"color": "red", "brightness": 1},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_set("light.not_permitted", "on")
+    hass.states.async_set("light.permitted", "off", {"color": "blue"})
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "a": {"color": "blue"},
+                    "c": state.context.id,
+                    "lu": state.last_updated.timestamp(),
+                },
+                "-": {"a": ["brightness"]},
+            }
+        }
+    }
+
+    context = Context(user_id="user")
+    hass.states.async_set("light.permitted", "on", {"color": "blue"}, context=context)
+    state = hass.states.get("light.permitted")
+
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "light.permitted": {
+                "+": {
+                    "s": "on",
+                    "c": {"id": context.id, "parent_id": None, "user_id": "user"},
+                    "lc": state.last_changed.timestamp(),
+                }
+            }
+        }
+    }
+
+    hass.states.async_set("light.new", "on")
+    state = hass.states.get("light.new")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {
+            "light.new": {
+                "s": "on",
+                "a": {},
+                "c": state.context.id,
+                "lc": state.last_changed.timestamp(),
+            }
+        }
+    }
+
+    hass.states.async_remove("light.permitted")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.permitted"]}
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["success"]
+
+
+async def test_subscribe_entities_with_filters(hass, websocket_client):
+    """Test subscribe_entities only sends the entities matching the filters."""
+    area_reg = ar.async_get(hass)
+    dev_reg = dr.async_get(hass)
+    ent_reg = er.async_get(hass)
+    kitchen = area_reg.async_create("Kitchen")
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    device = dev_reg.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("test", "device")},
+    )
+    dev_reg.async_update_device(device.id, area_id=kitchen.id)
+    ent_reg.async_get_or_create(
+        "light", "test", "device_light", device_id=device.id, suggested_object_id="one"
+    )
+    moved = ent_reg.async_get_or_create(
+        "light", "test", "moved_light", device_id=device.id, suggested_object_id="two"
+    )
+    ent_reg.async_update_entity(moved.entity_id, area_id="other")
+    ent_reg.async_get_or_create(
+        "light", "test", "area_light", suggested_object_id="three"
+    )
+    ent_reg.async_update_entity("light.three", area_id=kitchen.id)
+
+    for entity_id in (
+        "light.one",
+        "light.two",
+        "light.three",
+        "light.four",
+        "sensor.one",
+        "switch.one",
+    ):
+        hass.states.async_set(entity_id, "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "entity_ids": ["sensor.one"],
+            "domains": ["switch"],
+            "area_ids": [kitchen.id],
+        }
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {
+        "light.one",
+        "light.three",
+        "sensor.one",
+        "switch.one",
+    }
+
+    hass.states.async_set("light.two", "on")
+    hass.states.async_set("light.four", "on")
+    hass.states.async_set("switch.two", "on")
+    msg = await websocket_client.receive_json()
+    assert list(msg["event"]["a"]) == ["switch.two"]
+
+    hass.states.async_set("switch.two", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["switch.two"]["+"]["s"] == "off"
+
+    hass.states.async_set("light.three", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["light.three"]["+"]["s"] == "on"
+
+
 async def test_render_template_renders_template(hass, websocket_client):
     """Test simple template is rendered and updated."""
     hass.states.async_set("light.test", "on")
@@ -1244,6 +1482,7 @@ async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
         "august": datetime.timedelta(seconds=12.5),
         "isy994": datetime.timedelta(seconds=12.8),
     }
+    hass.data[DATA_IMPORT_TIME] = {"august": {"august": 0.5, "august.lock": 0.25}}
     await websocket_client.send_json({"id": 7, "type": "integration/setup_info"})
 
     msg = await websocket_client.receive_json()
@@ -1251,6 +1490,6 @@ async def test_integration_setup_info(hass, websocket_client, hass_admin_user):
     assert msg["type"] == const.TYPE_RESULT
     assert msg["success"]
     assert msg["result"] == [
-        {"domain": "august", "seconds": 12.5},
-        {"domain": "isy994", "seconds": 12.8},
+        {"domain": "august", "seconds": 12.5, "import_seconds": 0.75},
+        {"domain": "isy994", "seconds": 12.8, "import_seconds": 0},
     ]
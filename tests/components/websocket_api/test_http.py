@@ -7,6 +7,7 @@ from aiohttp import ServerDisconnectedError, WSMsgType, web
 import pytest
 
 from homeassistant.components.websocket_api import const, http
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from tests.common import async_fire_time_changed
@@ -92,3 +93,15 @@ async def test_prepare_fail(hass, hass_ws_client, caplog):
         await hass_ws_client(hass)
 
     assert "Timeout preparing request" in caplog.text
+
+
+async def test_permessage_deflate(hass, hass_client_no_auth):
+    """Test permessage-deflate is negotiated with clients offering it."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    await hass.async_block_till_done()
+
+    client = await hass_client_no_auth()
+    async with client.ws_connect(http.URL, compress=15) as ws:
+        assert ws.compress == 15
+        auth_required = await ws.receive_json()
+        assert auth_required["type"] == "auth_required"
@@ -1,4 +1,5 @@
 """Tests for the Device Registry."""
+from operator import attrgetter
 import time
 from unittest.mock import patch
 
@@ -665,6 +666,57 @@ async def test_deleted_device_removing_area_id(registry):
     assert entry_w_area != entry_wo_area
 
 
+async def test_area_and_config_entry_index(registry):
+    """Test the area and config entry lookups stay consistent."""
+    entry1 = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "0123")},
+    )
+    entry2 = registry.async_get_or_create(
+        config_entry_id="123",
+        identifiers={("bridgeid", "4567")},
+    )
+    entry1 = registry.async_update_device(entry1.id, area_id="area-1")
+
+    assert device_registry.async_entries_for_area(registry, "area-1") == [entry1]
+    assert (
+        sorted(
+            device_registry.async_entries_for_config_entry(registry, "123"),
+            key=attrgetter("id"),
+        )
+        == sorted([entry1, entry2], key=attrgetter("id"))
+    )
+
+    # Updating keeps the entries indexed
+    entry1 = registry.async_update_device(entry1.id, name_by_user="Renamed")
+    entry1 = registry.async_update_device(entry1.id, add_config_entry_id="456")
+    assert (
+        sorted(
+            device_registry.async_entries_for_config_entry(registry, "123"),
+            key=attrgetter("id"),
+        )
+        == sorted([entry1, entry2], key=attrgetter("id"))
+    )
+    assert device_registry.async_entries_for_config_entry(registry, "456") == [entry1]
+
+    entry1 = registry.async_update_device(
+        entry1.id, area_id="area-2", remove_config_entry_id="123"
+    )
+    assert device_registry.async_entries_for_area(registry, "area-1") == []
+    assert device_registry.async_entries_for_area(registry, "area-2") == [entry1]
+    assert device_registry.async_entries_for_config_entry(registry, "123") == [entry2]
+
+    registry.async_clear_config_entry("123")
+    assert device_registry.async_entries_for_config_entry(registry, "123") == []
+    assert registry.async_get(entry2.id) is None
+
+    registry.async_remove_device(entry1.id)
+    assert device_registry.async_entries_for_area(registry, "area-2") == []
+    assert device_registry.async_entries_for_config_entry(registry, "456") == []
+    assert registry._registered_index.area_ids == {}
+    assert registry._registered_index.config_entries == {}
+
+
 async def test_specifying_via_device_create(registry):
     """Test specifying a via_device and removal of the hub device."""
     via = registry.async_get_or_create(
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock, PropertyMock, patch
 
 import pytest
 
+from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.const import (
     ATTR_ATTRIBUTION,
     ATTR_DEVICE_CLASS,
@@ -15,11 +16,15 @@ from homeassistant.const import (
 )
 from homeassistant.core import Context, HomeAssistantError
 from homeassistant.helpers import entity, entity_registry
+from homeassistant.helpers.entity_values import EntityValues
+import homeassistant.util.dt as dt_util
 
 from tests.common import (
     MockConfigEntry,
     MockEntity,
     MockEntityPlatform,
+    MockPlatform,
+    async_fire_time_changed,
     get_test_home_assistant,
     mock_registry,
 )
@@ -637,6 +642,48 @@ async def test_disabled_in_entity_registry(hass):
     assert ent.registry_entry == entry2
 
 
+async def test_static_attributes_follow_registry_and_customize(hass):
+    """Test the cached static attributes are rebuilt when their sources change."""
+    entry = entity_registry.RegistryEntry(
+        entity_id="hello.world",
+        unique_id="test-unique-id",
+        platform="test-platform",
+    )
+    registry = mock_registry(hass, {"hello.world": entry})
+
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent.registry_entry = entry
+    ent._attr_name = "Hello"
+    ent._attr_icon = "mdi:earth"
+    ent.add_to_platform_start(
+        hass,
+        MagicMock(platform_name="test-platform", state_write_interval=None),
+        None,
+    )
+    await ent.add_to_platform_finish()
+
+    def attributes():
+        ent.async_write_ha_state()
+        return hass.states.get("hello.world").attributes
+
+    assert attributes() == {"friendly_name": "Hello", "icon": "mdi:earth"}
+
+    ent._attr_icon = "mdi:moon"
+    assert attributes() == {"friendly_name": "Hello", "icon": "mdi:moon"}
+
+    registry.async_update_entity("hello.world", name="Renamed")
+    await hass.async_block_till_done()
+    assert attributes() == {"friendly_name": "Renamed", "icon": "mdi:moon"}
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues({"hello.world": {"icon": "mdi:sun"}})
+    assert attributes() == {"friendly_name": "Renamed", "icon": "mdi:sun"}
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues()
+    assert attributes() == {"friendly_name": "Renamed", "icon": "mdi:moon"}
+
+
 async def test_capability_attrs(hass):
     """Test we still include capabilities even when unavailable."""
     with patch.object(
@@ -783,6 +830,79 @@ async def test_get_supported_features_raises_on_unknown(hass):
         entity.get_supported_features(hass, "hello.world")
 
 
+async def test_state_write_interval(hass):
+    """Test writes only changing attributes are coalesced."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state = "on"
+    ent._attr_extra_state_attributes = {"power": 1}
+    ent._attr_state_write_interval = timedelta(seconds=10)
+
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes["power"] == 1
+
+    for power in (2, 3):
+        ent._attr_extra_state_attributes = {"power": power}
+        ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes["power"] == 1
+    assert entity.async_get_suppressed_state_writes(hass) == {"hello.world": 2}
+
+    # The latest attributes are written at the end of the interval
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world").attributes["power"] == 3
+
+    ent._attr_extra_state_attributes = {"power": 4}
+    ent.async_write_ha_state()
+    assert hass.states.get("hello.world").attributes["power"] == 3
+
+    # A changed state is written right away
+    ent._attr_state = "off"
+    ent.async_write_ha_state()
+    state = hass.states.get("hello.world")
+    assert state.state == "off"
+    assert state.attributes["power"] == 4
+    assert entity.async_get_suppressed_state_writes(hass) == {"hello.world": 3}
+    assert ent._unsub_state_write is None
+
+
+async def test_state_write_interval_platform(hass):
+    """Test the write interval defaults to the one of the platform."""
+    platform = MockPlatform()
+    platform.STATE_WRITE_INTERVAL = timedelta(seconds=10)
+    ent = entity.Entity()
+    ent.platform = MockEntityPlatform(hass, platform=platform)
+    assert ent.state_write_interval == timedelta(seconds=10)
+
+    ent._attr_state_write_interval = None
+    assert ent.state_write_interval is None
+    assert entity.Entity().state_write_interval is None
+
+
+async def test_state_write_interval_remove(hass):
+    """Test a coalesced write is cancelled when the entity is removed."""
+    ent = entity.Entity()
+    ent.hass = hass
+    ent.entity_id = "hello.world"
+    ent._attr_state_write_interval = timedelta(seconds=10)
+
+    ent.async_write_ha_state()
+    ent._attr_extra_state_attributes = {"power": 1}
+    ent.async_write_ha_state()
+    assert ent._unsub_state_write is not None
+    assert entity.async_get_suppressed_state_writes(hass) == {"hello.world": 1}
+
+    await ent.async_remove()
+    assert ent._unsub_state_write is None
+    assert entity.async_get_suppressed_state_writes(hass) == {}
+    assert hass.states.get("hello.world") is None
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass.states.get("hello.world") is None
+
+
 async def test_float_conversion(hass):
     """Test conversion of float state to string rounds."""
     assert 2.4 + 1.2 != 3.6
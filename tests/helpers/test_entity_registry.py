@@ -1,4 +1,5 @@
 """Tests for the Entity Registry."""
+from operator import attrgetter
 from unittest.mock import patch
 
 import pytest
@@ -1114,6 +1115,93 @@ def test_entity_registry_items():
     assert entities.get_entry(entry2.id) is None
 
 
+async def test_entity_registry_items_secondary_indexes(registry):
+    """Test the device, area and config entry indexes stay consistent."""
+    entry1 = registry.async_get_or_create(
+        "light", "hue", "1234", config_entry=MockConfigEntry(entry_id="mock-id-1")
+    )
+    entry2 = registry.async_get_or_create(
+        "light", "hue", "5678", config_entry=MockConfigEntry(entry_id="mock-id-1")
+    )
+    entry1 = registry.async_update_entity(
+        entry1.entity_id, device_id="device-1", area_id="area-1"
+    )
+    entry2 = registry.async_update_entity(
+        entry2.entity_id,
+        device_id="device-1",
+        disabled_by=er.RegistryEntryDisabler.USER,
+    )
+
+    assert er.async_entries_for_device(registry, "device-1") == [entry1]
+    assert (
+        sorted(
+            er.async_entries_for_device(
+                registry, "device-1", include_disabled_entities=True
+            ),
+            key=attrgetter("entity_id"),
+        )
+        == [entry1, entry2]
+    )
+    assert er.async_entries_for_area(registry, "area-1") == [entry1]
+    assert (
+        sorted(
+            er.async_entries_for_config_entry(registry, "mock-id-1"),
+            key=attrgetter("entity_id"),
+        )
+        == [entry1, entry2]
+    )
+
+    # Updating an unrelated field keeps the entries indexed
+    entry1 = registry.async_update_entity(entry1.entity_id, name="Renamed")
+    assert (
+        sorted(
+            er.async_entries_for_config_entry(registry, "mock-id-1"),
+            key=attrgetter("entity_id"),
+        )
+        == [entry1, entry2]
+    )
+
+    # Moving and renaming an entity updates all indexes
+    entry1 = registry.async_update_entity(
+        entry1.entity_id,
+        new_entity_id="light.moved",
+        device_id="device-2",
+        area_id="area-2",
+    )
+    assert er.async_entries_for_device(
+        registry, "device-1", include_disabled_entities=True
+    ) == [entry2]
+    assert er.async_entries_for_device(registry, "device-2") == [entry1]
+    assert er.async_entries_for_area(registry, "area-1") == []
+    assert er.async_entries_for_area(registry, "area-2") == [entry1]
+    assert (
+        sorted(
+            er.async_entries_for_config_entry(registry, "mock-id-1"),
+            key=attrgetter("entity_id"),
+        )
+        == [entry2, entry1]
+    )
+
+    registry.async_clear_area_id("area-2")
+    assert er.async_entries_for_area(registry, "area-2") == []
+    assert registry.async_get("light.moved").area_id is None
+
+    registry.async_remove(entry2.entity_id)
+    assert (
+        er.async_entries_for_device(
+            registry, "device-1", include_disabled_entities=True
+        )
+        == []
+    )
+    assert registry.entities._device_id_index == {"device-2": {"light.moved": True}}
+
+    registry.async_clear_config_entry("mock-id-1")
+    assert er.async_entries_for_config_entry(registry, "mock-id-1") == []
+    assert registry.entities._device_id_index == {}
+    assert registry.entities._area_id_index == {}
+    assert registry.entities._config_entry_id_index == {}
+
+
 async def test_deprecated_disabled_by_str(hass, registry, caplog):
     """Test deprecated str use of disabled_by converts to enum and logs a warning."""
     entry = registry.async_get_or_create(
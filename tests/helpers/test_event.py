@@ -14,12 +14,15 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers import event
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_template_render_stats,
+    async_get_timer_wheel_stats,
     async_track_point_in_time,
     async_track_point_in_utc_time,
     async_track_same_state,
@@ -126,6 +129,78 @@ async def test_track_point_in_time_drift_rearm(hass):
     assert len(specific_runs) == 1
 
 
+async def test_track_point_in_time_batches(hass):
+    """Test listeners due at the same time fire in one batch, in order."""
+    now = dt_util.utcnow()
+    second = datetime(now.year + 1, 5, 24, 21, 59, 55, tzinfo=dt_util.UTC)
+    runs = []
+
+    assert async_get_timer_wheel_stats(hass) == {}
+
+    for offset, name in ((0.7, "late"), (0.2, "early"), (1.5, "next"), (0.2, "tie")):
+        async_track_point_in_utc_time(
+            hass,
+            callback(lambda _, name=name: runs.append(name)),
+            second + timedelta(seconds=offset),
+        )
+    unsub_cancelled = async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("cancelled")), second
+    )
+
+    @callback
+    def _cancel_next(_):
+        runs.append("cancels")
+        unsub_next()
+
+    async_track_point_in_utc_time(hass, _cancel_next, second + timedelta(seconds=1))
+    unsub_next = async_track_point_in_utc_time(
+        hass, callback(lambda _: runs.append("never")), second + timedelta(seconds=1)
+    )
+    unsub_cancelled()
+    assert async_get_timer_wheel_stats(hass)["scheduled"] == 6
+    assert async_get_timer_wheel_stats(hass)["buckets"] == 2
+
+    async_fire_time_changed(hass, second + timedelta(seconds=0.5))
+    await hass.async_block_till_done()
+    assert runs == ["early", "tie"]
+
+    async_fire_time_changed(hass, second + timedelta(seconds=1.5))
+    await hass.async_block_till_done()
+    assert runs == ["early", "tie", "late", "cancels", "next"]
+
+    stats = async_get_timer_wheel_stats(hass)
+    assert stats["scheduled"] == 0
+    assert stats["buckets"] == 0
+    assert stats["ticks"] == 2
+    assert stats["fired"] == 5
+    assert stats["jitter_max"] == pytest.approx(0.8)
+    assert stats["jitter_mean"] == pytest.approx(0.55)
+
+
+async def test_track_point_in_time_batch_exception(hass):
+    """Test a failing listener does not stop the rest of the batch."""
+    now = dt_util.utcnow()
+    point_in_time = datetime(now.year + 1, 5, 24, 21, 59, 55, tzinfo=dt_util.UTC)
+    runs = []
+
+    @callback
+    def _fail(_):
+        raise ValueError("boom")
+
+    async_track_point_in_utc_time(hass, _fail, point_in_time)
+    async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append(x)), point_in_time
+    )
+
+    with patch.object(hass.loop, "call_exception_handler") as mock_handler:
+        async_fire_time_changed(hass, point_in_time)
+        await hass.async_block_till_done()
+
+    assert runs == [point_in_time]
+    assert len(mock_handler.mock_calls) == 1
+    assert isinstance(mock_handler.mock_calls[0][1][0]["exception"], ValueError)
+
+
 async def test_track_state_change_from_to_state_match(hass):
     """Test track_state_change with from and to state matchers."""
     from_and_to_state_runs = []
@@ -1851,6 +1926,72 @@ async def test_track_template_result_with_wildcard(hass):
     assert "cover.office_skylight=open" in specific_runs[0]
 
 
+async def test_track_template_result_attributes(hass):
+    """Test templates only reading attributes skip re-rendering on other changes."""
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "color": "red"})
+    template = Template("{{ state_attr('light.kitchen', 'brightness') }}", hass)
+    runs = []
+
+    @callback
+    def refresh_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None)], refresh_listener
+    )
+    await hass.async_block_till_done()
+    assert info.listeners["entities"] == {"light.kitchen"}
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100, "color": "blue"})
+    await hass.async_block_till_done()
+    assert runs == []
+    assert async_get_template_render_stats(hass) == {"attributes_unchanged": 1}
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 50, "color": "blue"})
+    await hass.async_block_till_done()
+    assert runs == [50]
+
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+    assert runs == [50, None]
+    assert async_get_template_render_stats(hass) == {"attributes_unchanged": 1}
+
+
+async def test_track_template_result_shared_render(hass):
+    """Test identical templates are rendered once for an event."""
+    hass.states.async_set("sensor.test", "1")
+    runs = []
+
+    @callback
+    def refresh_listener(event, updates):
+        runs.append(updates.pop().result)
+
+    for _ in range(3):
+        async_track_template_result(
+            hass,
+            [
+                TrackTemplate(
+                    Template("{{ states('sensor.test') | int + 1 }}", hass), None
+                )
+            ],
+            refresh_listener,
+        )
+    await hass.async_block_till_done()
+
+    with patch.object(
+        Template,
+        "async_render_to_info",
+        autospec=True,
+        side_effect=Template.async_render_to_info,
+    ) as mock_render:
+        hass.states.async_set("sensor.test", "2")
+        await hass.async_block_till_done()
+
+    assert runs == [3, 3, 3]
+    assert mock_render.call_count == 1
+    assert async_get_template_render_stats(hass) == {"shared": 2}
+
+
 async def test_track_template_result_with_group(hass):
     """Test tracking template with a group."""
     hass.states.async_set("sensor.power_1", 0)
@@ -3463,6 +3604,36 @@ async def test_track_sunset(hass, legacy_patchable_time):
     assert len(offset_runs) == 1
 
 
+@pytest.mark.parametrize(
+    "time_zone", ["UTC", "Europe/Amsterdam", "America/New_York", "Australia/Lord_Howe"]
+)
+@pytest.mark.parametrize("local", [False, True])
+@pytest.mark.parametrize(
+    "hour,minute,second",
+    [(None, None, "/5"), (2, 30, 0), ("/3", [0, 45], None), ([1, 2, 3], None, 30)],
+)
+async def test_time_pattern_schedule(hass, time_zone, local, hour, minute, second):
+    """Test time patterns match the same times as the datetime based search."""
+    hass.config.set_time_zone(time_zone)
+    seconds = dt_util.parse_time_expression(second, 0, 59)
+    minutes = dt_util.parse_time_expression(minute, 0, 59)
+    hours = dt_util.parse_time_expression(hour, 0, 23)
+    schedule = event._TimePatternSchedule(seconds, minutes, hours, local)
+
+    for start in (
+        datetime(2022, 3, 26, 23, 0, 0, tzinfo=dt_util.UTC),
+        datetime(2022, 4, 2, 14, 0, 0, tzinfo=dt_util.UTC),
+        datetime(2022, 10, 29, 23, 0, 0, tzinfo=dt_util.UTC),
+        datetime(2022, 11, 6, 4, 0, 0, tzinfo=dt_util.UTC),
+    ):
+        for minutes_later in range(0, 240, 7):
+            now = start + timedelta(minutes=minutes_later, seconds=31.5)
+            expected = dt_util.find_next_time_expression_time(
+                dt_util.as_local(now) if local else now, seconds, minutes, hours
+            )
+            assert schedule.next_time(now).timestamp() == expected.timestamp()
+
+
 async def test_async_track_time_change(hass):
     """Test tracking time change."""
     wildcard_runs = []
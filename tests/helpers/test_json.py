@@ -1,10 +1,21 @@
 """Test Home Assistant remote methods and classes."""
 import datetime
+import importlib
+import json
+import sys
+from unittest.mock import patch
 
 import pytest
 
 from homeassistant import core
-from homeassistant.helpers.json import ExtendedJSONEncoder, JSONEncoder
+from homeassistant.helpers import json as json_helper
+from homeassistant.helpers.json import (
+    ExtendedJSONEncoder,
+    JSONEncoder,
+    json_bytes,
+    json_dumps,
+    json_encoder_default,
+)
 from homeassistant.util import dt as dt_util
 
 
@@ -35,6 +46,44 @@ def test_json_encoder_raises(hass):
         ha_json_enc.default(1)
 
 
+def test_json_encoder_default(hass):
+    """Test the default hook of the JSON serializers."""
+    state = core.State("test.test", "hello")
+    now = dt_util.utcnow()
+
+    assert json_encoder_default(now) == now.isoformat()
+    assert sorted(json_encoder_default({"milk", "beer"})) == ["beer", "milk"]
+    assert json_encoder_default(state) == state.as_dict()
+
+    with pytest.raises(TypeError):
+        json_encoder_default(object())
+
+
+def test_json_dumps(hass):
+    """Test serializing Home Assistant objects matches the JSONEncoder."""
+    context = core.Context(user_id="user")
+    state = core.State("test.test", "hello", {"sources": {"a"}}, context=context)
+    event = core.Event(
+        "state_changed",
+        {"entity_id": "test.test", "old_state": None, "new_state": state},
+        context=context,
+    )
+    data = {
+        "state": state,
+        "event": event,
+        "context": context,
+        "now": dt_util.utcnow(),
+        1: (1, 2),
+    }
+
+    expected = json.loads(json.dumps(data, cls=JSONEncoder))
+    assert json.loads(json_dumps(data)) == expected
+    assert json.loads(json_bytes(data)) == expected
+
+    with pytest.raises(TypeError):
+        json_dumps({"object": object()})
+
+
 def test_extended_json_encoder(hass):
     """Test the extended JSON encoder."""
     ha_json_enc = ExtendedJSONEncoder()
@@ -64,3 +113,50 @@ def test_extended_json_encoder(hass):
     # Default method falls back to repr(o)
     o = object()
     assert ha_json_enc.default(o) == {"__type": str(type(o)), "repr": repr(o)}
+
+
+def test_json_dumps_core_objects():
+    """Test dumping states, events and contexts matches their as_dict output."""
+    state = core.State("light.kitchen", "on", {"brightness": 180, "rgb": (1, 2, 3)})
+    event = core.Event(
+        "state_changed",
+        {"new_state": state},
+        time_fired=datetime.datetime(2022, 3, 1, tzinfo=dt_util.UTC),
+    )
+    for obj in (state, event, state.context):
+        assert json.loads(json_dumps(obj)) == json.loads(
+            json.dumps(obj, cls=JSONEncoder)
+        )
+
+
+@pytest.fixture(params=("orjson", "stdlib"))
+def json_module(request):
+    """Return the JSON helpers with and without orjson."""
+    if request.param == "orjson":
+        if json_helper.orjson is None:
+            pytest.skip("orjson is not installed")
+        yield json_helper
+        return
+    with patch.dict(sys.modules, {"orjson": None}):
+        module = importlib.reload(json_helper)
+    assert module.orjson is None
+    try:
+        yield module
+    finally:
+        importlib.reload(json_helper)
+
+
+@pytest.mark.parametrize("value", (float("nan"), float("inf"), float("-inf")))
+def test_json_dumps_nan_to_null(json_module, value):
+    """Test NaN and infinity are serialized to null with and without orjson."""
+    state = core.State("test.test", "hello", {"value": value, "nested": [value]})
+    data = {"value": value, "state": state, "text": "NaN"}
+
+    for result in (json_module.json_dumps(data), json_module.json_bytes(data)):
+        decoded = json.loads(result)
+        assert decoded["value"] is None
+        assert decoded["text"] == "NaN"
+        assert decoded["state"]["attributes"] == {"value": None, "nested": [None]}
+
+    with pytest.raises(TypeError):
+        json_module.json_dumps({"value": value, "object": object()})
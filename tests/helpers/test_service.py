@@ -486,6 +486,51 @@ async def test_extract_entity_ids_from_devices(hass, area_mock):
     )
 
 
+async def test_extract_entity_ids_from_area_cached(hass, area_mock):
+    """Test area and device targets are cached until a registry is updated."""
+    assert service.async_get_service_target_cache_stats(hass) == {}
+    call = ha.ServiceCall("light", "turn_on", {"area_id": "test-area"})
+
+    assert await service.async_extract_entity_ids(hass, call) == {
+        "light.in_area",
+        "light.assigned_to_area",
+    }
+    assert await service.async_extract_entity_ids(hass, call) == {
+        "light.in_area",
+        "light.assigned_to_area",
+    }
+    assert service.async_get_service_target_cache_stats(hass) == {
+        "hits": 1,
+        "misses": 1,
+        "invalidations": 0,
+    }
+
+    # The update is picked up before the registry event listeners have run
+    ent_reg.async_get(hass).async_update_entity("light.no_area", area_id="test-area")
+    assert service.async_extract_referenced_entity_ids(
+        hass, call
+    ).indirectly_referenced == {
+        "light.in_area",
+        "light.assigned_to_area",
+        "light.no_area",
+    }
+
+    call = ha.ServiceCall("light", "turn_on", {"area_id": "area-a"})
+    assert service.async_extract_referenced_entity_ids(
+        hass, call
+    ).referenced_devices == {"device-area-a-id"}
+    dev_reg.async_get(hass).async_update_device("device-area-a-id", area_id=None)
+    assert (
+        service.async_extract_referenced_entity_ids(hass, call).referenced_devices
+        == set()
+    )
+    assert service.async_get_service_target_cache_stats(hass) == {
+        "hits": 1,
+        "misses": 4,
+        "invalidations": 2,
+    }
+
+
 async def test_async_get_all_descriptions(hass):
     """Test async_get_all_descriptions."""
     group = hass.components.group
@@ -745,6 +790,66 @@ async def test_call_with_match_all(
     )
 
 
+async def test_call_with_entities_by_entity_id(
+    hass, mock_handle_entity_call, mock_entities
+):
+    """Check we can pass the entities by entity_id instead of platforms."""
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.bedroom", "light.non-existing"]},
+        ),
+    )
+
+    assert len(mock_handle_entity_call.mock_calls) == 1
+    assert mock_handle_entity_call.mock_calls[0][1][1].entity_id == "light.bedroom"
+
+    # The entities are called in entity_id order
+    mock_handle_entity_call.reset_mock()
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        Mock(),
+        ha.ServiceCall(
+            "test_domain",
+            "test_service",
+            {"entity_id": ["light.living_room", "light.kitchen", "light.bathroom"]},
+        ),
+    )
+    assert [call[1][1].entity_id for call in mock_handle_entity_call.mock_calls] == [
+        "light.bathroom",
+        "light.kitchen",
+        "light.living_room",
+    ]
+
+    with pytest.raises(exceptions.Unauthorized) as err, patch(
+        "homeassistant.auth.AuthManager.async_get_user",
+        return_value=Mock(
+            permissions=PolicyPermissions(
+                {"entities": {"entity_ids": {"light.kitchen": True}}}, None
+            )
+        ),
+    ):
+        await service.entity_service_call(
+            hass,
+            mock_entities,
+            Mock(),
+            ha.ServiceCall(
+                "test_domain",
+                "test_service",
+                {"entity_id": ["light.kitchen", "light.living_room", "light.bedroom"]},
+                context=ha.Context(user_id="mock-id"),
+            ),
+        )
+
+    # The first entity_id without permission is reported
+    assert err.value.entity_id == "light.bedroom"
+
+
 async def test_call_with_omit_entity_id(hass, mock_handle_entity_call, mock_entities):
     """Check service call if we do not pass an entity ID."""
     await service.entity_service_call(
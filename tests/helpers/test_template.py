@@ -1,5 +1,6 @@
 """Test Home Assistant template helper methods."""
 from datetime import datetime, timedelta
+import gc
 import logging
 import math
 import random
@@ -13,6 +14,8 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     LENGTH_MILLIMETERS,
     MASS_GRAMS,
@@ -1222,6 +1225,29 @@ def test_state_attr(hass):
     assert tpl.async_render() is True
 
 
+def test_state_attr_render_info(hass):
+    """Test state_attr only collects the attributes read."""
+    hass.states.async_set("test.object", "available", {"mode": "on"})
+    hass.states.async_set("test.other", "available", {"mode": "on"})
+
+    info = render_to_info(
+        hass,
+        """
+{{ state_attr("test.object", "mode") }} {{ is_state_attr("test.object", "other", 1) }}
+{{ state_attr("test.other", "mode") }} {{ states("test.other") }}
+{{ state_attr("test.noobject", "mode") }}
+        """,
+    )
+    assert info.result() == "on False\non available\nNone"
+    assert info.entities == {"test.object", "test.other", "test.noobject"}
+    assert info.entity_attributes == {"test.object": {"mode", "other"}}
+
+    info = render_to_info(
+        hass, '{{ state_attr("test.object", "mode") }} {{ states.test | list }}'
+    )
+    assert info.entity_attributes == {}
+
+
 def test_states_function(hass):
     """Test using states as a function."""
     hass.states.async_set("test.object", "available")
@@ -3251,6 +3277,11 @@ async def test_cache_garbage_collection():
         template_string
     )  # pylint: disable=protected-access
     del tpl2
+    # Still kept by the recently compiled templates until they are cleared
+    assert template._NO_HASS_ENV.template_cache.get(
+        template_string
+    )  # pylint: disable=protected-access
+    template._NO_HASS_ENV._compile_cached.cache_clear()
     assert not template._NO_HASS_ENV.template_cache.get(
         template_string
     )  # pylint: disable=protected-access
@@ -3618,3 +3649,79 @@ async def test_undefined_variable(hass, caplog):
         "Template variable warning: 'no_such_variable' is undefined when rendering '{{ no_such_variable }}'"
         in caplog.text
     )
+
+
+async def test_template_cache_keeps_compiled_templates(hass):
+    """Test recently compiled templates are kept once no template uses them."""
+    with patch.object(template, "TEMPLATE_CACHE_SIZE", 1):
+        env = template.TemplateEnvironment(hass)
+
+    env.compile("{{ 1 + 1 }}")
+    gc.collect()
+    assert "{{ 1 + 1 }}" in env.template_cache
+
+    env.compile("{{ 2 + 2 }}")
+    gc.collect()
+    assert "{{ 1 + 1 }}" not in env.template_cache
+    assert "{{ 2 + 2 }}" in env.template_cache
+
+
+async def test_bytecode_cache(hass, tmp_path, caplog):
+    """Test compiled templates are stored per environment type between runs."""
+    hass.config.config_dir = str(tmp_path)
+    cache_path = tmp_path / ".storage" / template.BYTECODE_CACHE_FILE
+
+    def _new_run():
+        for env in (
+            template._ENVIRONMENT,
+            template._ENVIRONMENT_LIMITED,
+            template._ENVIRONMENT_STRICT,
+        ):
+            hass.data.pop(env, None)
+        return template.async_load_bytecode_cache(hass)
+
+    assert template.async_get_template_compile_stats(hass) == {}
+    await _new_run()
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    template.TemplateEnvironment(hass, limited=True).compile("{{ 1 + 1 }}")
+    stats = template.async_get_template_compile_stats(hass)
+    assert stats["compiled"] == 2
+    assert stats["loaded"] == 0
+    assert stats["compile_time"] > 0
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+    assert cache_path.exists()
+
+    await _new_run()
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    stats = template.async_get_template_compile_stats(hass)
+    assert stats["compiled"] == 1
+    assert stats["loaded"] == 1
+
+    # Templates stored by the previous run are kept until compiled again
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    await _new_run()
+    template.TemplateEnvironment(hass, limited=True).compile("{{ 1 + 1 }}")
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    template.TemplateEnvironment(hass, strict=True).compile("{{ 2 + 2 }}")
+    stats = template.async_get_template_compile_stats(hass)
+    assert stats["compiled"] == 1
+    assert stats["loaded"] == 2
+
+    # Code compiled by other Python, Jinja or Home Assistant versions is not used
+    python_version, jinja_version, _ = template.BYTECODE_CACHE_VERSION
+    with patch.object(
+        template, "BYTECODE_CACHE_VERSION", (python_version, jinja_version, "0.0.0")
+    ):
+        await _new_run()
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert template.async_get_template_compile_stats(hass)["compiled"] == 1
+
+    cache_path.write_bytes(b"corrupt")
+    await _new_run()
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert template.async_get_template_compile_stats(hass)["compiled"] == 1
+    assert "Ignoring template bytecode cache" in caplog.text
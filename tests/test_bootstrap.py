@@ -27,6 +27,13 @@ ORIG_TIMEZONE = dt_util.DEFAULT_TIME_ZONE
 VERSION_PATH = os.path.join(get_test_config_dir(), config_util.VERSION_FILE)
 
 
+@pytest.fixture(autouse=True)
+def mock_integration_index():
+    """Mock loading the integration index, so it is not saved to the config dir."""
+    with patch("homeassistant.loader.async_load_integration_index"):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def apply_mock_storage(hass_storage):
     """Apply the storage mock."""
@@ -3,6 +3,7 @@
 import asyncio
 from datetime import datetime, timedelta
 import functools
+import json
 import logging
 import os
 from tempfile import TemporaryDirectory
@@ -76,7 +77,7 @@ def test_async_add_hass_job_schedule_partial_callback():
 
 def test_async_add_hass_job_schedule_coroutinefunction(loop):
     """Test that we schedule coroutines and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), _job_wrapper=None)
 
     async def job():
         pass
@@ -89,7 +90,7 @@ def test_async_add_hass_job_schedule_coroutinefunction(loop):
 
 def test_async_add_hass_job_schedule_partial_coroutinefunction(loop):
     """Test that we schedule partial coros and add jobs to the job pool."""
-    hass = MagicMock(loop=MagicMock(wraps=loop))
+    hass = MagicMock(loop=MagicMock(wraps=loop), _job_wrapper=None)
 
     async def job():
         pass
@@ -130,7 +131,7 @@ def test_async_create_task_schedule_coroutine(loop):
 
 def test_async_run_hass_job_calls_callback():
     """Test that the callback annotation is respected."""
-    hass = MagicMock()
+    hass = MagicMock(_job_wrapper=None)
     calls = []
 
     def job():
@@ -141,6 +142,45 @@ def test_async_run_hass_job_calls_callback():
     assert len(hass.async_add_job.mock_calls) == 0
 
 
+async def test_job_wrapper(hass):
+    """Test the job wrapper replaces the targets of callbacks and coroutines."""
+    calls = []
+
+    def job_wrapper(hassjob):
+        def _wrapped(*args):
+            calls.append(("wrapped", args))
+            return hassjob.target(*args)
+
+        return _wrapped
+
+    @ha.callback
+    def callback_job(value):
+        calls.append(("callback", value))
+
+    async def coroutine_job(value):
+        calls.append(("coroutine", value))
+
+    hass.async_set_job_wrapper(job_wrapper)
+    hass.async_run_hass_job(ha.HassJob(callback_job), 1)
+    hass.async_add_hass_job(ha.HassJob(callback_job), 2)
+    await hass.async_block_till_done()
+    await hass.async_add_hass_job(ha.HassJob(coroutine_job), 3)
+
+    assert calls == [
+        ("wrapped", (1,)),
+        ("callback", 1),
+        ("wrapped", (2,)),
+        ("callback", 2),
+        ("wrapped", (3,)),
+        ("coroutine", 3),
+    ]
+
+    calls.clear()
+    hass.async_set_job_wrapper(None)
+    hass.async_run_hass_job(ha.HassJob(callback_job), 4)
+    assert calls == [("callback", 4)]
+
+
 def test_async_run_hass_job_delegates_non_async():
     """Test that the callback annotation is respected."""
     hass = MagicMock()
@@ -383,6 +423,35 @@ def test_state_as_dict():
     assert state.as_dict() is state.as_dict()
 
 
+def test_state_as_dict_json():
+    """Test a State serialized to JSON is cached until the state changes."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    assert json.loads(state.as_dict_json()) == state.as_dict()
+    assert state.as_dict_json() is state.as_dict_json()
+
+
+async def test_statemachine_set_invalidates_json(hass):
+    """Test the JSON of a state is not reused once the state changes."""
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    state = hass.states.get("light.bowl")
+    state_json = state.as_dict_json()
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 100})
+    assert hass.states.get("light.bowl").as_dict_json() is state_json
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 200})
+    assert json.loads(hass.states.get("light.bowl").as_dict_json())["attributes"] == {
+        "brightness": 200
+    }
+
+
 async def test_eventbus_add_remove_listener(hass):
     """Test remove_listener method."""
     old_count = len(hass.bus.async_listeners())
@@ -431,6 +500,57 @@ async def test_eventbus_filtered_listener(hass):
     unsub()
 
 
+async def test_eventbus_indexed_listener(hass, caplog):
+    """Test listeners indexed by a key of the event data."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event.data["entity_id"])
+
+    old_count = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_indexed(
+        "test", "entity_id", ["light.kitchen", "light.bowl"], listener
+    )
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.other"})
+    hass.bus.async_fire("test", {"entity_id": ["light.bowl"]})
+    hass.bus.async_fire("test", {})
+    hass.bus.async_fire("other", {"entity_id": "light.bowl"})
+    hass.bus.async_fire("test", {"entity_id": "light.bowl"})
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "light.bowl"]
+
+    unsub()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert calls == ["light.kitchen", "light.bowl"]
+
+    unsub()
+    assert "Unable to remove unknown job listener" in caplog.text
+
+
+async def test_eventbus_dispatch_stats(hass):
+    """Test the bus counts the events fired per event type."""
+    hass.bus.async_listen("test", ha.callback(lambda event: None))
+
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("test_no_listeners")
+
+    stats = hass.bus.async_dispatch_stats()
+    assert stats["test"]["fired"] == 2
+    assert stats["test"]["dispatch_time"] > 0
+    assert stats["test_no_listeners"] == {"fired": 1, "dispatch_time": 0}
+
+
 async def test_eventbus_unsubscribe_listener(hass):
     """Test unsubscribe listener from returned function."""
     calls = []
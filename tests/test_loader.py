@@ -1,5 +1,10 @@
 """Test to verify that we can load components."""
-from unittest.mock import patch
+from functools import partial
+import os
+import sys
+import threading
+from types import ModuleType
+from unittest.mock import Mock, patch
 
 import pytest
 
@@ -634,3 +639,188 @@ async def test_loggers(hass):
         },
     )
     assert integration.loggers == ["name1", "name2"]
+
+
+async def test_preimport_integrations(hass, enable_custom_integrations):
+    """Test integrations and their platforms are imported ahead of setup."""
+    integration = await loader.async_get_integration(hass, "test")
+
+    with patch.dict(sys.modules):
+        for name in list(sys.modules):
+            if name.startswith("custom_components.test."):
+                del sys.modules[name]
+        sys.modules.pop("custom_components.test", None)
+
+        loader.async_preimport_integrations(hass, [integration], ["light", "fan"])
+        await integration.async_wait_preimport()
+
+        assert "custom_components.test" in sys.modules
+        assert "custom_components.test.light" in sys.modules
+        assert "custom_components.test.fan" not in sys.modules
+        import_times = loader.async_get_import_times(hass)["test"]
+        assert set(import_times) == {"test", "test.light"}
+
+        # Setup gets the imported modules without importing them again
+        assert (
+            integration.get_platform("light")
+            is sys.modules["custom_components.test.light"]
+        )
+        assert set(import_times) == {"test", "test.light"}
+
+
+async def test_preimport_integrations_dependencies(hass):
+    """Test integrations are imported after their dependencies."""
+    integration_a = mock_integration(hass, MockModule("test_a"))
+    integration_b = mock_integration(
+        hass, MockModule("test_b", dependencies=["test_a"])
+    )
+    assert await integration_b.resolve_dependencies()
+    imported = []
+
+    def _preimport(domain, platform_names):
+        threading.Event().wait(0.01)
+        imported.append(domain)
+        return True
+
+    with patch.object(
+        integration_a, "preimport", side_effect=partial(_preimport, "test_a")
+    ), patch.object(
+        integration_b, "preimport", side_effect=partial(_preimport, "test_b")
+    ):
+        loader.async_preimport_integrations(hass, [integration_b, integration_a], [])
+        await integration_b.async_wait_preimport()
+
+    assert imported == ["test_a", "test_b"]
+
+
+async def test_preimport_integrations_missing_requirements(hass):
+    """Test integrations are left to the setup until their requirements are installed."""
+    integration_a = mock_integration(
+        hass, MockModule("test_a", requirements=["not-installed-package==1.0"])
+    )
+    integration_b = mock_integration(
+        hass, MockModule("test_b", dependencies=["test_a"])
+    )
+    assert await integration_b.resolve_dependencies()
+
+    with patch(
+        "homeassistant.util.package.is_installed", return_value=False
+    ) as is_installed, patch.object(
+        integration_a, "_import_module"
+    ) as import_a, patch.object(
+        integration_b, "preimport"
+    ) as preimport_b:
+        loader.async_preimport_integrations(hass, [integration_b, integration_a], [])
+        await integration_b.async_wait_preimport()
+
+    is_installed.assert_called_once_with("not-installed-package==1.0")
+    assert not import_a.called
+    assert not preimport_b.called
+
+
+async def test_preimport_integrations_error(hass):
+    """Test errors importing ahead of setup are left to the setup."""
+    integration = mock_integration(hass, MockModule("test_error"))
+
+    with patch.object(integration, "preimport", side_effect=ImportError):
+        loader.async_preimport_integrations(hass, [integration], [])
+        await integration.async_wait_preimport()
+
+    assert loader.async_get_import_times(hass) == {}
+
+
+async def _async_load_index(hass, path):
+    """Load an integration index stored at path."""
+    index = hass.data[loader.DATA_INTEGRATION_INDEX] = loader.IntegrationIndex(hass)
+    index.path = str(path)
+    await index.async_load()
+    return index
+
+
+async def test_integration_index(hass, tmp_path):
+    """Test manifests and modules are loaded from the index of the last run."""
+    index = await _async_load_index(hass, tmp_path / "index")
+    integration = await loader.async_get_integration(hass, "light")
+    assert loader.async_get_integration_index_stats(hass) == {"loaded": 0, "read": 1}
+    assert integration.platform_exists("reproduce_state")
+    assert not integration.platform_exists("not_a_platform")
+    await index.async_save()
+
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    await _async_load_index(hass, tmp_path / "index")
+    cached = await loader.async_get_integration(hass, "light")
+    assert loader.async_get_integration_index_stats(hass) == {"loaded": 1, "read": 0}
+    assert cached is not integration
+    assert cached.manifest == integration.manifest
+    assert cached.platform_exists("reproduce_state")
+
+    with patch("importlib.import_module") as mock_import, pytest.raises(
+        ImportError, match="homeassistant.components.light.not_a_platform"
+    ):
+        cached.get_platform("not_a_platform")
+    assert not mock_import.called
+
+
+async def test_integration_index_invalidated(hass, tmp_path):
+    """Test integrations are read again when their files change."""
+    root = tmp_path / "root"
+    file_path = root / "test_index"
+    file_path.mkdir(parents=True)
+    manifest_path = file_path / "manifest.json"
+    manifest_path.write_text('{"domain": "test_index", "name": "Old", "version": "1"}')
+    root_module = ModuleType("custom_components")
+    root_module.__path__ = [str(root)]
+
+    index = await _async_load_index(hass, tmp_path / "index")
+    integration = loader.Integration.resolve_from_root(hass, root_module, "test_index")
+    assert integration.name == "Old"
+    assert not integration.platform_exists("light")
+    await index.async_save()
+
+    manifest_path.write_text('{"domain": "test_index", "name": "New", "version": "1"}')
+    os.utime(manifest_path, ns=(0, 0))
+    await _async_load_index(hass, tmp_path / "index")
+    integration = loader.Integration.resolve_from_root(hass, root_module, "test_index")
+    assert integration.name == "New"
+    assert loader.async_get_integration_index_stats(hass) == {"loaded": 0, "read": 1}
+
+    (file_path / "light.py").write_text("")
+    os.utime(file_path, ns=(0, 0))
+    await _async_load_index(hass, tmp_path / "index")
+    integration = loader.Integration.resolve_from_root(hass, root_module, "test_index")
+    assert integration.platform_exists("light")
+    assert loader.async_get_integration_index_stats(hass) == {"loaded": 0, "read": 1}
+
+
+async def test_integration_index_other_version(hass, tmp_path):
+    """Test the index stored by another version is ignored."""
+    index = await _async_load_index(hass, tmp_path / "index")
+    await loader.async_get_integration(hass, "light")
+    await index.async_save()
+
+    hass.data.pop(loader.DATA_INTEGRATIONS)
+    with patch("homeassistant.loader.__version__", "1.0.0"):
+        await _async_load_index(hass, tmp_path / "index")
+    await loader.async_get_integration(hass, "light")
+    assert loader.async_get_integration_index_stats(hass) == {"loaded": 0, "read": 1}
+
+
+async def test_integration_index_sub_directories(hass, tmp_path):
+    """Test sub directories are only listed again when the directory changes."""
+    path = tmp_path / "custom_components"
+    (path / "first").mkdir(parents=True)
+    index = await _async_load_index(hass, tmp_path / "index")
+    list_func = Mock(return_value=["first"])
+    assert index.sub_directories(str(path), list_func) == ["first"]
+    await index.async_save()
+
+    index = await _async_load_index(hass, tmp_path / "index")
+    assert index.sub_directories(str(path), list_func) == ["first"]
+    assert list_func.call_count == 1
+
+    (path / "second").mkdir()
+    os.utime(path, ns=(0, 0))
+    list_func.return_value = ["first", "second"]
+    index = await _async_load_index(hass, tmp_path / "index")
+    assert index.sub_directories(str(path), list_func) == ["first", "second"]
+    assert list_func.call_count == 2
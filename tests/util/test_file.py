@@ -5,7 +5,12 @@ from unittest.mock import patch
 
 import pytest
 
-from homeassistant.util.file import WriteError, write_utf8_file, write_utf8_file_atomic
+from homeassistant.util.file import (
+    WriteError,
+    write_bytes_file,
+    write_utf8_file,
+    write_utf8_file_atomic,
+)
 
 
 @pytest.mark.parametrize("func", [write_utf8_file, write_utf8_file_atomic])
@@ -25,6 +30,20 @@ def test_write_utf8_file_atomic_private(tmpdir, func):
     assert os.stat(test_file).st_mode & 0o777 == 0o600
 
 
+def test_write_bytes_file(tmpdir):
+    """Test binary files can be written as 0o600 or 0o644."""
+    test_dir = tmpdir.mkdir("files")
+    test_file = Path(test_dir / "test.bin")
+
+    write_bytes_file(test_file, b"\x00\xffdata", False)
+    with open(test_file, "rb") as fh:
+        assert fh.read() == b"\x00\xffdata"
+    assert os.stat(test_file).st_mode & 0o777 == 0o644
+
+    write_bytes_file(test_file, b"\x00\xffdata", True)
+    assert os.stat(test_file).st_mode & 0o777 == 0o600
+
+
 def test_write_utf8_file_fails_at_creation(tmpdir):
     """Test that failed creation of the temp file does not create an empty file."""
     test_dir = tmpdir.mkdir("files")
@@ -445,3 +445,91 @@ def test_input():
     """Test loading inputs."""
     data = {"hello": yaml.Input("test_name")}
     assert yaml.parse_yaml(yaml.dump(data)) == data
+
+
+def test_fast_loader_annotates_nodes():
+    """Test the fast loader keeps the file and line of the loaded data."""
+    conf = "first: 1\nsecond:\n  - one\n  - two\n"
+    with io.StringIO(conf) as file:
+        file.name = "test.yaml"
+        doc = yaml.parse_yaml(file)
+
+    assert doc == {"first": 1, "second": ["one", "two"]}
+    assert doc["second"].__config_file__ == "test.yaml"
+    assert doc["second"].__line__ == 2
+
+
+def test_fast_loader_error_line(caplog):
+    """Test errors of the fast loader are reported with their line."""
+    with pytest.raises(HomeAssistantError):
+        yaml.parse_yaml("key: value\nbad: [\n")
+
+    assert 'in "<unicode string>", line 3' in caplog.text
+
+
+def test_load_yaml_cached(tmp_path):
+    """Test a file is only parsed again when it or its includes changed."""
+    config_path = tmp_path / "configuration.yaml"
+    included_path = tmp_path / "included.yaml"
+    (tmp_path / "packages").mkdir()
+    config_path.write_text(
+        "included: !include included.yaml\n"
+        "packages: !include_dir_named packages\n"
+        "env: !env_var TEST_LOAD_YAML_CACHED default\n"
+    )
+    included_path.write_text("key: value\n")
+    (tmp_path / "packages" / "first.yaml").write_text("first: 1\n")
+
+    with patch(
+        "homeassistant.util.yaml.loader.parse_yaml", wraps=yaml_loader.parse_yaml
+    ) as mock_parse:
+        config = yaml.load_yaml(str(config_path))
+        assert mock_parse.call_count == 3
+
+        cached = yaml.load_yaml(str(config_path))
+        assert cached == config
+        assert cached is not config
+        assert cached["included"].__config_file__ == str(config_path)
+        assert mock_parse.call_count == 3
+
+        included_path.write_text("key: other value\n")
+        config = yaml.load_yaml(str(config_path))
+        assert config["included"] == {"key": "other value"}
+        assert mock_parse.call_count == 5
+
+        (tmp_path / "packages" / "second.yaml").write_text("second: 2\n")
+        config = yaml.load_yaml(str(config_path))
+        assert config["packages"] == {"first": {"first": 1}, "second": {"second": 2}}
+        assert mock_parse.call_count == 7
+
+        with patch.dict(os.environ, {"TEST_LOAD_YAML_CACHED": "set"}):
+            config = yaml.load_yaml(str(config_path))
+        assert config["env"] == "set"
+        assert mock_parse.call_count == 8
+
+
+def test_load_yaml_cached_secrets(tmp_path):
+    """Test a file is parsed again when the secrets it uses changed."""
+    config_path = tmp_path / "configuration.yaml"
+    secrets_path = tmp_path / yaml.SECRET_YAML
+    config_path.write_text("password: !secret password\n")
+    secrets_path.write_text("password: old\n")
+
+    config = yaml.load_yaml(str(config_path), yaml.Secrets(tmp_path))
+    assert config == {"password": "old"}
+
+    with patch(
+        "homeassistant.util.yaml.loader.parse_yaml", wraps=yaml_loader.parse_yaml
+    ) as mock_parse:
+        config = yaml.load_yaml(str(config_path), yaml.Secrets(tmp_path))
+        assert config == {"password": "old"}
+        assert mock_parse.call_count == 0
+
+        secrets_path.write_text("password: new\n")
+        config = yaml.load_yaml(str(config_path), yaml.Secrets(tmp_path))
+        assert config == {"password": "new"}
+        # The secrets and the configuration are parsed again
+        assert mock_parse.call_count == 2
+
+        with pytest.raises(HomeAssistantError):
+            yaml.load_yaml(str(config_path))